@@ -3,6 +3,9 @@
 import os
 import csv
 import re
+import json
+import time
+from collections import deque
 from colorama import Fore, Style, init
 from tqdm import tqdm
 from scholarly import scholarly, ProxyGenerator
@@ -12,9 +15,32 @@ import traceback
 from scholarly._proxy_generator import MaxTriesExceededException
 
 from . import help_menu as hm
+from . import schema as sc
+from .papers import Paper, layout_columns
 
 init(autoreset=True)
 
+# --- DETAIL FETCH CONFIGURATION ---
+# scholarly.fill shares one navigator (session and proxy state) and is not thread-safe,
+# so details are fetched one request at a time under an adaptive (AIMD) pace: a shorter
+# interval after every FETCH_RAMP_AFTER healthy responses, a doubled one plus a cooldown
+# on a block signal. Blocked publications are re-queued for later.
+FETCH_START_INTERVAL = 2.0  # Seconds between requests
+FETCH_MIN_INTERVAL = 0.5
+FETCH_MAX_INTERVAL = 30
+FETCH_INTERVAL_STEP = 0.25
+FETCH_RAMP_AFTER = 5
+FETCH_COOLDOWN = 30         # Seconds; doubled on every consecutive block
+FETCH_MAX_COOLDOWN = 300
+FETCH_MAX_BLOCKS = 5        # Consecutive blocks before the remaining fetches are abandoned
+FETCH_MAX_ATTEMPTS = 3      # Per publication
+
+# --- PUBLICATION CACHE ---
+# One JSON file per author: filled publications keyed by publication id, with the
+# citation count they were filled at. A new search only fills new or changed papers.
+AUTHOR_CACHE_DIR = ".author_cache"
+AUTHOR_CACHE_VERSION = 1
+
 # ==============================================================================
 # ABNT FORMATTING UTILS
 # ==============================================================================
@@ -156,6 +182,130 @@ def get_unique_folder(base_folder):
     os.makedirs(new_folder)
     return new_folder
 
+# ==============================================================================
+# CONCURRENT DETAIL FETCHING
+# ==============================================================================
+class AdaptiveLimiter:
+    """
+    Request pacing for the detail fetches (AIMD on the request rate): the interval
+    between requests shrinks by FETCH_INTERVAL_STEP after every FETCH_RAMP_AFTER healthy
+    responses and doubles on a block signal, which also starts a cooldown.
+    """
+    def __init__(self, interval=FETCH_START_INTERVAL, minimum=FETCH_MIN_INTERVAL):
+        self.interval = interval
+        self.minimum = minimum
+        self.healthy = 0
+        self.blocks = 0             # Consecutive block signals
+        self.next_request = 0.0
+
+    def wait(self):
+        """Sleeps until the next request is allowed."""
+        pause = self.next_request - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+
+    def record(self, blocked):
+        if blocked:
+            self.blocks += 1
+            self.healthy = 0
+            self.interval = min(self.interval * 2, FETCH_MAX_INTERVAL)
+            pause = min(FETCH_COOLDOWN * 2 ** (self.blocks - 1), FETCH_MAX_COOLDOWN)
+        else:
+            self.blocks = 0
+            self.healthy += 1
+            if self.healthy >= FETCH_RAMP_AFTER:
+                self.interval = max(self.minimum, self.interval - FETCH_INTERVAL_STEP)
+                self.healthy = 0
+            pause = self.interval
+        self.next_request = time.monotonic() + pause
+
+def is_block_signal(error):
+    """Google refused the request, or returned a page (CAPTCHA) scholarly could not parse."""
+    return isinstance(error, (MaxTriesExceededException, AttributeError)) or "captcha" in str(error).lower()
+
+def fetch_publication_details(stubs):
+    """
+    Fills every stub, one request at a time, paced by an AdaptiveLimiter.
+    Blocked publications are retried at the end of the queue, up to FETCH_MAX_ATTEMPTS
+    times each; publications that fail for any other reason are not retried.
+    Returns (filled publication of every stub, None if not filled; stubs that could not be filled).
+    """
+    limiter = AdaptiveLimiter()
+    filled = [None] * len(stubs)
+    attempts = [0] * len(stubs)
+    pending = deque(range(len(stubs)))
+    unfilled = []
+
+    with tqdm(total=len(stubs), desc="Fetching details", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]') as pbar:
+        while pending:
+            if limiter.blocks >= FETCH_MAX_BLOCKS:
+                tqdm.write(f"{Fore.RED}❌ Blocked {limiter.blocks} times in a row. Stopping early.")
+                unfilled.extend(stubs[i] for i in pending)
+                pbar.update(len(pending))
+                break
+
+            i = pending.popleft()
+            limiter.wait()
+            try:
+                filled[i] = scholarly.fill(stubs[i])
+                limiter.record(blocked=False)
+            except Exception as e:
+                blocked = is_block_signal(e)
+                limiter.record(blocked)
+                if blocked:
+                    attempts[i] += 1
+                    if attempts[i] < FETCH_MAX_ATTEMPTS:
+                        pending.append(i)
+                        pbar.set_postfix(interval=f"{limiter.interval:.1f}s", paused=True)
+                        continue
+                else:
+                    title = stubs[i].get('bib', {}).get('title', 'Unknown Paper')
+                    tqdm.write(f"{Fore.RED}❌ Error fetching details for '{title}': {e}")
+                # Saved later with its stub data
+                unfilled.append(stubs[i])
+            pbar.set_postfix(interval=f"{limiter.interval:.1f}s")
+            pbar.update(1)
+
+    return filled, unfilled
+
+# ==============================================================================
+# PUBLICATION CACHE
+# ==============================================================================
+def publication_key(pub):
+    """Scholar id of a publication (same on the stub and the filled record), else its title key."""
+    return pub.get('author_pub_id') or f"title:{sc.paper_key(pub.get('bib', {}).get('title', ''))}"
+
+def _author_cache_path(author_id):
+    safe_id = "".join(c for c in author_id if c.isalnum() or c in ('-', '_'))
+    return os.path.join(AUTHOR_CACHE_DIR, f"{safe_id}.json")
+
+def load_author_cache(author_id):
+    """{publication key: {'num_citations': count when filled, 'pub': filled publication}}."""
+    try:
+        with open(_author_cache_path(author_id), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == AUTHOR_CACHE_VERSION:
+            return cache["publications"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+def save_author_cache(author_id, name, publications):
+    try:
+        os.makedirs(AUTHOR_CACHE_DIR, exist_ok=True)
+        with open(_author_cache_path(author_id), 'w', encoding='utf-8') as f:
+            # default=str: scholarly enums and other non-JSON values are stored as text
+            json.dump({"version": AUTHOR_CACHE_VERSION, "author_id": author_id, "name": name,
+                       "publications": publications}, f, default=str)
+    except OSError:
+        pass  # Read-only folder: the search still works, just uncached
+
+def stale_publications(stubs, cached):
+    """Stubs that are new, or whose citation count changed since they were filled."""
+    return [stub for stub in stubs
+            if publication_key(stub) not in cached
+            or cached[publication_key(stub)]["num_citations"] != stub.get('num_citations', 0)]
+
 def run_author_search():
     """Main execution flow: search author -> filter stubs -> fetch pubs -> save CSV/TXT/BIB."""
     # Initialize variables to avoid UnboundLocalError in finally block
@@ -271,23 +421,38 @@ def run_author_search():
             print(f"{Fore.YELLOW}⚠️  No papers matched your filters. Exiting.")
             return
 
-        print(f"{Fore.YELLOW}⚠️  Now fetching full details.{Style.RESET_ALL}")
-        print(f"\n{Fore.YELLOW}This might take a while... grab a coffee! ☕{Style.RESET_ALL}\n")
-
-        # Detailed fetch loop (Using filtered list)
+        # Only new or changed papers are fetched; the rest come from the local cache
+        cached = load_author_cache(author_id)
+        current_keys = {publication_key(pub) for pub in publications_stubs}
+        cached = {key: entry for key, entry in cached.items() if key in current_keys}
+        to_fill = stale_publications(filtered_stubs, cached)
+        print(f"{Fore.BLUE}ℹ️  {len(filtered_stubs) - len(to_fill)} papers up to date in the local cache, {len(to_fill)} to fetch.")
+
+        # Detailed fetch (concurrent, backs off when Google starts blocking)
+        unfilled_stubs = []
+        if to_fill:
+            print(f"{Fore.YELLOW}⚠️  Now fetching full details.{Style.RESET_ALL}")
+            print(f"\n{Fore.YELLOW}This might take a while... grab a coffee! ☕{Style.RESET_ALL}\n")
+            fetched, unfilled_stubs = fetch_publication_details(to_fill)
+            for pub_stub, pub in zip(to_fill, fetched):
+                if pub is not None:
+                    cached[publication_key(pub_stub)] = {"num_citations": pub_stub.get('num_citations', 0), "pub": pub}
+        save_author_cache(author_id, selected_author['name'], cached)
+
+        # Outputs are built from the cache; papers that could not be refreshed keep their
+        # previous details, and papers never fetched fall back to their stub
         filled_publications = []
-        for pub_stub in tqdm(filtered_stubs, desc="Fetching details", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]'):
-            try:
-                pub_filled = scholarly.fill(pub_stub)
-                filled_publications.append(pub_filled)
-            except AttributeError:
-                 # Catch Attribute Error during the fill loop (sign of blocking)
-                 tqdm.write(f"{Fore.RED}❌ Blocked while fetching details. Stopping early.")
-                 break
-            except Exception as e:
-                tqdm.write(f"{Fore.RED}❌ Error fetching details for '{pub_stub.get('bib', {}).get('title', 'Unknown Paper')}': {e}")
-                continue
-        
+        for pub_stub in filtered_stubs:
+            entry = cached.get(publication_key(pub_stub))
+            if entry:
+                filled_publications.append(dict(entry["pub"], num_citations=pub_stub.get('num_citations', 0)))
+        unfilled_stubs = [pub for pub in unfilled_stubs if publication_key(pub) not in cached]
+        if unfilled_stubs:
+            # Keep the partial results: blocked or failed papers are saved with their stub data,
+            # even when no paper could be fetched in full
+            print(f"{Fore.YELLOW}⚠️  {len(unfilled_stubs)} papers could not be fetched in full; saving their basic data.")
+            filled_publications.extend(unfilled_stubs)
+
         # Sort by year descending
         filled_publications.sort(key=lambda p: int(p.get('bib', {}).get('pub_year', 0) or 0), reverse=True)
 
@@ -304,8 +469,8 @@ def run_author_search():
         print(f"\n{Fore.CYAN}Saving CSV file to '{csv_output_file}'...{Style.RESET_ALL}")
         
         with open(csv_output_file, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Title", "Year", "Citations", "Authors", "Venue", "URL", "Abstract"])
+            writer = csv.DictWriter(file, fieldnames=layout_columns("scholar"))
+            writer.writeheader()
             for pub in filled_publications:
                 bib = pub.get('bib', {})
                 author_data = bib.get('author', 'N/A')
@@ -315,15 +480,15 @@ def run_author_search():
                 else: 
                     authors = '; '.join(author_data)
                 
-                writer.writerow([
-                    bib.get('title', 'N/A'), 
-                    bib.get('pub_year', 'N/A'), 
-                    pub.get('num_citations', 0), 
-                    authors, 
-                    bib.get('venue', 'N/A'), 
-                    pub.get('pub_url', 'N/A'),
-                    bib.get('abstract', 'N/A')
-                ])
+                writer.writerow(Paper(
+                    title=bib.get('title', 'N/A'),
+                    year=bib.get('pub_year', 'N/A'),
+                    citations=pub.get('num_citations', 0),
+                    authors=authors,
+                    venue=bib.get('venue', 'N/A'),
+                    url=pub.get('pub_url', 'N/A'),
+                    abstract=bib.get('abstract', 'N/A')
+                ).to_row("scholar"))
 
         # 2. Save ABNT TXT
         txt_output_file = os.path.join(output_folder, f"{sanitized_name}_references_ABNT.txt")
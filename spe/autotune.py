@@ -0,0 +1,229 @@
+# autotune.py
+
+import os
+import re
+import json
+import time
+import socket
+import numpy as np
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+# --- AUTOTUNE CONFIGURATION ---
+# Profiles are stored per host, so one models/ folder can be shared by several machines.
+MODEL_DIR = "models"
+# The AI filter's model (llama_filter.FILENAME); its quantizations are benchmarked by default
+DEFAULT_MODEL = "qwen2.5-1.5b-instruct-q4_k_m.gguf"
+PROFILE_FILE = os.path.join(MODEL_DIR, "autotune.json")
+BENCH_CONTEXT = 1024
+DECODE_TOKENS = 16
+# Output tokens per screening decision, used to weigh prompt vs decode speed
+DECISION_TOKENS = 5
+BATCH_SIZES = [64, 128, 256, 512]
+# Quantization suffix of a GGUF name ("-q4_k_m", ".Q8_0", "-f16"): the rest names the model
+QUANT_SUFFIX = re.compile(r'[-.](?:i?q\d[\w]*|f16|f32|bf16)$', re.IGNORECASE)
+
+# Fixed synthetic abstracts: same token load on every machine, so results are comparable
+SYNTHETIC_ABSTRACTS = [
+    "We report first-principles calculations of the electronic structure and phonon dispersion of monolayer "
+    "transition metal dichalcogenides under biaxial strain. Density functional theory with hybrid functionals "
+    "predicts a direct-to-indirect band gap transition at two percent tensile strain, while phonon calculations "
+    "confirm dynamical stability up to five percent. The results suggest strain engineering as a route to tune "
+    "optoelectronic properties for flexible photodetectors.",
+    "A convolutional neural network is trained on ten thousand annotated microscopy images to segment grain "
+    "boundaries in polycrystalline steel. The model reaches a mean intersection over union of 0.91 and "
+    "generalizes to unseen alloys after fine-tuning on fifty images. We discuss the failure modes related to "
+    "etching artifacts and release the dataset and trained weights.",
+    "Molecular dynamics simulations with a machine-learned interatomic potential are used to study lithium "
+    "diffusion in amorphous silicon anodes. Diffusion coefficients computed between 300 and 900 K follow an "
+    "Arrhenius law with an activation energy of 0.35 eV. Comparison with ab initio molecular dynamics shows "
+    "agreement within ten percent at a fraction of the computational cost.",
+    "We present a survey of two hundred randomized controlled trials on remote patient monitoring published "
+    "between 2010 and 2023. Pooled effect sizes indicate a modest reduction in hospital readmissions, with high "
+    "heterogeneity across chronic conditions. Risk of bias was assessed with the Cochrane tool and publication "
+    "bias was evaluated with funnel plots.",
+]
+
+def host_name():
+    return socket.gethostname() or "default"
+
+def model_family(filename):
+    """Model name of a GGUF file without its quantization ('qwen2.5-1.5b-instruct')."""
+    return QUANT_SUFFIX.sub("", os.path.splitext(os.path.basename(filename))[0]).lower()
+
+def list_quantizations(model_filename=None, model_dir=MODEL_DIR):
+    """
+    GGUF files directly inside `model_dir`: only the quantizations of `model_filename`
+    when given, every model otherwise.
+    """
+    if not os.path.isdir(model_dir):
+        return []
+    family = model_family(model_filename) if model_filename else None
+    return sorted(os.path.join(model_dir, f) for f in os.listdir(model_dir)
+                  if f.lower().endswith(".gguf") and (family is None or model_family(f) == family))
+
+def thread_candidates():
+    """A few thread counts around the core count (all cores, half, quarter)."""
+    cores = os.cpu_count() or 1
+    return sorted({max(1, cores // 4), max(1, cores // 2), cores})
+
+def benchmark(model_path, n_threads, n_threads_batch, n_batch):
+    """
+    Loads `model_path` with the given settings and measures prompt-eval and
+    decode throughput (tokens/s) over SYNTHETIC_ABSTRACTS.
+    llama.cpp evaluates prompts with `n_threads_batch` and decodes with `n_threads`.
+    """
+    import llama_cpp
+    from llama_cpp import Llama
+
+    llm = Llama(model_path=model_path, n_ctx=BENCH_CONTEXT, n_threads=n_threads, n_threads_batch=n_threads_batch,
+                n_batch=n_batch, n_gpu_layers=-1, verbose=False)
+    try:
+        prompt_tokens, prompt_time = 0, 0.0
+        decode_tokens, decode_time = 0, 0.0
+        n_vocab = llm.n_vocab()
+
+        for abstract in SYNTHETIC_ABSTRACTS:
+            tokens = llm.tokenize(f"Abstract: {abstract}\nIs this paper relevant? Reply YES or NO.".encode("utf-8"), add_bos=True)
+            llm.reset()
+
+            start = time.perf_counter()
+            llm.eval(tokens)
+            prompt_time += time.perf_counter() - start
+            prompt_tokens += len(tokens)
+
+            # Greedy decode from the raw logits; the text itself is irrelevant
+            start = time.perf_counter()
+            for _ in range(DECODE_TOKENS):
+                logits = np.ctypeslib.as_array(llama_cpp.llama_get_logits(llm.ctx), shape=(n_vocab,))
+                llm.eval([int(logits.argmax())])
+            decode_time += time.perf_counter() - start
+            decode_tokens += DECODE_TOKENS
+    finally:
+        close = getattr(llm, "close", None)
+        if close:
+            close()
+
+    return {
+        "prompt_tps": prompt_tokens / prompt_time if prompt_time else 0.0,
+        "decode_tps": decode_tokens / decode_time if decode_time else 0.0,
+        "prompt_tokens": prompt_tokens // len(SYNTHETIC_ABSTRACTS),
+    }
+
+def best_configuration(results):
+    """
+    Combines the best settings of each phase for one model: prompt eval depends only on
+    (n_threads_batch, n_batch) and decode only on n_threads, so each is picked on its own speed.
+    """
+    fastest_prompt = max(results, key=lambda r: r["prompt_tps"])
+    fastest_decode = max(results, key=lambda r: r["decode_tps"])
+    return {
+        "model_path": fastest_prompt["model_path"],
+        "n_threads": fastest_decode["n_threads"],
+        "n_threads_batch": fastest_prompt["n_threads_batch"],
+        "n_batch": fastest_prompt["n_batch"],
+        "prompt_tps": fastest_prompt["prompt_tps"],
+        "decode_tps": fastest_decode["decode_tps"],
+        "prompt_tokens": fastest_prompt["prompt_tokens"],
+    }
+
+def seconds_per_paper(result):
+    """Estimated screening time of one paper: one prompt eval + a short YES/NO decode."""
+    if not result["prompt_tps"] or not result["decode_tps"]:
+        return float("inf")
+    return result["prompt_tokens"] / result["prompt_tps"] + DECISION_TOKENS / result["decode_tps"]
+
+def load_profiles():
+    try:
+        with open(PROFILE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_profile(profile):
+    profiles = load_profiles()
+    profiles[host_name()] = profile
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    with open(PROFILE_FILE, "w") as f:
+        json.dump(profiles, f, indent=2)
+
+def load_profile():
+    """
+    Returns the tuned configuration of this host, or None when autotune was
+    never run here or the tuned model file is gone.
+    """
+    profile = load_profiles().get(host_name())
+    if not profile or not os.path.exists(profile.get("model_path", "")):
+        return None
+    return profile
+
+def run_autotune(model_filename=DEFAULT_MODEL, all_models=False):
+    """
+    Benchmarks thread counts x batch sizes for every quantization of `model_filename`
+    (every GGUF in models/ with `all_models`) and saves the fastest for this host.
+    Each run uses the same count for n_threads and n_threads_batch; the two are then
+    chosen separately from the decode and prompt-eval speeds.
+    """
+    print(f"\n{Fore.CYAN}------------------ Local Inference Autotune -------------------{Style.RESET_ALL}")
+
+    try:
+        import llama_cpp
+    except ImportError:
+        print(f"{Fore.RED}❌ 'llama-cpp-python' is not installed. Use 'Setup Local AI' in the main menu first.")
+        return None
+
+    models = list_quantizations(None if all_models else model_filename)
+    if not models:
+        print(f"{Fore.RED}❌ No GGUF models found in '{MODEL_DIR}'. Run the AI filter once to download one.")
+        return None
+    if all_models:
+        print(f"{Fore.YELLOW}⚠️  Comparing every model in '{MODEL_DIR}': the fastest one becomes the screening model.{Style.RESET_ALL}")
+
+    threads = thread_candidates()
+    total = len(models) * len(threads) * len(BATCH_SIZES)
+    print(f"{Fore.BLUE}ℹ️  Host: {host_name()} | {len(models)} model(s) x {len(threads)} thread counts x {len(BATCH_SIZES)} batch sizes = {total} runs{Style.RESET_ALL}")
+
+    candidates = []
+    for model_path in models:
+        results = []
+        for n_threads in threads:
+            for n_batch in BATCH_SIZES:
+                try:
+                    result = benchmark(model_path, n_threads, n_threads, n_batch)
+                except Exception as e:
+                    print(f"{Fore.RED}   ! {os.path.basename(model_path)} threads={n_threads} batch={n_batch} failed: {e}{Style.RESET_ALL}")
+                    continue
+                result.update({"model_path": model_path, "n_threads": n_threads, "n_threads_batch": n_threads, "n_batch": n_batch})
+                results.append(result)
+                print(f"{Fore.YELLOW}   • {os.path.basename(model_path):<40} threads={n_threads:<3} batch={n_batch:<4} "
+                      f"prompt={result['prompt_tps']:7.1f} tok/s  decode={result['decode_tps']:6.1f} tok/s{Style.RESET_ALL}")
+        if results:
+            candidates.append(best_configuration(results))
+
+    if not candidates:
+        print(f"{Fore.RED}❌ No benchmark completed.")
+        return None
+
+    best = min(candidates, key=seconds_per_paper)
+    profile = {
+        "model_path": best["model_path"],
+        "n_threads": best["n_threads"],
+        "n_threads_batch": best["n_threads_batch"],
+        "n_batch": best["n_batch"],
+        "prompt_tps": round(best["prompt_tps"], 1),
+        "decode_tps": round(best["decode_tps"], 1),
+        "tuned_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    save_profile(profile)
+
+    print(f"\n{Fore.GREEN}✅ Best configuration for '{host_name()}':{Style.RESET_ALL}")
+    print(f"   Model    : {os.path.basename(profile['model_path'])}")
+    print(f"   n_threads: {profile['n_threads']}  n_threads_batch: {profile['n_threads_batch']}  n_batch: {profile['n_batch']}")
+    print(f"   ~{seconds_per_paper(best):.2f} s per paper")
+    print(f"{Fore.CYAN}Saved to {PROFILE_FILE}. The AI filter will use it automatically.{Style.RESET_ALL}")
+    return profile
+
+if __name__ == "__main__":
+    import sys
+    run_autotune(all_models="--all-models" in sys.argv[1:])
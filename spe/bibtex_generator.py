@@ -3,13 +3,24 @@
 import os
 import csv
 import re
+import json
+import hashlib
 from colorama import Fore, Style, init
 
+from . import schema as sc
+
 init(autoreset=True)
 
 # Files that MUST be ignored to prevent duplication or reading garbage data
-IGNORE_FILES = ["output_statistics.csv", "productive_years.csv", "prolific_authors.csv"]
+IGNORE_FILES = ["output_statistics.csv", "productive_years.csv", "prolific_authors.csv", "screening_log.csv", "fulltext_screening_log.csv"]
 IGNORE_FOLDERS = ["log", "models", "__pycache__"]
+# Folders never descended into: PDFs, binary datasets, environments (hidden folders too)
+PRUNE_FOLDERS = {"pdfs", "approved_pdfs", "consolidated_dataset", "venv", "env", "node_modules"}
+
+# Persistent index: per source CSV its size/mtime and the BibTeX entries it produced,
+# so re-runs only parse changed CSVs
+BIBTEX_INDEX = ".bibtex_index.json"
+BIBTEX_INDEX_VERSION = 3
 
 def clean_text_for_latex(text):
     """Sanitizes text to avoid breaking LaTeX compilation."""
@@ -19,19 +30,9 @@ def clean_text_for_latex(text):
     text = " ".join(text.split())
     return text
 
-def extract_year_robust(row):
-    """Extracts a 4-digit year from any column that looks like a date."""
-    val_found = None
-    
-    # Scan all keys looking for 'year', 'date', 'published'
-    for key, value in row.items():
-        if not key: continue
-        clean_key = key.strip().lower()
-        if clean_key in ['year', 'pub_year', 'published', 'date']:
-            if value and str(value).strip():
-                val_found = str(value).strip()
-                break
-    
+def extract_year_robust(row, schema):
+    """Extracts a 4-digit year from the year/date columns of the row (see schema.FIELD_ALIASES)."""
+    val_found = schema.year(row).strip()
     if not val_found: return "n.d."
 
     # Regex to catch 19XX or 20XX
@@ -60,38 +61,18 @@ def generate_citation_key(authors, year, title):
     except:
         return f"Unknown{year}Article"
 
-def row_to_bibtex(row):
-    """Converts a CSV row into a formatted BibTeX string."""
+def row_to_bibtex(row, schema):
+    """Converts a CSV row into a formatted BibTeX string, through its resolved header."""
     # 1. Find Title
-    title = None
-    for k, v in row.items():
-        if k and k.strip().lower() == 'title':
-            title = v
-            break
-            
+    title = schema.title(row)
     if not title or title.lower() == "n/a" or not title.strip():
         return None, None
 
     # 2. Extract Data
-    year = extract_year_robust(row)
-    
-    authors = "Unknown"
-    for k, v in row.items():
-        if k and k.strip().lower() == 'authors':
-            authors = v
-            break
-
-    url = ""
-    for k, v in row.items():
-        if k and k.strip().lower() in ['url', 'pdf_url', 'link']:
-            url = v
-            break
-    
-    journal = None
-    for k, v in row.items():
-        if k and k.strip().lower() in ['venue', 'journal']:
-            journal = v
-            break
+    year = extract_year_robust(row, schema)
+    authors = schema.authors(row) or "Unknown"
+    url = schema.url(row)
+    journal = schema.venue(row)
     
     if not journal:
         if "arxiv.org" in str(url): journal = "arXiv preprint"
@@ -110,7 +91,7 @@ def row_to_bibtex(row):
         bib_entry += f"  url = {{{url}}},\n"
     bib_entry += "}\n"
 
-    unique_id = re.sub(r'[^a-zA-Z0-9]', '', title.lower())
+    unique_id = sc.paper_key(title)
     return unique_id, bib_entry
 
 def get_target_files(mode, selected_folder=None):
@@ -125,11 +106,10 @@ def get_target_files(mode, selected_folder=None):
     
     for search_root in search_roots:
         for root, dirs, files in os.walk(search_root):
-            # Explicitly block unwanted folders
-            if any(ignore in root.split(os.sep) for ignore in IGNORE_FOLDERS):
-                continue
+            # Prune unwanted folders in place, so os.walk never enters them
+            dirs[:] = sorted(d for d in dirs if d not in IGNORE_FOLDERS and d not in PRUNE_FOLDERS and not d.startswith('.'))
             
-            for file in files:
+            for file in sorted(files):
                 if not file.endswith(".csv"): continue
                 if file in IGNORE_FILES: continue
 
@@ -159,6 +139,112 @@ def get_target_files(mode, selected_folder=None):
     
     return found_files
 
+def load_bibtex_index():
+    try:
+        with open(BIBTEX_INDEX, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == BIBTEX_INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {"version": BIBTEX_INDEX_VERSION, "files": {}, "outputs": {}}
+
+def save_bibtex_index(index):
+    # Sources deleted since the last run are dropped
+    index["files"] = {path: entry for path, entry in index["files"].items() if os.path.exists(path)}
+    with open(BIBTEX_INDEX, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+def parse_bibtex_source(file_path):
+    """
+    [unique_id, bib_entry] pairs of one CSV (empty when it has no title column).
+    Rows the AI rejected (AI_Decision = NO, e.g. in the multi-criteria table) are skipped.
+    """
+    entries = []
+    # Detect encoding (utf-8-sig handles BOM from Excel)
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        schema = sc.resolve(reader.fieldnames)
+
+        # Minimal column validation: a title column
+        if not schema.has("title"):
+            return entries
+
+        for row in reader:
+            if schema.decision(row).strip().upper() == "NO":
+                continue
+            unique_id, bib_entry = row_to_bibtex(row, schema)
+            if unique_id:
+                entries.append([unique_id, bib_entry])
+    return entries
+
+def update_bibtex_index(index, target_files):
+    """
+    Re-parses only the target CSVs that are new or changed (size / mtime).
+    Returns the number of parsed files; unreadable files are reported and skipped.
+    """
+    parsed = 0
+    for file_path in target_files:
+        rel_path = os.path.relpath(file_path, ".")
+        st = os.stat(file_path)
+        cached = index["files"].get(rel_path)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            continue
+        try:
+            entries = parse_bibtex_source(file_path)
+        except Exception as e:
+            print(f"{Fore.RED}   ! Error reading {file_path}: {e}{Style.RESET_ALL}")
+            index["files"].pop(rel_path, None)
+            continue
+        index["files"][rel_path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "entries": entries}
+        parsed += 1
+    return parsed
+
+def render_bibliography(index, target_files, mode):
+    """
+    Builds the .bib text from the index, in scan order with global deduplication.
+    Returns (text, [(source, entries added)], total unique entries).
+    """
+    processed_ids = set()
+    contributions = []
+    parts = [f"% Auto-generated by Synoptic Paper Engine\n", f"% Mode: {mode.upper()}\n"]
+
+    for file_path in target_files:
+        rel_path = os.path.relpath(file_path, ".")
+        cached = index["files"].get(rel_path)
+        if not cached:
+            continue
+
+        file_entries = []  # Temporary buffer for the current file
+        for unique_id, bib_entry in cached["entries"]:
+            # Global Deduplication check
+            if unique_id not in processed_ids:
+                file_entries.append(bib_entry)
+                processed_ids.add(unique_id)
+
+        # Only write the block if this file actually contributed new entries
+        if file_entries:
+            # Visual separator and source filename in BibTeX
+            parts.append(f"\n% =========================================\n")
+            parts.append(f"% Source: {rel_path}\n")
+            parts.append(f"% =========================================\n")
+            parts.extend(entry + "\n" for entry in file_entries)
+            contributions.append((rel_path, len(file_entries)))
+
+    return "".join(parts), contributions, len(processed_ids)
+
+def write_bibliography(index, output_filename, text):
+    """Writes the .bib only when its content changed. Returns True if written."""
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    previous = index["outputs"].get(output_filename)
+    if previous and previous["digest"] == digest and os.path.exists(output_filename) \
+            and os.path.getsize(output_filename) == previous["size"]:
+        return False
+    with open(output_filename, "w", encoding="utf-8") as bib_file:
+        bib_file.write(text)
+    index["outputs"][output_filename] = {"digest": digest, "size": os.path.getsize(output_filename)}
+    return True
+
 def scan_and_generate_bibtex():
     """Main Menu for BibTeX Generator."""
     print(f"\n{Fore.CYAN}---------------- BibTeX Generator Configuration ----------------{Style.RESET_ALL}")
@@ -206,59 +292,24 @@ def scan_and_generate_bibtex():
         print(f"{Fore.RED}❌ No matching CSV files found.{Style.RESET_ALL}")
         return
 
-    # Processing
-    processed_ids = set()
-    total_entries = 0
+    # Processing: changed CSVs are parsed, the rest comes from the index
     output_filename = "references_raw.bib" if mode == "raw" else "references_filtered.bib"
 
     try:
-        with open(output_filename, "w", encoding="utf-8") as bib_file:
-            bib_file.write(f"% Auto-generated by Synoptic Paper Engine\n")
-            bib_file.write(f"% Mode: {mode.upper()}\n")
-            
-            for file_path in target_files:
-                file_entries = [] # Temporary buffer for the current file
-                
-                try:
-                    # Detect encoding (utf-8-sig handles BOM from Excel)
-                    with open(file_path, "r", encoding="utf-8-sig") as f:
-                        reader = csv.DictReader(f)
-                        
-                        # Minimal column validation
-                        if not reader.fieldnames: continue
-                        
-                        # Check for title column (case insensitive)
-                        has_title = any("title" in h.lower() for h in reader.fieldnames)
-                        if not has_title: continue
-
-                        for row in reader:
-                            unique_id, bib_entry = row_to_bibtex(row)
-                            
-                            # Global Deduplication check
-                            if unique_id and unique_id not in processed_ids:
-                                file_entries.append(bib_entry)
-                                processed_ids.add(unique_id)
-                                total_entries += 1
-                        
-                        # Only write the block if this file actually contributed new entries
-                        if file_entries:
-                            rel_path = os.path.relpath(file_path, ".")
-                            
-                            # Write visual separator and source filename in BibTeX
-                            bib_file.write(f"\n% =========================================\n")
-                            bib_file.write(f"% Source: {rel_path}\n")
-                            bib_file.write(f"% =========================================\n")
-                            
-                            for entry in file_entries:
-                                bib_file.write(entry + "\n")
-
-                            print(f"{Fore.GREEN}   + Added {len(file_entries)} entries from: {Style.DIM}{rel_path}{Style.RESET_ALL}")
-
-                except Exception as e:
-                    print(f"{Fore.RED}   ! Error reading {file_path}: {e}{Style.RESET_ALL}")
+        index = load_bibtex_index()
+        parsed = update_bibtex_index(index, target_files)
+        text, contributions, total_entries = render_bibliography(index, target_files, mode)
+
+        for rel_path, count in contributions:
+            print(f"{Fore.GREEN}   + Added {count} entries from: {Style.DIM}{rel_path}{Style.RESET_ALL}")
+
+        written = write_bibliography(index, output_filename, text)
+        if parsed or written:
+            save_bibtex_index(index)
+        print(f"{Fore.BLUE}ℹ️  {parsed} CSVs parsed, {len(target_files) - parsed} reused from '{BIBTEX_INDEX}'.{Style.RESET_ALL}")
 
         print(f"\n{Fore.CYAN}{Style.BRIGHT}✅ Success!{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}File created: {Fore.GREEN}{output_filename}")
+        print(f"{Fore.WHITE}File {'created' if written else 'unchanged'}: {Fore.GREEN}{output_filename}")
         print(f"{Fore.WHITE}Total unique references: {Fore.GREEN}{total_entries}")
         input(f"\n{Fore.MAGENTA}Press Enter to return to the main menu...{Style.RESET_ALL}")
     except Exception as e:
@@ -0,0 +1,141 @@
+# coauthors.py
+
+import numpy as np
+
+# SciPy (a core dependency) provides the sparse matrices and graph routines;
+# it is imported on first use, like in keywords.py
+
+# --- CO-AUTHORSHIP CONFIGURATION ---
+# Papers x authors incidence matrix B (one 1 per authorship); the co-authorship
+# graph is A = B^T B without its diagonal, A[i, j] = papers shared by i and j.
+PAGERANK_DAMPING = 0.85
+PAGERANK_ITERATIONS = 100
+PAGERANK_TOLERANCE = 1e-9
+
+def split_authors(raw_authors):
+    """Author names of one paper, as the analyzer splits them (',' or ';')."""
+    return [a.strip() for a in (raw_authors or "").replace(";", ",").split(',') if a.strip()]
+
+class CoauthorGraph:
+    """
+    Interned authors + sparse matrices of a corpus.
+    `names[j]` is the author of column j; `incidence` is papers x authors (CSR),
+    `adjacency` is authors x authors (CSR, weighted by shared papers).
+    """
+    def __init__(self, names, incidence, adjacency, citations):
+        self.names = names
+        self.incidence = incidence
+        self.adjacency = adjacency
+        self.citations = citations
+
+    @property
+    def n_authors(self):
+        return len(self.names)
+
+def build_graph(author_lists, citations=None):
+    """
+    `author_lists` holds one list of names per paper; `citations` one count per paper
+    (None or negative = unknown, counted as 0 for the h-index).
+    """
+    from scipy import sparse
+
+    names, lengths = [], []
+    for authors in author_lists:
+        # A name repeated in one paper counts once
+        unique = list(dict.fromkeys(authors))
+        names.extend(unique)
+        lengths.append(len(unique))
+
+    vocabulary = list(dict.fromkeys(names))
+    author_ids = dict(zip(vocabulary, range(len(vocabulary))))
+    columns = np.fromiter(map(author_ids.__getitem__, names), dtype=np.int64, count=len(names))
+    rows = np.repeat(np.arange(len(author_lists), dtype=np.int64), lengths)
+
+    incidence = sparse.csr_matrix((np.ones(len(columns), dtype=np.int32), (rows, columns)),
+                                  shape=(len(author_lists), len(vocabulary)))
+    adjacency = (incidence.T @ incidence).tocsr()
+    adjacency.setdiag(0)
+    adjacency.eliminate_zeros()
+
+    if citations is None:
+        citations = np.zeros(len(author_lists), dtype=np.int64)
+    citations = np.array([c if c is not None and c > 0 else 0 for c in citations], dtype=np.int64)
+    return CoauthorGraph(np.array(vocabulary, dtype=object), incidence, adjacency, citations)
+
+def connected_components(graph):
+    """(number of groups, group label of every author); singletons are their own group."""
+    from scipy.sparse import csgraph
+    return csgraph.connected_components(graph.adjacency, directed=False)
+
+def paper_counts(graph):
+    return np.asarray(graph.incidence.sum(axis=0)).ravel()
+
+def degrees(graph):
+    """(distinct co-authors, total collaborations = sum of shared papers) per author."""
+    return np.diff(graph.adjacency.indptr), np.asarray(graph.adjacency.sum(axis=1)).ravel()
+
+def pagerank(graph, damping=PAGERANK_DAMPING):
+    """
+    PageRank centrality on the weighted co-authorship graph (power iteration).
+    Authors without co-authors spread their rank uniformly.
+    """
+    n = graph.n_authors
+    if not n:
+        return np.zeros(0)
+    out_weight = np.asarray(graph.adjacency.sum(axis=1)).ravel().astype(np.float64)
+    dangling = out_weight == 0
+    inverse = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    transition = graph.adjacency.T.tocsr().astype(np.float64)
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(PAGERANK_ITERATIONS):
+        spread = transition @ (rank * inverse) + rank[dangling].sum() / n
+        new_rank = (1 - damping) / n + damping * spread
+        converged = np.abs(new_rank - rank).sum() < PAGERANK_TOLERANCE
+        rank = new_rank
+        if converged:
+            break
+    return rank
+
+def h_index(graph):
+    """
+    h-index of every author from the per-paper citations: authorships are sorted by
+    (author, citations desc); within an author the rank-th paper counts if it has at
+    least `rank` citations, and those papers form a prefix, so h = their number.
+    """
+    coo = graph.incidence.tocoo()
+    authors, cites = coo.col, graph.citations[coo.row]
+    order = np.lexsort((-cites, authors))
+    authors, cites = authors[order], cites[order]
+
+    starts = np.flatnonzero(np.r_[True, authors[1:] != authors[:-1]]) if len(authors) else np.zeros(0, dtype=np.int64)
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(authors)]))
+    rank = np.arange(len(authors)) - group_start + 1
+    return np.bincount(authors[cites >= rank], minlength=graph.n_authors)
+
+def strongest_collaborations(graph, top_n=50):
+    """[(author, author, shared papers)] for the most frequent pairs."""
+    from scipy import sparse
+
+    pairs = sparse.triu(graph.adjacency, k=1).tocoo()
+    order = np.argsort(-pairs.data, kind='stable')[:top_n]
+    return [(graph.names[pairs.row[i]], graph.names[pairs.col[i]], int(pairs.data[i])) for i in order]
+
+def collaboration_groups(graph, labels, top_n=20, members_shown=5):
+    """
+    Largest connected groups: [(authors, papers, most productive members)].
+    A paper belongs to the group of its authors (all co-authors share one group).
+    """
+    sizes = np.bincount(labels)
+    papers = paper_counts(graph)
+    coo = graph.incidence.tocoo()
+    paper_group = np.full(graph.incidence.shape[0], -1, dtype=np.int64)
+    paper_group[coo.row] = labels[coo.col]
+    group_papers = np.bincount(paper_group[paper_group >= 0], minlength=len(sizes))
+
+    groups = []
+    for label in np.argsort(-sizes, kind='stable')[:top_n]:
+        members = np.flatnonzero(labels == label)
+        leaders = members[np.argsort(-papers[members], kind='stable')[:members_shown]]
+        groups.append((int(sizes[label]), int(group_papers[label]), [graph.names[m] for m in leaders]))
+    return groups
@@ -0,0 +1,331 @@
+# consolidated.py
+
+import os
+import csv
+import json
+import hashlib
+import numpy as np
+
+from . import schema as sc
+from . import dedup
+
+# --- CONSOLIDATED DATASET CONFIGURATION ---
+# Every result folder is ingested once into a typed, NumPy-backed columnar table.
+# Each source CSV becomes one part file; only new or changed CSVs are (re)ingested.
+# Every row carries a paper cluster label; new rows are clustered against the stored
+# representative of each cluster (CLUSTERS_FILE), never against the whole table.
+CONSOLIDATED_DIR = "consolidated_dataset"
+MANIFEST_FILE = "manifest.json"
+CLUSTERS_FILE = "clusters.npz"
+FORMAT_VERSION = 3
+MAX_YEAR = np.iinfo(np.int16).max
+
+# Folder prefix -> source kind (the kind code is the index in SOURCE_KINDS)
+SOURCE_PREFIXES = [
+    ("arxiv_results", "arxiv"),
+    ("results", "raw"),
+    ("content_filtered", "content_filtered"),
+    ("llama_filtered", "llama_filtered"),
+]
+SOURCE_KINDS = ["raw", "arxiv", "content_filtered", "llama_filtered"]
+SKIP_FILES = {"screening_log.csv", "fulltext_screening_log.csv", "agreement_matrix.csv"}
+
+# Decision codes: approved / rejected / no decision column (raw search results)
+DECISION_YES, DECISION_NO, DECISION_NONE = 1, 0, -1
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def _pack(strings):
+    """Packs strings into one UTF-8 byte buffer + offsets (no fixed-width padding)."""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(), offsets
+
+def unpack(data, offsets, indices):
+    """Decodes the packed strings at `indices`."""
+    raw = data.tobytes()
+    return [raw[offsets[i]:offsets[i + 1]].decode('utf-8') for i in indices]
+
+def source_kind(path):
+    top = os.path.normpath(path).split(os.sep)[0]
+    for prefix, kind in SOURCE_PREFIXES:
+        if top.startswith(prefix):
+            return kind
+    return None
+
+def list_source_csvs(root="."):
+    """Every data CSV inside the results*, arxiv_results*, content_filtered* and llama_filtered* folders."""
+    sources = []
+    for entry in sorted(os.listdir(root)):
+        if not os.path.isdir(os.path.join(root, entry)) or source_kind(entry) is None:
+            continue
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, entry)):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d != "approved_pdfs")
+            for f in sorted(filenames):
+                if f.endswith('.csv') and f not in SKIP_FILES and not f.startswith("output_statistics"):
+                    sources.append(os.path.relpath(os.path.join(dirpath, f), root))
+    return sources
+
+def _row_decision(row, schema, filename):
+    decision = schema.decision(row).strip().upper()
+    if decision in ("YES", "NO"):
+        return DECISION_YES if decision == "YES" else DECISION_NO
+    # Only High / Medium relevance count as approved, as in cross_validator
+    if filename.startswith("Rejected") or filename == "Low_Relevance.csv":
+        return DECISION_NO
+    if filename.endswith("_Relevance.csv") or filename.startswith("llama_"):
+        return DECISION_YES
+    return DECISION_NONE
+
+def ingest_csv(path):
+    """Reads one CSV into typed columns (one part of the dataset)."""
+    filename = os.path.basename(path)
+    titles, urls, authors, author_names, paper_keys = [], [], [], [], []
+    years, citations, decisions, author_hashes, author_rows = [], [], [], [], []
+
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        schema = sc.resolve(reader.fieldnames)
+        for row in reader:
+            title = schema.title(row).strip()
+            if not title or title.upper() == "N/A":
+                continue
+
+            raw_year = schema.year(row).strip()
+            raw_citations = schema.citations(row)
+            raw_authors = schema.authors(row)
+            try:
+                cit = int(float(raw_citations))
+            except (ValueError, TypeError):
+                cit = -1
+
+            index = len(titles)
+            titles.append(title)
+            urls.append(schema.url(row))
+            authors.append(raw_authors)
+            # Out-of-range years (typos, ids in the year column) would overflow int16
+            years.append(int(raw_year) if raw_year.isdigit() and int(raw_year) <= MAX_YEAR else 0)
+            citations.append(cit)
+            decisions.append(_row_decision(row, schema, filename))
+            # Identity: every key of the paper (DOI / ids / title), tab-separated, see unique_papers
+            paper_keys.append("\t".join(schema.paper_keys(row, title)))
+
+            for name in (a.strip() for a in raw_authors.replace(";", ",").split(',')):
+                if name:
+                    author_names.append(name)
+                    author_hashes.append(_hash64(name))
+                    author_rows.append(index)
+
+    title_data, title_offsets = _pack(titles)
+    url_data, url_offsets = _pack(urls)
+    authors_data, authors_offsets = _pack(authors)
+    name_data, name_offsets = _pack(author_names)
+    keys_data, keys_offsets = _pack(paper_keys)
+    return {
+        "year": np.array(years, dtype=np.int16),
+        "citations": np.array(citations, dtype=np.int32),
+        "decision": np.array(decisions, dtype=np.int8),
+        "title_data": title_data, "title_offsets": title_offsets,
+        "url_data": url_data, "url_offsets": url_offsets,
+        "authors_data": authors_data, "authors_offsets": authors_offsets,
+        "author_hash": np.array(author_hashes, dtype=np.uint64),
+        "author_row": np.array(author_rows, dtype=np.int64),
+        "author_name_data": name_data, "author_name_offsets": name_offsets,
+        "keys_data": keys_data, "keys_offsets": keys_offsets,
+    }
+
+def load_manifest(dataset_dir=CONSOLIDATED_DIR):
+    try:
+        with open(os.path.join(dataset_dir, MANIFEST_FILE), 'r') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == FORMAT_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": FORMAT_VERSION, "parts": {}, "clusters": 0}
+
+def load_clusters(dataset_dir=CONSOLIDATED_DIR, manifest=None):
+    """
+    The cluster state: `parent` (merges between clusters, see resolve_clusters) and the
+    title, keys and MinHash signature of each cluster's representative (its first row).
+    """
+    manifest = manifest or load_manifest(dataset_dir)
+    if manifest.get("clusters"):
+        with np.load(os.path.join(dataset_dir, CLUSTERS_FILE)) as f:
+            state = {name: f[name] for name in f.files}
+        if len(state["parent"]) == manifest["clusters"]:
+            return state
+    empty_data, empty_offsets = _pack([])
+    return {"parent": np.zeros(0, dtype=np.int64),
+            "signatures": np.zeros((0, dedup.MINHASH_PERMUTATIONS), dtype=np.uint32),
+            "title_data": empty_data, "title_offsets": empty_offsets,
+            "keys_data": empty_data, "keys_offsets": empty_offsets}
+
+def resolve_clusters(parent):
+    """Final cluster id of every cluster id (follows the merges recorded in `parent`)."""
+    while True:
+        resolved = parent[parent]
+        if np.array_equal(resolved, parent):
+            return parent
+        parent = resolved
+
+def assign_clusters(state, titles, key_lists):
+    """
+    Clusters new rows against the existing representatives only and updates `state`:
+    rows matching a representative get its cluster id, the others open new clusters,
+    and representatives linked through the new rows are merged.
+    Returns the cluster id of every row.
+    """
+    reps = len(state["parent"])
+    rep_titles = unpack(state["title_data"], state["title_offsets"], range(reps))
+    rep_keys = [k.split("\t") if k else [] for k in unpack(state["keys_data"], state["keys_offsets"], range(reps))]
+    signatures = np.concatenate([state["signatures"], dedup.minhash_signatures(titles)])
+    # Each label is the index of the cluster's first record: a representative if it is below `reps`
+    labels = np.array(dedup.near_duplicate_clusters(rep_titles + titles, rep_keys + key_lists, signatures),
+                      dtype=np.int64)
+
+    parent = resolve_clusters(state["parent"])
+    for rep in np.flatnonzero(labels[:reps] != np.arange(reps)):
+        a, b = parent[rep], parent[labels[rep]]
+        parent[parent == max(a, b)] = min(a, b)
+
+    row_labels = labels[reps:]
+    is_new = row_labels >= reps
+    new_roots = np.unique(row_labels[is_new])
+    clusters = np.empty(len(titles), dtype=np.int64)
+    clusters[~is_new] = parent[row_labels[~is_new]]
+    clusters[is_new] = reps + np.searchsorted(new_roots, row_labels[is_new])
+
+    # The first row of each new cluster becomes its representative
+    first_rows = new_roots - reps
+    state["parent"] = np.concatenate([parent, reps + np.arange(len(new_roots))])
+    state["signatures"] = signatures[np.r_[np.arange(reps), new_roots].astype(np.int64)]
+    state["title_data"], state["title_offsets"] = _pack(rep_titles + [titles[i] for i in first_rows])
+    state["keys_data"], state["keys_offsets"] = _pack(["\t".join(k) for k in rep_keys]
+                                                      + ["\t".join(key_lists[i]) for i in first_rows])
+    return clusters
+
+def update_dataset(root=".", dataset_dir=CONSOLIDATED_DIR):
+    """
+    Incremental append: ingests new or changed CSVs, drops parts whose CSV is gone.
+    Returns (added, updated, removed) counts.
+    """
+    os.makedirs(dataset_dir, exist_ok=True)
+    manifest = load_manifest(dataset_dir)
+    parts = manifest["parts"]
+    clusters = load_clusters(dataset_dir, manifest)
+    sources = list_source_csvs(root)
+    added = updated = 0
+
+    for source in sources:
+        st = os.stat(os.path.join(root, source))
+        entry = parts.get(source)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            continue
+        try:
+            columns = ingest_csv(os.path.join(root, source))
+        except (OSError, UnicodeDecodeError, csv.Error):
+            continue
+        rows = range(len(columns["year"]))
+        columns["cluster"] = assign_clusters(
+            clusters, unpack(columns["title_data"], columns["title_offsets"], rows),
+            [k.split("\t") if k else [] for k in unpack(columns["keys_data"], columns["keys_offsets"], rows)])
+        part_name = hashlib.md5(source.encode('utf-8')).hexdigest()[:16] + ".npz"
+        np.savez(os.path.join(dataset_dir, part_name), **columns)
+        if entry:
+            updated += 1
+        else:
+            added += 1
+        parts[source] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "part": part_name,
+                         "rows": int(len(columns["year"])), "kind": source_kind(source)}
+
+    removed = [s for s in parts if s not in set(sources)]
+    for source in removed:
+        try:
+            os.remove(os.path.join(dataset_dir, parts.pop(source)["part"]))
+        except OSError:
+            pass
+
+    if added or updated:
+        np.savez(os.path.join(dataset_dir, CLUSTERS_FILE), **clusters)
+    manifest["clusters"] = len(clusters["parent"])
+    with open(os.path.join(dataset_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=1)
+    return added, updated, len(removed)
+
+def load_dataset(dataset_dir=CONSOLIDATED_DIR):
+    """
+    Loads every part into one table (dict of column arrays).
+    Adds 'kind' and 'source' (index into the returned 'sources' list) columns;
+    'cluster' holds each row's final paper cluster id.
+    """
+    manifest = load_manifest(dataset_dir)
+    sources = sorted(manifest["parts"])
+    columns = {name: [] for name in ["year", "citations", "decision", "author_hash", "author_row", "cluster", "kind", "source"]}
+    strings = {name: ([], []) for name in ["title", "url", "authors", "author_name", "keys"]}
+    row_base = 0
+    byte_base = {name: 0 for name in strings}
+
+    for source_id, source in enumerate(sources):
+        entry = manifest["parts"][source]
+        with np.load(os.path.join(dataset_dir, entry["part"])) as part:
+            n = len(part["year"])
+            for name in ["year", "citations", "decision", "author_hash", "cluster"]:
+                columns[name].append(part[name])
+            columns["author_row"].append(part["author_row"] + row_base)
+            columns["kind"].append(np.full(n, SOURCE_KINDS.index(entry["kind"]), dtype=np.int8))
+            columns["source"].append(np.full(n, source_id, dtype=np.int32))
+            for name, (data, offsets) in strings.items():
+                data.append(part[f"{name}_data"])
+                offsets.append(part[f"{name}_offsets"][:-1] + byte_base[name])
+                byte_base[name] += len(part[f"{name}_data"])
+        row_base += n
+
+    table = {name: np.concatenate(parts) if parts else np.zeros(0) for name, parts in columns.items()}
+    for name, (data, offsets) in strings.items():
+        table[f"{name}_data"] = np.concatenate(data) if data else np.zeros(0, dtype=np.uint8)
+        table[f"{name}_offsets"] = np.append(np.concatenate(offsets) if offsets else np.zeros(0, dtype=np.int64), byte_base[name])
+    table["cluster"] = resolve_clusters(load_clusters(dataset_dir, manifest)["parent"])[table["cluster"].astype(np.int64)]
+    table["sources"] = sources
+    return table
+
+# ------------------------------------------------------------------------------
+# VECTORIZED AGGREGATES
+# ------------------------------------------------------------------------------
+def unique_papers(table, mask=None):
+    """
+    Boolean mask keeping the first row of each paper among `mask`. Papers are identified
+    as in the folder analysis: shared keys (schema.Schema.paper_keys) or near-duplicate
+    titles (dedup.near_duplicate_clusters), through the cluster labels stored at ingestion.
+    """
+    rows = np.arange(len(table["year"])) if mask is None else np.flatnonzero(mask)
+    _, first = np.unique(table["cluster"][rows], return_index=True)
+    keep = np.zeros(len(table["year"]), dtype=bool)
+    keep[rows[first]] = True
+    return keep
+
+def year_counts(table, mask):
+    """{year: count} over the masked rows (unknown years excluded)."""
+    years = table["year"][mask & (table["year"] > 0)]
+    values, counts = np.unique(years, return_counts=True)
+    return {str(int(v)): int(c) for v, c in zip(values, counts)}
+
+def author_counts(table, mask):
+    """{author: paper count} over the masked rows."""
+    selected = mask[table["author_row"]] if len(table["author_row"]) else np.zeros(0, dtype=bool)
+    hashes = table["author_hash"][selected]
+    name_index = np.flatnonzero(selected)
+    values, first, counts = np.unique(hashes, return_index=True, return_counts=True)
+    names = unpack(table["author_name_data"], table["author_name_offsets"], name_index[first])
+    return dict(zip(names, (int(c) for c in counts)))
+
+def top_cited(table, mask, top_n=50):
+    """Row indices of the most cited masked rows, highest first."""
+    rows = np.flatnonzero(mask & (table["citations"] >= 0))
+    order = np.argsort(-table["citations"][rows], kind='stable')
+    return rows[order[:top_n]]
+
+def citation_values(table, mask):
+    return table["citations"][mask & (table["citations"] >= 0)]
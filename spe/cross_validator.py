@@ -4,60 +4,116 @@ import os
 import json
 import hashlib
 import csv
-import re
+import numpy as np
 from colorama import Fore, Style, init
 
+from . import run_registry as rr
+from . import schema as sc
+
 init(autoreset=True)
 
 META_FILENAME = ".dataset_identity.json"
+FINGERPRINT_CACHE = ".fingerprint_cache.json"
+FINGERPRINT_MASK = (1 << 128) - 1
+LEGACY_IMPORT_FLAG = "legacy_runs_imported"
+AGREEMENT_FILENAME = "agreement_matrix.csv"
 
 def normalize_title(title):
-    """Normalizes title for consistent hashing and comparison."""
-    if not title: return ""
-    # Remove non-alphanumeric chars and lowercase
-    return re.sub(r'[^a-z0-9]', '', title.lower())
+    """Normalizes title for consistent hashing and comparison (the canonical schema.paper_key)."""
+    return sc.paper_key(title)
+
+def _title_hash(normalized):
+    """128-bit hash of one normalized title."""
+    return int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest(), 'big')
+
+def _folder_signature(input_folder, csv_files):
+    """Size + mtime of every data CSV; any change invalidates the cached fingerprint."""
+    signature = []
+    for f in csv_files:
+        st = os.stat(os.path.join(input_folder, f))
+        signature.append([f, st.st_size, st.st_mtime_ns])
+    return signature
 
 def generate_fingerprint(input_folder):
     """
     Creates a unique Hash based on article titles in the INPUT folder.
     Ensures 'results-1' and 'copy-of-results-1' share identity.
+
+    Titles are streamed: each one is hashed and the hashes are summed mod 2^128,
+    so neither file nor row order matters and memory stays constant. The result
+    is cached in the folder and reused while the CSVs are unchanged.
     """
-    titles = []
-    
-    # Scan CSVs in input folder (source of truth)
-    if os.path.exists(input_folder):
-        for f in os.listdir(input_folder):
-            # Ignore stats files, process only data CSVs
-            if f.endswith(".csv") and not f.startswith("output_statistics"):
-                try:
-                    with open(os.path.join(input_folder, f), 'r', encoding='utf-8-sig') as csvfile:
-                        reader = csv.DictReader(csvfile)
-                        for row in reader:
-                            t = row.get("Title") or row.get("title")
-                            if t: titles.append(normalize_title(t))
-                except:
-                    pass
-    
-    # Sort to ensure file order doesn't affect hash
-    titles.sort()
-    content_string = "".join(titles)
-    
-    # Return MD5 hash
-    return hashlib.md5(content_string.encode('utf-8')).hexdigest()
+    if not os.path.exists(input_folder):
+        return f"{0:032x}-0"
 
-def save_metadata(output_folder, input_folder_path, filter_type):
-    """Saves dataset identity metadata to the OUTPUT folder."""
+    # Ignore stats files, process only data CSVs
+    csv_files = sorted(f for f in os.listdir(input_folder) if f.endswith(".csv") and not f.startswith("output_statistics"))
+    cache_path = os.path.join(input_folder, FINGERPRINT_CACHE)
+    try:
+        signature = _folder_signature(input_folder, csv_files)
+    except OSError:
+        signature = None
+
+    if signature is not None:
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get("signature") == signature:
+                return cached["fingerprint"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    total = 0
+    count = 0
+    for f in csv_files:
+        try:
+            with open(os.path.join(input_folder, f), 'r', encoding='utf-8-sig') as csvfile:
+                reader = csv.DictReader(csvfile)
+                schema = sc.resolve(reader.fieldnames)
+                for row in reader:
+                    t = schema.title(row)
+                    if t:
+                        total = (total + _title_hash(normalize_title(t))) & FINGERPRINT_MASK
+                        count += 1
+        except:
+            pass
+
+    fingerprint = f"{total:032x}-{count}"
+
+    if signature is not None:
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump({"signature": signature, "fingerprint": fingerprint}, f)
+        except OSError:
+            # Read-only folders just skip the cache
+            pass
+
+    return fingerprint
+
+def save_metadata(output_folder, input_folder_path, filter_type, query=None):
+    """
+    Saves dataset identity metadata to the OUTPUT folder and records the run
+    in the run registry. `query` is the regex query or the AI criteria.
+    """
     try:
         fingerprint = generate_fingerprint(input_folder_path)
         
         data = {
             "source_fingerprint": fingerprint,
             "filter_type": filter_type, # 'AI' or 'REGEX'
-            "source_path": input_folder_path
+            "source_path": input_folder_path,
+            "query": query
         }
         
         with open(os.path.join(output_folder, META_FILENAME), 'w') as f:
             json.dump(data, f)
+
+        try:
+            rr.register_run(fingerprint, filter_type, output_folder, source_path=input_folder_path,
+                            query=query, approved_titles=get_approved_titles(output_folder, filter_type))
+        except Exception as e:
+            # The JSON file above still allows the legacy folder scan
+            print(f"{Fore.YELLOW}[Validator Warning] Could not update run registry: {e}")
             
         return fingerprint
     except Exception as e:
@@ -72,14 +128,27 @@ def get_approved_titles(folder_path, filter_type):
     
     # Logic for AI results
     if filter_type == "AI":
-        csv_path = os.path.join(folder_path, "llama_filtered_articles.csv")
-        if os.path.exists(csv_path):
+        # YES/NO, multi-criteria (AI_Decision = all criteria met) and full-text screening
+        for name in ["llama_filtered_articles.csv", "llama_multi_criteria.csv", "llama_fulltext_articles.csv"]:
+            csv_path = os.path.join(folder_path, name)
+            if not os.path.exists(csv_path):
+                continue
             with open(csv_path, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
+                schema = sc.resolve(reader.fieldnames)
                 for row in reader:
                     # AI only approves if Decision is YES
-                    if row.get("AI_Decision", "").upper() == "YES":
-                        approved.add(normalize_title(row.get("Title")))
+                    if schema.decision(row).upper() == "YES":
+                        approved.add(normalize_title(schema.title(row)))
+
+        # Embedding ranking mode: every row kept after the cut counts as approved
+        ranked_path = os.path.join(folder_path, "llama_ranked_articles.csv")
+        if os.path.exists(ranked_path):
+            with open(ranked_path, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                schema = sc.resolve(reader.fieldnames)
+                for row in reader:
+                    approved.add(normalize_title(schema.title(row)))
 
     # Logic for Regex results
     elif filter_type == "REGEX":
@@ -91,8 +160,9 @@ def get_approved_titles(folder_path, filter_type):
                 has_csvs = True
                 with open(csv_path, 'r', encoding='utf-8') as f:
                     reader = csv.DictReader(f)
+                    schema = sc.resolve(reader.fieldnames)
                     for row in reader:
-                        approved.add(normalize_title(row.get("Title") or row.get("title")))
+                        approved.add(normalize_title(schema.title(row)))
         
         # Fallback: Check for Directories (Legacy PDF Filter support)
         if not has_csvs:
@@ -107,6 +177,124 @@ def get_approved_titles(folder_path, filter_type):
     
     return approved
 
+def import_legacy_runs():
+    """
+    One-time migration for runs made before the run registry existed: scans the
+    result folders and registers every .dataset_identity.json found.
+    Legacy metadata holds the old MD5 fingerprint, so each run is registered under
+    the fingerprint recomputed from its source folder; runs whose source folder is
+    gone cannot be matched to a dataset and are skipped.
+    Returns how many runs were imported.
+    """
+    candidate_paths = []
+
+    # AI folders are stored in root (e.g. llama_filtered*)
+    for d in os.listdir('.'):
+        if d.startswith("llama_filtered") and os.path.isdir(d):
+            candidate_paths.append(d)
+
+    # Regex folders are stored inside "content_filtered" (PDFs) or "content_filtered_csv" (CSVs)
+    # We check BOTH base directories
+    base_dirs = ["content_filtered", "content_filtered_csv"]
+    for base in base_dirs:
+        if os.path.exists(base):
+            for d in os.listdir(base):
+                full_path = os.path.join(base, d)
+                if os.path.isdir(full_path):
+                    candidate_paths.append(full_path)
+
+    imported = 0
+    for path in candidate_paths:
+        meta_path = os.path.join(path, META_FILENAME)
+        if os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r') as f:
+                    candidate_meta = json.load(f)
+                filter_type = candidate_meta['filter_type']
+                source_path = candidate_meta['source_path']
+                if not source_path or not os.path.isdir(source_path):
+                    print(f"{Fore.YELLOW}⚠️ Legacy run '{path}' skipped: source folder '{source_path}' not found.{Style.RESET_ALL}")
+                    continue
+                rr.register_run(generate_fingerprint(source_path), filter_type, path,
+                                source_path=source_path, query=candidate_meta.get('query'),
+                                approved_titles=get_approved_titles(path, filter_type))
+                imported += 1
+            except (OSError, KeyError, json.JSONDecodeError) as e:
+                print(f"{Fore.YELLOW}⚠️ Legacy run '{path}' skipped: {e}{Style.RESET_ALL}")
+                continue
+
+    rr.set_flag(LEGACY_IMPORT_FLAG)
+    return imported
+
+def dataset_title_ids(input_folder):
+    """Maps every normalized title of the dataset to a dense integer id (streamed, first seen first)."""
+    ids = {}
+    if input_folder and os.path.exists(input_folder):
+        for f in sorted(os.listdir(input_folder)):
+            if f.endswith(".csv") and not f.startswith("output_statistics"):
+                try:
+                    with open(os.path.join(input_folder, f), 'r', encoding='utf-8-sig') as csvfile:
+                        reader = csv.DictReader(csvfile)
+                        schema = sc.resolve(reader.fieldnames)
+                        for row in reader:
+                            t = normalize_title(schema.title(row))
+                            if t:
+                                ids.setdefault(t, len(ids))
+                except:
+                    pass
+    return ids
+
+def agreement_matrix(runs, input_folder):
+    """
+    Pairwise agreement of every run on one dataset.
+    Each run's approved set becomes a row of a boolean (runs x papers) matrix over the
+    dataset's id space, so all pairs are computed at once with matrix products.
+
+    Returns (overlap, jaccard, kappa) as (runs x runs) arrays.
+    """
+    ids = dataset_title_ids(input_folder)
+    approved_ids = []
+    for run in runs:
+        titles = get_approved_titles(run["output_path"], run["filter_type"])
+        # Approved titles missing from the dataset (renamed/edited CSVs) get fresh ids
+        approved_ids.append([ids.setdefault(t, len(ids)) for t in titles if t])
+
+    approved = np.zeros((len(runs), max(len(ids), 1)), dtype=bool)
+    for i, row_ids in enumerate(approved_ids):
+        approved[i, row_ids] = True
+
+    n = approved.shape[1]
+    a = approved.astype(np.int64)
+    overlap = a @ a.T
+    sizes = np.diag(overlap)
+    size_i, size_j = sizes[:, None], sizes[None, :]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        union = size_i + size_j - overlap
+        jaccard = np.where(union > 0, overlap / union, 1.0)
+
+        # Cohen's kappa, treating each run as a rater giving YES/NO on every paper
+        both_no = n - union
+        observed = (overlap + both_no) / n
+        expected = (size_i * size_j + (n - size_i) * (n - size_j)) / float(n * n)
+        kappa = np.where(expected < 1.0, (observed - expected) / (1.0 - expected), 1.0)
+
+    return overlap, jaccard, kappa
+
+def write_agreement_matrix(runs, input_folder, output_folder):
+    """Writes the overlap / Jaccard / kappa matrices of all runs as one CSV. Returns its path."""
+    overlap, jaccard, kappa = agreement_matrix(runs, input_folder)
+    labels = [f"{run['filter_type']}:{run['output_path']}" for run in runs]
+
+    path = os.path.join(output_folder, AGREEMENT_FILENAME)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Metric", "Run"] + labels)
+        for metric, matrix, fmt in [("Overlap", overlap, "{:d}"), ("Jaccard", jaccard, "{:.3f}"), ("Kappa", kappa, "{:.3f}")]:
+            for label, values in zip(labels, matrix):
+                writer.writerow([metric, label] + [fmt.format(v.item()) for v in values])
+    return path
+
 def run_comparison(current_output_folder, current_filter_type):
     """
     Main function called by filters.
@@ -127,46 +315,32 @@ def run_comparison(current_output_folder, current_filter_type):
     
     print(f"{Fore.BLUE}🔍 Checking if {target_type} filter was already run on this dataset...{Style.RESET_ALL}")
 
-    match_folder = None
-    candidate_paths = []
+    # 2. Registry lookup (indexed by fingerprint)
+    if not rr.get_flag(LEGACY_IMPORT_FLAG):
+        imported = import_legacy_runs()
+        if imported:
+            print(f"{Fore.BLUE}ℹ️  Indexed {imported} earlier run(s) into the run registry.{Style.RESET_ALL}")
 
-    # 2. Locate Candidate Folders
-    if target_type == "AI":
-        # AI folders are stored in root (e.g. llama_filtered*)
-        for d in os.listdir('.'):
-            if d.startswith("llama_filtered") and os.path.isdir(d):
-                candidate_paths.append(d)
-
-    elif target_type == "REGEX":
-        # Regex folders are stored inside "content_filtered" (PDFs) or "content_filtered_csv" (CSVs)
-        # We check BOTH base directories
-        base_dirs = ["content_filtered", "content_filtered_csv"]
-        for base in base_dirs:
-            if os.path.exists(base):
-                for d in os.listdir(base):
-                    full_path = os.path.join(base, d)
-                    if os.path.isdir(full_path):
-                        candidate_paths.append(full_path)
-
-    # 3. Check Candidates for Matching Fingerprint
-    for path in candidate_paths:
-        meta_path = os.path.join(path, META_FILENAME)
-        if os.path.exists(meta_path):
-            try:
-                with open(meta_path, 'r') as f:
-                    candidate_meta = json.load(f)
-                
-                if candidate_meta.get('source_fingerprint') == current_fingerprint:
-                    match_folder = path
-                    break
-            except:
-                continue
+    match = rr.find_sibling_run(current_fingerprint, target_type, exclude_path=current_output_folder)
+    match_folder = match["output_path"] if match else None
+
+    runs = rr.find_runs(current_fingerprint)
+    if len(runs) > 1:
+        print(f"{Fore.BLUE}ℹ️  {len(runs)} runs recorded on this dataset:{Style.RESET_ALL}")
+        for run in runs:
+            approved = run["approved_count"] if run["approved_count"] is not None else "?"
+            print(f"   • [{run['filter_type']:<5}] {run['output_path']} ({approved} approved, {run['updated_at']})")
+        try:
+            matrix_path = write_agreement_matrix(runs, current_meta.get('source_path'), current_output_folder)
+            print(f"{Fore.CYAN}📄 Agreement matrix (overlap, Jaccard, kappa) across all runs:\n  {matrix_path}{Style.RESET_ALL}")
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️  Could not build the agreement matrix: {e}")
 
     if not match_folder:
         print(f"{Fore.YELLOW}ℹ️  No previous {target_type} run found for this dataset.{Style.RESET_ALL}")
         return
 
-    # 4. Execute Comparison
+    # 3. Execute Comparison
     print(f"{Fore.GREEN}✅ Match Found! Comparing with: {match_folder}{Style.RESET_ALL}")
     
     titles_current = get_approved_titles(current_output_folder, current_filter_type)
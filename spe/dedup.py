@@ -0,0 +1,208 @@
+# dedup.py
+
+import os
+import csv
+import re
+import zlib
+import numpy as np
+
+from . import schema as sc
+
+# --- NEAR-DUPLICATE DETECTION (MinHash + LSH) ---
+# Titles are reduced to character shingles; MinHash signatures are banded (LSH) so
+# only titles sharing a band are compared, instead of all pairs.
+SHINGLE_SIZE = 4
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32              # 32 bands x 4 rows: pairs above ~0.45 similarity become candidates
+NEAR_DUP_THRESHOLD = 0.9    # Estimated Jaccard required to merge two candidates
+TOKEN_THRESHOLD = 0.75      # Word-level Jaccard also required (markup and typos change few words)
+SMALL_BUCKET = 64           # LSH buckets up to this size verify all pairs; larger ones neighbouring pairs
+MINHASH_BATCH = 512         # Records per vectorized batch (bounds memory)
+MINHASH_SEED = 42
+LATEX_PATTERN = re.compile(r'\\[a-zA-Z]+|[{}$^_]')
+# Arabic and roman numerals: "Part I" / "Part II" or "sample 3" / "sample 4" are different papers
+NUMBER_PATTERN = re.compile(r'\d+|(?=[ivxlcdm]+$)m{0,3}(?:cm|cd|d?c{0,3})(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3})')
+
+def list_input_csvs(input_folder):
+    """Returns the data CSVs of a result folder (statistics files excluded)."""
+    return sorted(f for f in os.listdir(input_folder) if f.endswith('.csv') and not f.startswith("output_statistics"))
+
+def deduplicate_papers(input_folder, normalize):
+    """
+    Streams every input CSV once and keeps one record per unique paper.
+    `normalize(row, schema)` maps a raw row to a papers.Paper (or None to skip the row);
+    `schema` is the resolved header of the row's CSV (see schema.resolve).
+    The query origins of all copies are merged into the kept paper, and its
+    `key` holds the stable identity key of the first copy seen.
+
+    Returns (papers, total_rows).
+    """
+    papers = []
+    origins = []
+    key_index = {}
+    total_rows = 0
+
+    for filename in list_input_csvs(input_folder):
+        with open(os.path.join(input_folder, filename), 'r', encoding='utf-8') as infile:
+            reader = csv.DictReader(infile)
+            schema = sc.resolve(reader.fieldnames)
+            for row in reader:
+                total_rows += 1
+                paper = normalize(row, schema)
+                if paper is None:
+                    continue
+
+                keys = schema.paper_keys(row, paper.title)
+                position = next((key_index[k] for k in keys if k in key_index), None)
+                query = schema.query(row)
+
+                if position is None:
+                    position = len(papers)
+                    paper.key = keys[0] if keys else f"row:{total_rows}"
+                    papers.append(paper)
+                    origins.append([])
+                elif not papers[position].local_path and paper.local_path:
+                    # Keep the copy that points to a downloaded PDF
+                    papers[position].local_path = paper.local_path
+
+                if query and query not in origins[position]:
+                    origins[position].append(query)
+
+                # Register every key, so later copies match on any identifier
+                for k in keys:
+                    key_index.setdefault(k, position)
+
+    for paper, queries in zip(papers, origins):
+        paper.query = "; ".join(queries)
+
+    return papers, total_rows
+
+def shingle_hashes(title):
+    """
+    Hashed character shingles of a title, after dropping LaTeX markup, case,
+    punctuation and spaces (so subtitle separators and trailing periods do not matter).
+    """
+    text = re.sub(r'[^a-z0-9]', '', LATEX_PATTERN.sub(' ', title.lower()))
+    if len(text) < SHINGLE_SIZE:
+        return np.array([zlib.crc32((text or title).encode('utf-8'))], dtype=np.uint64)
+    # Each 4-character ASCII shingle packs exactly into one 32-bit integer
+    chars = np.frombuffer(text.encode('ascii'), dtype=np.uint8).astype(np.uint64)
+    end = len(chars) - SHINGLE_SIZE + 1
+    grams = (chars[:end] << 24) | (chars[1:end + 1] << 16) | (chars[2:end + 2] << 8) | chars[3:end + 3]
+    return grams
+
+def title_tokens(title):
+    """Words of a title after dropping LaTeX markup, case and punctuation."""
+    return re.findall(r'[a-z0-9]+', LATEX_PATTERN.sub('', title.lower()))
+
+def same_title(title_a, title_b):
+    """
+    Word-level check of a MinHash candidate pair: the numbers (arabic or roman) must
+    be identical and the word sets nearly so.
+    """
+    words_a, words_b = title_tokens(title_a), title_tokens(title_b)
+    numbers_a = sorted(w for w in words_a if NUMBER_PATTERN.fullmatch(w))
+    numbers_b = sorted(w for w in words_b if NUMBER_PATTERN.fullmatch(w))
+    if numbers_a != numbers_b:
+        return False
+    words_a, words_b = set(words_a), set(words_b)
+    union = len(words_a | words_b)
+    return not union or len(words_a & words_b) / union >= TOKEN_THRESHOLD
+
+def candidate_pairs(bucket):
+    """
+    (left, right) index pairs sharing an LSH bucket: every pair of buckets up to
+    SMALL_BUCKET records, neighbouring pairs (in index order) of larger ones.
+    """
+    order = np.argsort(bucket, kind='stable')
+    sorted_bucket = bucket[order]
+    starts = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    sizes = np.diff(np.r_[starts, len(bucket)])
+    small = np.repeat(sizes <= SMALL_BUCKET, sizes)
+
+    left, right = [], []
+    for distance in range(1, min(SMALL_BUCKET, len(bucket))):
+        same = sorted_bucket[distance:] == sorted_bucket[:-distance]
+        if distance > 1:
+            same &= small[distance:]
+        if not same.any():
+            break
+        left.append(order[:-distance][same])
+        right.append(order[distance:][same])
+    if not left:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(left), np.concatenate(right)
+
+def minhash_signatures(titles):
+    """(n x MINHASH_PERMUTATIONS) MinHash signatures, computed in vectorized batches."""
+    # Multiply-shift hashing: (a * x + b) mod 2^64, top 32 bits; a is odd
+    rng = np.random.RandomState(MINHASH_SEED)
+    a = rng.randint(0, 2 ** 32, size=(2, MINHASH_PERMUTATIONS)).astype(np.uint64)
+    a = (a[0] << np.uint64(32)) | a[1] | np.uint64(1)
+    b = rng.randint(0, 2 ** 32, size=(2, MINHASH_PERMUTATIONS)).astype(np.uint64)
+    b = (b[0] << np.uint64(32)) | b[1]
+
+    signatures = np.empty((len(titles), MINHASH_PERMUTATIONS), dtype=np.uint32)
+    for start in range(0, len(titles), MINHASH_BATCH):
+        shingles = [shingle_hashes(t) for t in titles[start:start + MINHASH_BATCH]]
+        offsets = np.cumsum([0] + [len(x) for x in shingles[:-1]])
+        # (permutations x shingles): each row is contiguous for the segmented minimum
+        values = ((a[:, None] * np.concatenate(shingles)[None, :] + b[:, None]) >> np.uint64(32)).astype(np.uint32)
+        signatures[start:start + len(shingles)] = np.minimum.reduceat(values, offsets, axis=1).T
+    return signatures
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def _union(parent, i, j):
+    root_i, root_j = _find(parent, i), _find(parent, j)
+    if root_i != root_j:
+        # The lower index stays root, so labels follow input order
+        parent[max(root_i, root_j)] = min(root_i, root_j)
+
+def near_duplicate_clusters(titles, key_lists=None, signatures=None):
+    """
+    Groups records that are the same paper.
+    Records sharing any exact key (DOI / paperId / arXiv id / normalized title, see
+    schema.Schema.paper_keys) are merged first; the rest are matched by MinHash + LSH on their
+    titles, and a candidate pair is merged only if its words also match (see same_title).
+    `signatures` may hold the titles' precomputed minhash_signatures.
+
+    Returns one cluster label per record: the index of the cluster's first record.
+    """
+    n = len(titles)
+    parent = list(range(n))
+    if n == 0:
+        return parent
+
+    if key_lists is not None:
+        key_index = {}
+        for i, keys in enumerate(key_lists):
+            for k in keys:
+                if k in key_index:
+                    _union(parent, i, key_index[k])
+                else:
+                    key_index[k] = i
+
+    if signatures is None:
+        signatures = minhash_signatures(titles)
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    pairs = []
+    for band in range(LSH_BANDS):
+        band_values = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        _, bucket = np.unique(band_values.view(np.dtype((np.void, band_values.dtype.itemsize * rows))).ravel(), return_inverse=True)
+        left, right = candidate_pairs(bucket.ravel())
+        pairs.append(np.minimum(left, right) * n + np.maximum(left, right))
+
+    # Each candidate pair is verified once, whatever the number of bands it shares
+    pairs = np.unique(np.concatenate(pairs))
+    left, right = pairs // n, pairs % n
+    similarity = (signatures[left] == signatures[right]).mean(axis=1)
+    for i, j in zip(left[similarity >= NEAR_DUP_THRESHOLD], right[similarity >= NEAR_DUP_THRESHOLD]):
+        if _find(parent, int(i)) != _find(parent, int(j)) and same_title(titles[i], titles[j]):
+            _union(parent, int(i), int(j))
+
+    return [_find(parent, i) for i in range(n)]
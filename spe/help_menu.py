@@ -111,6 +111,18 @@ def show_analysis_help():
     print(f"\n{Fore.WHITE}{Style.BRIGHT}4. Deduplication Logic:{Style.RESET_ALL}")
     print(f"   - Uses {Style.BRIGHT}Normalized Title{Style.RESET_ALL} as a unique key.")
     print(f"   - {Style.DIM}'Graphyne Props'{Style.RESET_ALL} == {Style.DIM}'graphyne props'{Style.RESET_ALL}")
+    print("   - Shared DOI / arXiv ids and near-identical titles")
+    print("     (punctuation, LaTeX, subtitles) are merged too.")
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}5. Consolidated Dataset (Option 3):{Style.RESET_ALL}")
+    print("   Ingests every results / arxiv / filtered folder into one")
+    print("   columnar table in `consolidated_dataset/`. Only new or")
+    print("   changed CSVs are re-read, so re-analysis is instant.")
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}6. Huge Folders (Option 4):{Style.RESET_ALL}")
+    print("   Streams the CSVs with a fixed memory budget (64 MB).")
+    print("   Unique count is estimated (±0.8%) and author counts may")
+    print("   overcount slightly; the printed bounds show by how much.")
 
     print(f"\n{Fore.MAGENTA}Press Enter to return...{Style.RESET_ALL}")
     input()
@@ -129,6 +141,11 @@ def show_author_search_help():
     print("      https://scholar.google.com/citations?")
     print(f"      user={Fore.GREEN}{Style.BRIGHT}qc6CJjYAAAAJ{Style.RESET_ALL}&hl=en")
     print(f"   3. Copy the ID between 'user=' and '&' ({Fore.GREEN}qc6CJjYAAAAJ{Style.RESET_ALL}).")
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}3. Repeated Searches:{Style.RESET_ALL}")
+    print("   Fetched publications are kept in `.author_cache/`. Searching")
+    print("   the same ID again only fetches new papers and papers whose")
+    print("   citation count changed, so weekly refreshes are quick.")
     
     print(f"\n{Fore.MAGENTA}Press Enter to return...{Style.RESET_ALL}")
     input()
@@ -169,6 +186,20 @@ def show_llama_filter_help():
     print(f"   {Fore.GREEN}c) Criteria{Style.RESET_ALL}  : Explicit inclusion/exclusion rules.")
     print("                   (e.g., 'Must include experimental")
     print("                   validation').")
+    print(f"   {Fore.GREEN}d) Pre-screen{Style.RESET_ALL}: Optional keyword query scored first.")
+    print("                   Papers matching no keyword are rejected")
+    print("                   without the AI; all others go to the model.")
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}3. Modes:{Style.RESET_ALL}")
+    print(f"   {Fore.GREEN}YES/NO Screening{Style.RESET_ALL}  : One prompt per paper.")
+    print(f"   {Fore.GREEN}Similarity Ranking{Style.RESET_ALL}: Embeds every abstract once and")
+    print("                       ranks by cosine similarity to the")
+    print("                       topic (top-k or threshold cut).")
+    print(f"   {Fore.GREEN}Multi-Criteria{Style.RESET_ALL}    : Several named criteria in one")
+    print("                       pass; one YES/NO column each.")
+    print(f"   {Fore.GREEN}Full-Text{Style.RESET_ALL}         : Reads downloaded PDFs in chunks")
+    print("                       (methods/results first) and stops")
+    print("                       at the first confident YES.")
 
     print(f"\n{Fore.MAGENTA}Press Enter to return...{Style.RESET_ALL}")
     input()
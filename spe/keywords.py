@@ -0,0 +1,121 @@
+# keywords.py
+
+import re
+import numpy as np
+
+# --- KEYWORD ENGINE CONFIGURATION ---
+# Titles + abstracts are tokenized once into a sparse document-term matrix (SciPy CSR,
+# imported on first use); every statistic below is a matrix reduction / product over it.
+# Anything but letters, digits and hyphens splits tokens; short or numeric tokens are dropped by id
+TOKEN_SEPARATORS = str.maketrans({c: " " for c in map(chr, range(128)) if not (c.isalnum() or c == "-")})
+MIN_TOKEN_LENGTH = 3
+VALID_TERM = re.compile(r"[a-z][a-z0-9\-]*$")
+MIN_DOC_FREQ = 2        # Terms in fewer documents are ignored for TF-IDF and trends
+TREND_TERMS = 15        # Columns of the per-year trend table
+
+class TermMatrix:
+    """
+    Sparse document-term counts: `counts` is a (documents x terms) CSR matrix and
+    `vocabulary[j]` is the text of term id j.
+    """
+    def __init__(self, counts, vocabulary):
+        self.counts = counts
+        self.vocabulary = vocabulary
+
+    @property
+    def n_docs(self):
+        return self.counts.shape[0]
+
+    @property
+    def n_terms(self):
+        return self.counts.shape[1]
+
+def build_term_matrix(texts, stopwords):
+    """Tokenizes `texts` once (one document each) and drops `stopwords`."""
+    from scipy import sparse
+
+    tokens, lengths = [], []
+    for text in texts:
+        doc_tokens = text.lower().translate(TOKEN_SEPARATORS).split() if text else []
+        tokens.extend(doc_tokens)
+        lengths.append(len(doc_tokens))
+
+    # Vocabulary in first-seen order; the lookups run in C via map()
+    vocabulary = list(dict.fromkeys(tokens))
+    term_ids = dict(zip(vocabulary, range(len(vocabulary))))
+    terms = np.fromiter(map(term_ids.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+    docs = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    vocabulary = np.array(vocabulary, dtype=object)
+
+    # Stopwords, short and non-word tokens are removed by id, in one vectorized mask
+    drop = np.array([t in stopwords or len(t) < MIN_TOKEN_LENGTH or not VALID_TERM.match(t) for t in vocabulary], dtype=bool)
+    keep = ~drop[terms] if len(terms) else np.zeros(0, dtype=bool)
+    docs, terms = docs[keep], terms[keep]
+
+    # Repeated (doc, term) pairs are summed into counts by the CSR conversion
+    counts = sparse.csr_matrix((np.ones(len(terms), dtype=np.int64), (docs, terms)),
+                               shape=(len(texts), len(vocabulary)))
+    counts.sum_duplicates()
+    return TermMatrix(counts, vocabulary)
+
+def term_totals(matrix):
+    """(total occurrences, document frequency) of every term."""
+    totals = np.asarray(matrix.counts.sum(axis=0)).ravel()
+    doc_freq = np.bincount(matrix.counts.indices, minlength=matrix.n_terms)
+    return totals.astype(np.int64), doc_freq
+
+def top_terms(matrix, top_n=50):
+    """[(term, occurrences, document frequency)] of the most frequent terms."""
+    totals, doc_freq = term_totals(matrix)
+    order = np.argsort(-totals, kind='stable')[:top_n]
+    return [(matrix.vocabulary[j], int(totals[j]), int(doc_freq[j])) for j in order if totals[j] > 0]
+
+def tfidf_keywords(matrix, top_n=50):
+    """
+    [(term, score)] ranked by TF-IDF summed over documents.
+    TF is the count normalized by document length; IDF is log(N / df) + 1.
+    """
+    from scipy import sparse
+
+    if not matrix.counts.nnz:
+        return []
+    _, doc_freq = term_totals(matrix)
+    doc_length = np.asarray(matrix.counts.sum(axis=1)).ravel().astype(np.float64)
+    inverse_length = np.divide(1.0, doc_length, out=np.zeros(matrix.n_docs), where=doc_length > 0)
+    idf = np.log(matrix.n_docs / np.maximum(doc_freq, 1)) + 1.0
+
+    # diag(1 / length) . counts . diag(idf), summed over documents
+    tfidf = sparse.diags(inverse_length) @ matrix.counts @ sparse.diags(idf)
+    scores = np.asarray(tfidf.sum(axis=0)).ravel()
+    scores[doc_freq < MIN_DOC_FREQ] = 0.0
+
+    order = np.argsort(-scores, kind='stable')[:top_n]
+    return [(matrix.vocabulary[j], float(scores[j])) for j in order if scores[j] > 0]
+
+def term_trends(matrix, years, terms=None, top_n=TREND_TERMS):
+    """
+    Per-year share of documents mentioning each term.
+    `years` holds one int per document (0 = unknown, excluded).
+    Returns (sorted years, selected terms, (years x terms) array of percentages).
+    """
+    from scipy import sparse
+
+    years = np.asarray(years, dtype=np.int64)
+    totals, doc_freq = term_totals(matrix)
+    if terms is None:
+        candidates = np.flatnonzero(doc_freq >= MIN_DOC_FREQ)
+        terms = candidates[np.argsort(-totals[candidates], kind='stable')[:top_n]]
+
+    year_values = np.unique(years[years > 0])
+    if not len(year_values) or not len(terms):
+        return year_values, [], np.zeros((len(year_values), 0))
+
+    # (years x documents) indicator times (documents x terms) presence = documents per (year, term)
+    known = np.flatnonzero(years > 0)
+    year_row = np.searchsorted(year_values, years[known])
+    by_year = sparse.csr_matrix((np.ones(len(known)), (year_row, known)), shape=(len(year_values), matrix.n_docs))
+    presence = (matrix.counts[:, terms] > 0).astype(np.float64)
+    table = (by_year @ presence).toarray()
+
+    docs_per_year = np.bincount(year_row, minlength=len(year_values))
+    return year_values, [matrix.vocabulary[j] for j in terms], 100.0 * table / docs_per_year[:, None]
@@ -1,16 +1,28 @@
 # llama_filter.py
 
 import os
+import re
 import csv
 import sys
 import shutil # Added for file copying
+import hashlib
+import json
+import numpy as np
 from colorama import Fore, Style, init
 from tqdm import tqdm
 
 from . import cross_validator as cv
+from . import parse_query as pq
+from . import pdf_content_filter as pcf
+from . import dedup
+from . import schema as sc
+from .papers import Paper
+from . import model_registry as mr
+from . import autotune
 
 # Attempt imports with specific error handling for llama-cpp-python
 try:
+    import llama_cpp
     from llama_cpp import Llama
 except ImportError:
     print(f"{Fore.RED}❌ Error: 'llama-cpp-python' is not installed.")
@@ -29,9 +41,66 @@ init(autoreset=True)
 # --- MODEL CONFIGURATION ---
 # Using a lightweight, CPU-capable model (Qwen 2.5 1.5B)
 REPO_ID = "Qwen/Qwen2.5-1.5B-Instruct-GGUF"
-FILENAME = "qwen2.5-1.5b-instruct-q4_k_m.gguf"
+FILENAME = autotune.DEFAULT_MODEL
 MODEL_DIR = "models"
 
+# --- CONTEXT SIZING ---
+# n_ctx is chosen per run from a token sample of the input instead of a fixed 4096.
+# Abstracts that still do not fit are cut at sentence boundaries to the remaining budget.
+MIN_CONTEXT = 512
+MAX_CONTEXT = 4096
+CONTEXT_STEP = 256
+CONTEXT_SAMPLE_SIZE = 200
+DECISION_TOKENS = 5
+TOKEN_SAFETY_MARGIN = 8
+
+# --- CASCADE CONFIGURATION ---
+# Stage 1 reuses the regex/proximity scorer from the content filter, only to reject:
+# rows scoring at or below the reject score (no keyword match) are decided there.
+# A high keyword score says nothing about the inclusion criteria, so every other
+# row reaches the LLM.
+CASCADE_REJECT_SCORE = 0
+SCREENING_LOG = "screening_log.csv"
+
+# --- RUN JOURNAL ---
+# The screening log doubles as the run journal: one flushed line per decided paper.
+# The run configuration is stored next to it so an interrupted run can be resumed;
+# its "mode" tells YES/NO screening runs from full-text runs.
+RUN_CONFIG = ".screening_run.json"
+JOURNAL_FIELDS = ["Paper_Key", "Title", "Stage", "Cascade_Score", "AI_Decision"]
+SCREENING_MODE = "screening"
+FULLTEXT_MODE = "fulltext"
+
+# --- MULTI-CRITERIA CONFIGURATION ---
+# The paper prefix is evaluated once; each criterion only evaluates its short suffix.
+MULTI_CRITERIA_CSV = "llama_multi_criteria.csv"
+YES_WORDS = ["YES", "Yes", "yes", " YES", " Yes"]
+NO_WORDS = ["NO", "No", "no", " NO", " No"]
+
+# --- FULL-TEXT SCREENING CONFIGURATION ---
+# PDFs are split into token-budgeted chunks (methods/results first) and screened
+# chunk by chunk until one gives a confident YES or the chunk budget runs out.
+FULLTEXT_CSV = "llama_fulltext_articles.csv"
+FULLTEXT_LOG = "fulltext_screening_log.csv"
+FULLTEXT_CONTEXT = 2048
+FULLTEXT_MAX_CHUNKS = 6
+FULLTEXT_CONFIDENT_YES = 0.8
+# Section priority: lower is read first. Sections matching nothing get DEFAULT_SECTION_PRIORITY.
+SECTION_PRIORITY = [
+    (re.compile(r'method|experiment|computational|materials|simulation|procedure', re.I), 0),
+    (re.compile(r'result|discussion|finding', re.I), 1),
+    (re.compile(r'abstract|introduction|conclusion|summary', re.I), 2),
+    (re.compile(r'reference|bibliograph|acknowledg', re.I), None),  # None = skipped
+]
+DEFAULT_SECTION_PRIORITY = 3
+SECTION_HEADING = re.compile(r'^\s*(?:[0-9IVX]+(?:\.[0-9]+)*\.?\s+)?([A-Z][A-Za-z ,&]{2,60})\s*$')
+
+# --- EMBEDDING RANKING CONFIGURATION ---
+# Vectors are cached per paper (Title + Abstract), so changing the topic reuses them.
+EMBEDDING_CACHE_DIR = os.path.join(MODEL_DIR, "embedding_cache")
+EMBEDDING_BATCH_SIZE = 32
+RANKED_CSV = "llama_ranked_articles.csv"
+
 def download_model_if_needed():
     """Auto-download GGUF model from HuggingFace if missing locally."""
     if not os.path.exists(MODEL_DIR):
@@ -61,6 +130,21 @@ def download_model_if_needed():
             
     return model_path
 
+def tuned_model(model_path):
+    """
+    Applies this host's autotune profile ('spe autotune'), if any.
+    Returns (model_path, load parameters); without a profile the library defaults are kept.
+    """
+    profile = autotune.load_profile()
+    if not profile:
+        return model_path, {}
+    tuning = {"n_threads": profile["n_threads"], "n_batch": profile["n_batch"]}
+    if "n_threads_batch" in profile:  # Profiles saved before it was tuned keep the library default
+        tuning["n_threads_batch"] = profile["n_threads_batch"]
+    print(f"{Fore.BLUE}ℹ️  Using autotuned profile: {os.path.basename(profile['model_path'])}, "
+          + ", ".join(f"{name}={value}" for name, value in tuning.items()) + f".{Style.RESET_ALL}")
+    return profile["model_path"], tuning
+
 def get_user_criteria():
     """Collects filter criteria via CLI."""
     print(f"\n{Fore.CYAN}------------------- AI Filter Configuration --------------------{Style.RESET_ALL}")
@@ -76,6 +160,141 @@ def get_user_criteria():
     
     return persona, topic, criteria
 
+def get_cascade_config():
+    """
+    Asks whether to run the cheap-first screening cascade.
+    Returns the keyword query string, or None to send every row to the LLM.
+    """
+    use_cascade = input(f"\n{Fore.MAGENTA}Enable keyword pre-screening before the AI? (y/n): {Style.RESET_ALL}").lower().strip()
+    if use_cascade != "y":
+        return None
+
+    print(f"{Fore.WHITE}Enter the keyword query for stage 1 (e.g., '*Graphene* AND (synthesis OR growth)'):")
+    query = input(f"{Fore.GREEN}> {Style.RESET_ALL}")
+    if not query.strip():
+        print(f"{Fore.YELLOW}⚠️ Empty query. Cascade disabled.")
+        return None
+
+    return query
+
+def parse_cascade_query(query):
+    """Expands the cascade query. Returns None (cascade disabled) on empty or invalid input."""
+    if not query:
+        return None
+    try:
+        return pq.parse_query(query)
+    except Exception as e:
+        print(f"{Fore.RED}❌ Query Parsing Error: {e}. Cascade disabled.")
+        return None
+
+def cascade_decision(title, abstract, expanded_queries):
+    """
+    Stage 1 of the cascade. Scores Title + Abstract with the regex/proximity logic.
+    Returns (decision, score); decision is "NO" for clear misses, None otherwise.
+    """
+    full_text = f"{title} . {abstract}"
+    score = max(pcf.calculate_relevance_score(full_text, scenario) for scenario in expanded_queries)
+
+    if score <= CASCADE_REJECT_SCORE:
+        return "NO", score
+    return None, score
+
+def normalize_row(row, schema):
+    """
+    Maps a raw CSV row (Semantic Scholar, ArXiv or filtered) onto a Paper, through the
+    resolved header of its CSV. Returns None when the row lacks a title or abstract.
+    Papers become output rows with paper.to_row("ai_filter").
+    """
+    paper = Paper.from_row(row, schema)
+    if not paper.title or not paper.abstract:
+        return None
+    paper.citations = paper.citations or 0
+    return paper
+
+def save_run_config(output_folder, config):
+    """Stores the screening configuration next to the journal."""
+    with open(os.path.join(output_folder, RUN_CONFIG), 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+
+def load_run_config(output_folder):
+    """Reads the screening configuration of a previous run (None if missing or unreadable)."""
+    try:
+        with open(os.path.join(output_folder, RUN_CONFIG), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def load_journal(output_folder, journal=SCREENING_LOG):
+    """Returns {Paper_Key: AI_Decision} for every paper already decided in this folder."""
+    decided = {}
+    journal_path = os.path.join(output_folder, journal)
+    if os.path.exists(journal_path):
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get("Paper_Key"):
+                    decided[row["Paper_Key"]] = row.get("AI_Decision", "")
+    return decided
+
+def find_resumable_runs(input_folder, mode=SCREENING_MODE):
+    """Lists llama_filtered* folders holding an unfinished run of `mode` on this input folder."""
+    runs = []
+    for d in sorted(os.listdir('.')):
+        if d.startswith("llama_filtered") and os.path.isdir(d):
+            config = load_run_config(d)
+            # Runs saved before modes were recorded are YES/NO screening runs
+            if (config and not config.get("completed") and config.get("input_folder") == input_folder
+                    and config.get("mode", SCREENING_MODE) == mode):
+                runs.append(d)
+    return runs
+
+def count_tokens(tokenizer, text, add_bos=False):
+    """Number of model tokens in `text`."""
+    return len(tokenizer.tokenize(text.encode("utf-8"), add_bos=add_bos, special=True))
+
+def choose_context_size(tokenizer, papers, prompt_for):
+    """
+    Tokenizes the prompts of an evenly spaced sample of papers and returns the
+    smallest n_ctx (multiple of CONTEXT_STEP) that fits all of them plus the answer.
+    `prompt_for(title, abstract)` builds the full prompt of one paper.
+    """
+    step = max(1, len(papers) // CONTEXT_SAMPLE_SIZE)
+    sample = papers[::step][:CONTEXT_SAMPLE_SIZE]
+
+    needed = max(
+        (count_tokens(tokenizer, prompt_for(p.title, p.abstract), add_bos=True) for p in sample),
+        default=0
+    )
+    needed += DECISION_TOKENS + TOKEN_SAFETY_MARGIN
+
+    n_ctx = -(-needed // CONTEXT_STEP) * CONTEXT_STEP
+    return min(MAX_CONTEXT, max(MIN_CONTEXT, n_ctx))
+
+def truncate_abstract(tokenizer, abstract, budget):
+    """
+    Cuts an abstract to at most `budget` tokens, keeping whole sentences when possible.
+    Returns (text, note); note is '' when nothing was cut, else 'original->kept' tokens.
+    """
+    tokens = tokenizer.tokenize(abstract.encode("utf-8"), add_bos=False)
+    if len(tokens) <= budget:
+        return abstract, ""
+
+    kept, used = [], 0
+    for sentence in re.split(r'(?<=[.!?])\s+', abstract.strip()):
+        n = count_tokens(tokenizer, " " + sentence)
+        if used + n > budget:
+            break
+        kept.append(sentence)
+        used += n
+
+    if kept:
+        text = " ".join(kept)
+    else:
+        # First sentence alone exceeds the budget: hard token cut
+        used = max(0, budget)
+        text = tokenizer.detokenize(tokens[:used]).decode("utf-8", errors="ignore")
+
+    return text, f"{len(tokens)}->{used}"
+
 def construct_prompt(persona, topic, criteria, title, abstract):
     """Builds the prompt template for Llama."""
     return f"""<|im_start|>system
@@ -90,39 +309,57 @@ Is this paper relevant based on the criteria? Reply YES or NO.<|im_end|>
 <|im_start|>assistant
 """
 
-def filter_with_llama(input_folder, output_folder):
+def filter_with_llama(input_folder, output_folder, resume=False):
     """
     Main entry point. 
     Iterates through CSVs, runs inference, saves approved entries, 
     and copies relevant PDFs to the output folder.
+    With resume=True, papers already in the folder's journal are skipped
+    and new results are appended to the existing output.
     """
     # 1. Setup Model
-    model_path = download_model_if_needed()
+    model_path, tuning = tuned_model(download_model_if_needed())
     
-    print(f"\n{Fore.CYAN}🚀 Loading AI Model... (This may take a moment){Style.RESET_ALL}")
-    # n_ctx=4096 covers abstract + prompt. verbose=False suppresses low-level logs.
-    llm = Llama(model_path=model_path, n_ctx=4096, verbose=False, n_gpu_layers=-1) 
+    # 2. Input Collection (a resumed run reuses its stored configuration)
+    config = load_run_config(output_folder) if resume else None
+    if config and config.get("mode", SCREENING_MODE) == SCREENING_MODE:
+        persona, topic, criteria = config["persona"], config["topic"], config["criteria"]
+        cascade_query = config.get("cascade_query")
+        print(f"\n{Fore.BLUE}ℹ️  Resuming run on '{config['input_folder']}' (topic: {topic}).{Style.RESET_ALL}")
+    else:
+        resume = False
+        persona, topic, criteria = get_user_criteria()
+        cascade_query = get_cascade_config()
+        config = {
+            "mode": SCREENING_MODE,
+            "input_folder": input_folder,
+            "persona": persona,
+            "topic": topic,
+            "criteria": criteria,
+            "cascade_query": cascade_query,
+            "completed": False
+        }
+        save_run_config(output_folder, config)
+    cascade_queries = parse_cascade_query(cascade_query)
     
-    # 2. Input Collection
-    persona, topic, criteria = get_user_criteria()
-    
-    # 3. File Setup & Pre-counting for Progress Bar
-    csv_files = [f for f in os.listdir(input_folder) if f.endswith('.csv') and not f.startswith("output_statistics")]
-    
-    if not csv_files:
+    # 3. File Setup & Cross-file Deduplication
+    if not dedup.list_input_csvs(input_folder):
         print(f"{Fore.RED}❌ No valid article CSV files found to process.")
         return
 
-    print(f"\n{Fore.YELLOW}📊 Calculating total workload...{Style.RESET_ALL}")
-    total_articles = 0
-    for filename in csv_files:
-        try:
-            with open(os.path.join(input_folder, filename), 'r', encoding='utf-8') as f:
-                # Count lines minus header (if file not empty)
-                row_count = sum(1 for _ in f) - 1
-                total_articles += max(0, row_count)
-        except Exception:
-            continue
+    print(f"\n{Fore.YELLOW}📊 Merging duplicates across query files...{Style.RESET_ALL}")
+    papers, total_rows = dedup.deduplicate_papers(input_folder, normalize_row)
+    total_articles = len(papers)
+    print(f"{Fore.BLUE}ℹ️  {total_rows} rows read, {total_articles} unique papers with abstract.{Style.RESET_ALL}")
+
+    # 4. Context Sizing (a resident model or a vocab-only load serves as tokenizer)
+    tokenizer = mr.get_tokenizer(model_path)
+    n_ctx = choose_context_size(tokenizer, papers, lambda t, a: construct_prompt(persona, topic, criteria, t, a))
+    prompt_overhead = count_tokens(tokenizer, construct_prompt(persona, topic, criteria, "", ""), add_bos=True)
+
+    print(f"\n{Fore.CYAN}🚀 Loading AI Model with n_ctx={n_ctx}... (Instant if already loaded this session){Style.RESET_ALL}")
+    # verbose=False suppresses low-level logs. The instance stays resident for later runs.
+    llm = mr.get_model(model_path, n_ctx=n_ctx, verbose=False, n_gpu_layers=-1, **tuning)
 
     output_csv = os.path.join(output_folder, "llama_filtered_articles.csv")
     
@@ -131,86 +368,610 @@ def filter_with_llama(input_folder, output_folder):
         approved_pdfs_dir = os.path.join(output_folder, "approved_pdfs")
         os.makedirs(approved_pdfs_dir, exist_ok=True)
 
+    # Papers decided before an interruption are skipped
+    decided = load_journal(output_folder) if resume else {}
+    journal_path = os.path.join(output_folder, SCREENING_LOG)
+    append = resume and os.path.exists(output_csv) and os.path.exists(journal_path)
+    if append:
+        print(f"{Fore.BLUE}ℹ️  {len(decided)} papers already decided. Skipping them.{Style.RESET_ALL}")
+    else:
+        decided = {}
+
     total_processed = 0
     approved_count = 0
     copied_pdfs = 0
+    llm_calls = 0
+    skipped = sum(1 for p in papers if p.key in decided)
     
-    print(f"\n{Fore.GREEN}⚡ Starting Inference on {total_articles} articles...{Style.RESET_ALL}")
+    print(f"\n{Fore.GREEN}⚡ Starting Inference on {total_articles - skipped} articles...{Style.RESET_ALL}")
     
-    with open(output_csv, 'w', newline='', encoding='utf-8') as outfile:
+    file_mode = 'a' if append else 'w'
+    with open(output_csv, file_mode, newline='', encoding='utf-8') as outfile, \
+         open(journal_path, file_mode, newline='', encoding='utf-8') as logfile:
         # Initialize Writer
-        # Added 'Local_PDF_Copy' to track where the file went
-        fieldnames = ["Title", "Year", "Citations", "Authors", "URL", "Abstract", "AI_Decision", "Local_PDF_Copy"]
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()
+        # Added 'Local_PDF_Copy' to track where the file went, 'Query' lists every origin query
+        # 'Abstract_Truncated' records 'original->kept' tokens when the model saw a shortened abstract
+        fieldnames = ["Title", "Year", "Citations", "Authors", "URL", "Abstract", "Query", "AI_Decision", "Local_PDF_Copy", "Abstract_Truncated"]
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames, extrasaction='ignore')
+
+        # Journal: which stage decided each paper (YES and NO), flushed per row
+        log_writer = csv.DictWriter(logfile, fieldnames=JOURNAL_FIELDS)
+
+        if not append:
+            writer.writeheader()
+            log_writer.writeheader()
         
         # Initialize Progress Bar
-        with tqdm(total=total_articles, unit="paper", desc="AI Analysis", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]') as pbar:
-            for filename in csv_files:
-                file_path = os.path.join(input_folder, filename)
+        with tqdm(total=total_articles, initial=skipped, unit="paper", desc="AI Analysis", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]') as pbar:
+            for paper in papers:
+                if paper.key in decided:
+                    continue
+
+                save_row = paper.to_row("ai_filter")
+                title, abstract = paper.title, paper.abstract
+                local_path = paper.local_path
+
+                # --- STAGE 1: CHEAP SCORER ---
+                clean_decision, cascade_score = None, ""
+                stage = "LLM"
+                if cascade_queries:
+                    clean_decision, cascade_score = cascade_decision(title, abstract, cascade_queries)
+                    if clean_decision:
+                        stage = "CASCADE"
+
+                # --- STAGE 2: INFERENCE ---
+                if clean_decision is None:
+                    budget = n_ctx - prompt_overhead - count_tokens(tokenizer, title) - DECISION_TOKENS - TOKEN_SAFETY_MARGIN
+                    model_abstract, save_row["Abstract_Truncated"] = truncate_abstract(tokenizer, abstract, budget)
+                    prompt = construct_prompt(persona, topic, criteria, title, model_abstract)
+                    
+                    output = llm(prompt, max_tokens=DECISION_TOKENS, stop=["<|im_end|>", "\n"], echo=False)
+                    decision = output['choices'][0]['text'].strip().upper()
+                    llm_calls += 1
+                    
+                    clean_decision = "YES" if "YES" in decision else "NO"
+
+                log_writer.writerow({"Paper_Key": paper.key, "Title": title, "Stage": stage, "Cascade_Score": cascade_score, "AI_Decision": clean_decision})
+                logfile.flush()
                 
-                with open(file_path, 'r', encoding='utf-8') as infile:
-                    reader = csv.DictReader(infile)
+                if clean_decision == "YES":
+                    save_row["AI_Decision"] = "YES"
                     
-                    for row in reader:
-                        # --- NORMALIZATION ---
-                        title = row.get("Title") or row.get("title")
-                        abstract = row.get("Abstract") or row.get("summary") or row.get("abstract")
-                        local_path = row.get("local_path") # ArXiv results usually have this
-                        
-                        if not title or not abstract:
-                            pbar.update(1) 
-                            continue
-                            
-                        save_row = {
-                            "Title": title,
-                            "Year": row.get("Year") or row.get("year"),
-                            "Citations": row.get("Citations") or row.get("citationCount") or 0,
-                            "Authors": row.get("Authors") or row.get("authors"),
-                            "URL": row.get("URL") or row.get("pdf_url") or row.get("url"),
-                            "Abstract": abstract,
-                            "Local_PDF_Copy": "" # Default empty
-                        }
-
-                        # --- INFERENCE ---
-                        prompt = construct_prompt(persona, topic, criteria, title, abstract)
-                        
-                        output = llm(prompt, max_tokens=5, stop=["<|im_end|>", "\n"], echo=False)
-                        decision = output['choices'][0]['text'].strip().upper()
-                        
-                        clean_decision = "YES" if "YES" in decision else "NO"
-                        
-                        if clean_decision == "YES":
-                            save_row["AI_Decision"] = "YES"
-                            
-                            # --- PDF COPY LOGIC ---
-                            # If the original CSV indicates a local PDF path and the file exists
-                            if local_path and os.path.exists(local_path):
-                                try:
-                                    pdf_filename = os.path.basename(local_path)
-                                    dest_path = os.path.join(approved_pdfs_dir, pdf_filename)
-                                    shutil.copy2(local_path, dest_path)
-                                    save_row["Local_PDF_Copy"] = dest_path
-                                    copied_pdfs += 1
-                                except Exception as e:
-                                    # Non-blocking error logging
-                                    pass
-
-                            writer.writerow(save_row)
-                            outfile.flush()
-                            approved_count += 1
-                            
-                        total_processed += 1
-                        pbar.update(1)
+                    # --- PDF COPY LOGIC ---
+                    # If the original CSV indicates a local PDF path and the file exists
+                    if local_path and os.path.exists(local_path):
+                        try:
+                            pdf_filename = os.path.basename(local_path)
+                            dest_path = os.path.join(approved_pdfs_dir, pdf_filename)
+                            shutil.copy2(local_path, dest_path)
+                            save_row["Local_PDF_Copy"] = dest_path
+                            copied_pdfs += 1
+                        except Exception as e:
+                            # Non-blocking error logging
+                            pass
+
+                    writer.writerow(save_row)
+                    outfile.flush()
+                    approved_count += 1
+                    
+                total_processed += 1
+                pbar.update(1)
+
+    config["completed"] = True
+    save_run_config(output_folder, config)
 
     print(f"\n{Fore.GREEN}🏁 Filtering Complete!{Style.RESET_ALL}")
     print(f"Processed: {total_processed}")
+    if skipped:
+        print(f"Skipped (decided before resume): {skipped}")
     print(f"Approved: {approved_count}")
+    if cascade_queries:
+        print(f"LLM Calls: {llm_calls} (the rest decided by keyword pre-screening)")
     if input_folder.startswith("arxiv_"):
         print(f"PDFs Copied: {copied_pdfs}")
     print(f"Results saved in: {output_csv}")
 
     # --- CROSS VALIDATION STEP ---
-    cv.save_metadata(output_folder, input_folder, filter_type="AI")
+    cv.save_metadata(output_folder, input_folder, filter_type="AI", query=f"{topic}: {criteria}")
     
-    cv.run_comparison(output_folder, current_filter_type="AI")
\ No newline at end of file
+    cv.run_comparison(output_folder, current_filter_type="AI")
+
+# ==============================================================================
+# MULTI-CRITERIA SCREENING (SHARED PREFIX)
+# ==============================================================================
+def get_multi_criteria():
+    """Collects persona, topic and a list of named criteria via CLI."""
+    print(f"\n{Fore.CYAN}-------------- Multi-Criteria AI Filter Configuration ----------{Style.RESET_ALL}")
+
+    print(f"{Fore.WHITE}Define the persona for the AI (e.g., 'Senior Material Scientist'):")
+    persona = input(f"{Fore.GREEN}> {Style.RESET_ALL}") or "Researcher"
+
+    print(f"\n{Fore.WHITE}What is the specific Research Topic? (e.g., 'Graphene production'):")
+    topic = input(f"{Fore.GREEN}> {Style.RESET_ALL}")
+
+    print(f"\n{Fore.WHITE}Enter one criterion per line as 'name: description'")
+    print(f"{Fore.WHITE}(e.g., 'dft: Uses density functional theory'). Empty line to finish:")
+    criteria = []
+    while True:
+        line = input(f"{Fore.GREEN}> {Style.RESET_ALL}").strip()
+        if not line:
+            break
+        name, _, description = line.partition(":")
+        if not description.strip():
+            name, description = f"criterion_{len(criteria) + 1}", line
+        column = "AI_" + re.sub(r'\W+', '_', name.strip()).strip('_')
+        criteria.append((column, description.strip()))
+
+    return persona, topic, criteria
+
+def construct_shared_prefix(persona, topic, title, abstract):
+    """Prompt part shared by every criterion: instructions + paper."""
+    return f"""<|im_start|>system
+You are a {persona}. Your task is to screen academic papers for a literature review on "{topic}".
+You will be asked about one inclusion criterion at a time.
+Reply ONLY with "YES" if the paper meets it, or "NO" if it does not. Do not provide explanations.<|im_end|>
+<|im_start|>user
+Paper Title: {title}
+Abstract: {abstract}
+"""
+
+def construct_criterion_suffix(criterion):
+    """Prompt part specific to one criterion, appended after the shared prefix."""
+    return f"""
+Criterion: {criterion}
+Does the paper meet this criterion? Reply YES or NO.<|im_end|>
+<|im_start|>assistant
+"""
+
+def answer_token_ids(llm, words):
+    """First token id of every spelling of an answer word."""
+    return sorted({llm.tokenize(w.encode("utf-8"), add_bos=False)[0] for w in words})
+
+def yes_probability(llm, tokens, yes_ids, no_ids):
+    """
+    Evaluates `tokens` and returns P(YES) against P(NO) for the next token.
+    The longest prefix already in the KV cache is reused, so prompts sharing
+    a prefix only pay for their differing tail.
+    """
+    limit = min(llm.n_tokens, len(tokens) - 1)
+    mismatch = np.nonzero(llm.input_ids[:limit] != np.asarray(tokens[:limit]))[0]
+    n_past = int(mismatch[0]) if len(mismatch) else limit
+
+    llm.n_tokens = n_past
+    llm.eval(tokens[n_past:])
+
+    logits = np.ctypeslib.as_array(llama_cpp.llama_get_logits(llm.ctx), shape=(llm.n_vocab(),))
+    yes_score = np.logaddexp.reduce(logits[yes_ids])
+    no_score = np.logaddexp.reduce(logits[no_ids])
+    return float(1.0 / (1.0 + np.exp(no_score - yes_score)))
+
+def filter_multi_criteria(input_folder, output_folder):
+    """
+    Screens every paper against several named criteria in one pass.
+    The instructions + abstract are evaluated once per paper; each criterion
+    branches from that shared state. Writes one decision column per criterion.
+    """
+    model_path, tuning = tuned_model(download_model_if_needed())
+    persona, topic, criteria = get_multi_criteria()
+
+    if not criteria:
+        print(f"{Fore.RED}❌ No criteria entered.")
+        return
+
+    if not dedup.list_input_csvs(input_folder):
+        print(f"{Fore.RED}❌ No valid article CSV files found to process.")
+        return
+
+    print(f"\n{Fore.YELLOW}📊 Merging duplicates across query files...{Style.RESET_ALL}")
+    papers, total_rows = dedup.deduplicate_papers(input_folder, normalize_row)
+    print(f"{Fore.BLUE}ℹ️  {total_rows} rows read, {len(papers)} unique papers with abstract.{Style.RESET_ALL}")
+
+    # Context sizing: shared prefix + the longest criterion suffix
+    tokenizer = mr.get_tokenizer(model_path)
+    longest_suffix = max((construct_criterion_suffix(c) for _, c in criteria), key=len)
+    n_ctx = choose_context_size(tokenizer, papers, lambda t, a: construct_shared_prefix(persona, topic, t, a) + longest_suffix)
+    prompt_overhead = count_tokens(tokenizer, construct_shared_prefix(persona, topic, "", "") + longest_suffix, add_bos=True)
+
+    print(f"\n{Fore.CYAN}🚀 Loading AI Model with n_ctx={n_ctx}... (Instant if already loaded this session){Style.RESET_ALL}")
+    llm = mr.get_model(model_path, n_ctx=n_ctx, verbose=False, n_gpu_layers=-1, **tuning)
+
+    yes_ids = answer_token_ids(llm, YES_WORDS)
+    no_ids = answer_token_ids(llm, NO_WORDS)
+    # Criterion suffixes are identical for every paper: tokenize once
+    suffix_tokens = [(column, llm.tokenize(construct_criterion_suffix(c).encode("utf-8"), add_bos=False, special=True)) for column, c in criteria]
+
+    output_csv = os.path.join(output_folder, MULTI_CRITERIA_CSV)
+    columns = [column for column, _ in criteria]
+    fieldnames = ["Title", "Year", "Citations", "Authors", "URL", "Abstract", "Query"] + columns + ["AI_Decision", "Abstract_Truncated"]
+    approved = {column: 0 for column in columns}
+    all_approved = 0
+
+    print(f"\n{Fore.GREEN}⚡ Screening {len(papers)} articles against {len(criteria)} criteria...{Style.RESET_ALL}")
+
+    with open(output_csv, 'w', newline='', encoding='utf-8') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+
+        with tqdm(total=len(papers), unit="paper", desc="AI Analysis", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]') as pbar:
+            for paper in papers:
+                save_row = paper.to_row("ai_filter")
+                title = paper.title
+                budget = n_ctx - prompt_overhead - count_tokens(tokenizer, title) - DECISION_TOKENS - TOKEN_SAFETY_MARGIN
+                model_abstract, save_row["Abstract_Truncated"] = truncate_abstract(tokenizer, paper.abstract, budget)
+
+                prefix = llm.tokenize(construct_shared_prefix(persona, topic, title, model_abstract).encode("utf-8"), add_bos=True, special=True)
+
+                for column, suffix in suffix_tokens:
+                    decision = "YES" if yes_probability(llm, prefix + suffix, yes_ids, no_ids) >= 0.5 else "NO"
+                    save_row[column] = decision
+                    if decision == "YES":
+                        approved[column] += 1
+
+                save_row["AI_Decision"] = "YES" if all(save_row[c] == "YES" for c in columns) else "NO"
+                if save_row["AI_Decision"] == "YES":
+                    all_approved += 1
+
+                writer.writerow(save_row)
+                outfile.flush()
+                pbar.update(1)
+
+    print(f"\n{Fore.GREEN}🏁 Filtering Complete!{Style.RESET_ALL}")
+    print(f"Processed: {len(papers)}")
+    for column in columns:
+        print(f"Approved by {column}: {approved[column]}")
+    print(f"Approved by all criteria: {all_approved}")
+    print(f"Results saved in: {output_csv}")
+
+    # --- CROSS VALIDATION STEP ---
+    cv.save_metadata(output_folder, input_folder, filter_type="AI", query=f"{topic}: " + "; ".join(c for _, c in criteria))
+
+    cv.run_comparison(output_folder, current_filter_type="AI")
+
+# ==============================================================================
+# FULL-TEXT SCREENING (CHUNKED, EARLY EXIT)
+# ==============================================================================
+def split_sections(text):
+    """
+    Splits extracted PDF text on heading-like lines and orders the sections by
+    SECTION_PRIORITY (methods, then results, ...). References are dropped.
+    """
+    sections = []
+    heading, lines = "", []
+    for line in text.splitlines():
+        match = SECTION_HEADING.match(line)
+        if match and len(line.split()) <= 6:
+            if lines:
+                sections.append((heading, "\n".join(lines)))
+            heading, lines = match.group(1), []
+        else:
+            lines.append(line)
+    if lines:
+        sections.append((heading, "\n".join(lines)))
+
+    ordered = []
+    for position, (heading, body) in enumerate(sections):
+        priority = DEFAULT_SECTION_PRIORITY
+        for pattern, value in SECTION_PRIORITY:
+            if pattern.search(heading):
+                priority = value
+                break
+        if priority is not None and body.strip():
+            ordered.append((priority, position, body))
+
+    ordered.sort()
+    return [body for _, _, body in ordered]
+
+def chunk_full_text(tokenizer, text, chunk_tokens, max_chunks):
+    """Cuts the ordered sections into at most `max_chunks` chunks of `chunk_tokens` tokens."""
+    chunks = []
+    for section in split_sections(text):
+        tokens = tokenizer.tokenize(" ".join(section.split()).encode("utf-8"), add_bos=False)
+        for start in range(0, len(tokens), chunk_tokens):
+            chunks.append(tokenizer.detokenize(tokens[start:start + chunk_tokens]).decode("utf-8", errors="ignore"))
+            if len(chunks) >= max_chunks:
+                return chunks
+    return chunks
+
+def construct_fulltext_prompt(persona, topic, criteria, title, chunk):
+    """Builds the prompt for one full-text chunk."""
+    return f"""<|im_start|>system
+You are a {persona}. Your task is to screen academic papers for a literature review on "{topic}".
+Criteria for inclusion: {criteria}.
+Reply ONLY with "YES" if the paper is relevant, or "NO" if it is not. Do not provide explanations.<|im_end|>
+<|im_start|>user
+Paper Title: {title}
+Excerpt from the full text:
+{chunk}
+
+Is this paper relevant based on the criteria? Reply YES or NO.<|im_end|>
+<|im_start|>assistant
+"""
+
+def collect_pdf_papers(input_folder):
+    """
+    Papers with a downloaded PDF: CSV rows whose 'local_path' exists, or, when
+    the folder has no such rows, the PDF files themselves (title = file name).
+    """
+    papers = []
+    if dedup.list_input_csvs(input_folder):
+        rows, _ = dedup.deduplicate_papers(input_folder, normalize_row)
+        papers = [p for p in rows if p.local_path and os.path.exists(p.local_path)]
+
+    if not papers:
+        pdf_dir = input_folder
+        if not any(f.lower().endswith('.pdf') for f in os.listdir(pdf_dir)) and os.path.isdir(os.path.join(input_folder, "pdfs")):
+            pdf_dir = os.path.join(input_folder, "pdfs")
+        for filename in sorted(os.listdir(pdf_dir)):
+            if filename.lower().endswith('.pdf'):
+                title = os.path.splitext(filename)[0]
+                papers.append(Paper(title=title, citations=0, local_path=os.path.join(pdf_dir, filename),
+                                    key=f"title:{sc.paper_key(title)}"))
+    return papers
+
+def filter_full_text(input_folder, output_folder, resume=False):
+    """
+    LLM screening over full PDF text. Each paper is read chunk by chunk
+    (methods/results first) and accepted at the first confident YES;
+    papers whose chunk budget runs out without one are rejected.
+    Results and journal go to FULLTEXT_CSV / FULLTEXT_LOG; with resume=True,
+    papers already in the journal are skipped, as in filter_with_llama.
+    """
+    model_path, tuning = tuned_model(download_model_if_needed())
+
+    config = load_run_config(output_folder) if resume else None
+    if config and config.get("mode") == FULLTEXT_MODE:
+        persona, topic, criteria = config["persona"], config["topic"], config["criteria"]
+        print(f"\n{Fore.BLUE}ℹ️  Resuming full-text run on '{config['input_folder']}' (topic: {topic}).{Style.RESET_ALL}")
+    else:
+        resume = False
+        persona, topic, criteria = get_user_criteria()
+        config = {
+            "mode": FULLTEXT_MODE,
+            "input_folder": input_folder,
+            "persona": persona,
+            "topic": topic,
+            "criteria": criteria,
+            "completed": False
+        }
+        save_run_config(output_folder, config)
+
+    papers = collect_pdf_papers(input_folder)
+    if not papers:
+        print(f"{Fore.RED}❌ No downloaded PDFs found in '{input_folder}'.")
+        return
+
+    print(f"\n{Fore.CYAN}🚀 Loading AI Model with n_ctx={FULLTEXT_CONTEXT}... (Instant if already loaded this session){Style.RESET_ALL}")
+    llm = mr.get_model(model_path, n_ctx=FULLTEXT_CONTEXT, verbose=False, n_gpu_layers=-1, **tuning)
+    yes_ids = answer_token_ids(llm, YES_WORDS)
+    no_ids = answer_token_ids(llm, NO_WORDS)
+
+    output_csv = os.path.join(output_folder, FULLTEXT_CSV)
+    journal_path = os.path.join(output_folder, FULLTEXT_LOG)
+    approved_pdfs_dir = os.path.join(output_folder, "approved_pdfs")
+    os.makedirs(approved_pdfs_dir, exist_ok=True)
+
+    # Papers decided before an interruption are skipped
+    decided = load_journal(output_folder, FULLTEXT_LOG) if resume else {}
+    append = resume and os.path.exists(output_csv) and os.path.exists(journal_path)
+    if append:
+        print(f"{Fore.BLUE}ℹ️  {len(decided)} papers already decided. Skipping them.{Style.RESET_ALL}")
+    else:
+        decided = {}
+    skipped = sum(1 for p in papers if p.key in decided)
+
+    approved_count = 0
+    chunks_read = 0
+
+    print(f"\n{Fore.GREEN}⚡ Starting full-text screening of {len(papers) - skipped} PDFs...{Style.RESET_ALL}")
+
+    file_mode = 'a' if append else 'w'
+    with open(output_csv, file_mode, newline='', encoding='utf-8') as outfile, \
+         open(journal_path, file_mode, newline='', encoding='utf-8') as logfile:
+        fieldnames = ["Title", "Year", "Citations", "Authors", "URL", "Abstract", "Query", "AI_Decision", "Local_PDF_Copy", "Decided_Chunk", "Yes_Probability"]
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames, extrasaction='ignore')
+        log_writer = csv.DictWriter(logfile, fieldnames=JOURNAL_FIELDS + ["Chunks_Read", "Yes_Probability"], extrasaction='ignore')
+        if not append:
+            writer.writeheader()
+            log_writer.writeheader()
+
+        with tqdm(total=len(papers), initial=skipped, unit="pdf", desc="AI Full-Text", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]') as pbar:
+            for paper in papers:
+                if paper.key in decided:
+                    continue
+                save_row = paper.to_row("ai_filter")
+                title = paper.title
+                # Reuses the content filter's extraction path
+                full_text = pcf.extract_text_from_pdf(paper.local_path)
+
+                overhead = count_tokens(llm, construct_fulltext_prompt(persona, topic, criteria, title, ""), add_bos=True)
+                chunk_budget = FULLTEXT_CONTEXT - overhead - DECISION_TOKENS - TOKEN_SAFETY_MARGIN
+                chunks = chunk_full_text(llm, full_text, chunk_budget, FULLTEXT_MAX_CHUNKS) if chunk_budget > 0 else []
+
+                decision, best, used = "NO", 0.0, 0
+                for index, chunk in enumerate(chunks, start=1):
+                    prompt = llm.tokenize(construct_fulltext_prompt(persona, topic, criteria, title, chunk).encode("utf-8"), add_bos=True, special=True)
+                    probability = yes_probability(llm, prompt, yes_ids, no_ids)
+                    best, used = max(best, probability), index
+                    if probability >= FULLTEXT_CONFIDENT_YES:
+                        # Early exit: no need to read the rest of the paper
+                        decision = "YES"
+                        save_row["Decided_Chunk"] = index
+                        break
+                chunks_read += used
+                save_row["Yes_Probability"] = f"{best:.3f}"
+
+                log_writer.writerow({"Paper_Key": paper.key, "Title": title, "Stage": "FULLTEXT",
+                                     "AI_Decision": decision, "Chunks_Read": used, "Yes_Probability": save_row["Yes_Probability"]})
+                logfile.flush()
+
+                if decision == "YES":
+                    save_row["AI_Decision"] = "YES"
+                    try:
+                        dest_path = os.path.join(approved_pdfs_dir, os.path.basename(paper.local_path))
+                        shutil.copy2(paper.local_path, dest_path)
+                        save_row["Local_PDF_Copy"] = dest_path
+                    except Exception:
+                        # Non-blocking error logging
+                        pass
+                    writer.writerow(save_row)
+                    outfile.flush()
+                    approved_count += 1
+
+                pbar.update(1)
+
+    config["completed"] = True
+    save_run_config(output_folder, config)
+
+    print(f"\n{Fore.GREEN}🏁 Filtering Complete!{Style.RESET_ALL}")
+    print(f"Processed: {len(papers) - skipped}")
+    if skipped:
+        print(f"Skipped (decided before resume): {skipped}")
+    print(f"Approved: {approved_count}")
+    print(f"Chunks Read: {chunks_read} (max {FULLTEXT_MAX_CHUNKS} per paper)")
+    print(f"Results saved in: {output_csv}")
+
+    # --- CROSS VALIDATION STEP ---
+    cv.save_metadata(output_folder, input_folder, filter_type="AI", query=f"{topic}: {criteria} (full text)")
+
+    cv.run_comparison(output_folder, current_filter_type="AI")
+
+# ==============================================================================
+# EMBEDDING SIMILARITY RANKING
+# ==============================================================================
+def get_ranking_config():
+    """Collects topic, criteria and the ranking cut via CLI."""
+    print(f"\n{Fore.CYAN}---------------- AI Ranking Configuration ---------------------{Style.RESET_ALL}")
+
+    print(f"{Fore.WHITE}What is the specific Research Topic? (e.g., 'Graphene production'):")
+    topic = input(f"{Fore.GREEN}> {Style.RESET_ALL}")
+
+    print(f"\n{Fore.WHITE}Describe what relevant papers contain (e.g., 'experimental CVD growth results'):")
+    criteria = input(f"{Fore.GREEN}> {Style.RESET_ALL}")
+
+    # Two separate cuts, so '1' (one paper) and '1.0' (similarity) cannot be confused
+    top_k, threshold = None, None
+    top_input = input(f"\n{Fore.MAGENTA}Keep only the top N papers {Style.DIM}(e.g. 50, Enter = all):{Style.RESET_ALL} ").strip()
+    if top_input:
+        try:
+            top_k = int(top_input)
+            if top_k < 1:
+                raise ValueError
+        except ValueError:
+            top_k = None
+            print(f"{Fore.YELLOW}⚠️ Invalid number of papers. No top-N cut.")
+
+    threshold_input = input(f"{Fore.MAGENTA}Minimum similarity between 0 and 1 {Style.DIM}(e.g. 0.6, Enter = none):{Style.RESET_ALL} ").strip()
+    if threshold_input:
+        try:
+            threshold = float(threshold_input)
+            if not 0 <= threshold <= 1:
+                raise ValueError
+        except ValueError:
+            threshold = None
+            print(f"{Fore.YELLOW}⚠️ Invalid similarity. No similarity cut.")
+
+    return topic, criteria, top_k, threshold
+
+def embedding_cache_path(title, abstract):
+    """Returns the on-disk cache file for a paper's embedding under the current model."""
+    model_name = os.path.splitext(FILENAME)[0]
+    digest = hashlib.sha1(f"{title}\n{abstract}".encode("utf-8")).hexdigest()
+    return os.path.join(EMBEDDING_CACHE_DIR, model_name, f"{digest}.npy")
+
+def pool_embedding(raw):
+    """Mean-pools per-token embeddings (models without a pooling layer) and L2-normalizes."""
+    vec = np.asarray(raw, dtype=np.float32)
+    if vec.ndim == 2:
+        vec = vec.mean(axis=0)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
+def embed_papers(llm, papers):
+    """
+    Returns an (n_papers x dim) matrix of normalized embeddings.
+    Cached vectors are loaded from disk; the rest are embedded in batches and cached.
+    """
+    vectors = [None] * len(papers)
+    missing = []
+
+    for i, paper in enumerate(papers):
+        cache_file = embedding_cache_path(paper.title, paper.abstract)
+        if os.path.exists(cache_file):
+            try:
+                vectors[i] = np.load(cache_file)
+                continue
+            except Exception:
+                pass
+        missing.append(i)
+
+    print(f"{Fore.BLUE}ℹ️  {len(papers) - len(missing)} embeddings loaded from cache, {len(missing)} to compute.{Style.RESET_ALL}")
+
+    with tqdm(total=len(missing), unit="paper", desc="Embedding", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]') as pbar:
+        for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+            batch_idx = missing[start:start + EMBEDDING_BATCH_SIZE]
+            texts = [f"{papers[i].title}\n{papers[i].abstract}" for i in batch_idx]
+            raw_vectors = llm.embed(texts, truncate=True)
+
+            for i, raw in zip(batch_idx, raw_vectors):
+                vec = pool_embedding(raw)
+                cache_file = embedding_cache_path(papers[i].title, papers[i].abstract)
+                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                np.save(cache_file, vec)
+                vectors[i] = vec
+
+            pbar.update(len(batch_idx))
+
+    return np.vstack(vectors)
+
+def rank_with_embeddings(input_folder, output_folder):
+    """
+    Second AI mode. Embeds topic + criteria and every Title + Abstract once,
+    ranks papers by cosine similarity and saves the cut as a ranked CSV.
+    """
+    topic, criteria, top_k, threshold = get_ranking_config()
+
+    papers, _ = dedup.deduplicate_papers(input_folder, normalize_row)
+
+    if not papers:
+        print(f"{Fore.RED}❌ No articles with Title and Abstract found to rank.")
+        return
+
+    # The model is loaded only once the configuration is complete and there is work to do
+    model_path = download_model_if_needed()
+
+    print(f"\n{Fore.CYAN}🚀 Loading AI Model in embedding mode...{Style.RESET_ALL}")
+    # n_batch must hold a whole abstract: llama.cpp embeds each input in a single batch.
+    llm = mr.get_model(model_path, n_ctx=4096, n_batch=4096, embedding=True, verbose=False, n_gpu_layers=-1)
+
+    # --- VECTORIZED RANKING ---
+    paper_matrix = embed_papers(llm, papers)
+    query_vec = pool_embedding(llm.embed([f"{topic}. {criteria}"], truncate=True)[0])
+
+    similarities = paper_matrix @ query_vec
+    order = np.argsort(-similarities)
+
+    if threshold is not None:
+        order = order[similarities[order] >= threshold]
+    if top_k is not None:
+        order = order[:top_k]
+
+    output_csv = os.path.join(output_folder, RANKED_CSV)
+    fieldnames = ["Rank", "Similarity", "Title", "Year", "Citations", "Authors", "URL", "Abstract"]
+    with open(output_csv, 'w', newline='', encoding='utf-8') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for rank, idx in enumerate(order, start=1):
+            row = papers[idx].to_row("ai_filter")
+            row["Rank"] = rank
+            row["Similarity"] = f"{similarities[idx]:.4f}"
+            writer.writerow(row)
+
+    print(f"\n{Fore.GREEN}🏁 Ranking Complete!{Style.RESET_ALL}")
+    print(f"Ranked: {len(papers)}")
+    print(f"Kept: {len(order)}")
+    print(f"Results saved in: {output_csv}")
+
+    # --- CROSS VALIDATION STEP ---
+    cv.save_metadata(output_folder, input_folder, filter_type="AI", query=f"{topic}: {criteria} (ranking)")
+
+    cv.run_comparison(output_folder, current_filter_type="AI")
@@ -1,26 +1,22 @@
 # main.py
 
-import requests
-import pypdf
 import time
 import csv
 import sys
 import os
-from tqdm import tqdm
 from colorama import init, Fore, Style
 import subprocess
 import importlib.util
 import shutil
 
-# Imports relative to the current package
+# Imports relative to the current package.
+# Only lightweight modules are imported here so the menu draws instantly;
+# features with heavy dependencies (requests, arxiv/pandas, scholarly, pypdf,
+# matplotlib, numpy) are imported on first use inside the menu handlers.
 from . import parse_query as pq
 from . import preview_step as ps
 from . import help_menu as hm
-from . import statistics_analyzer as sa
-from . import author_search_scholar as ass
-from . import pyarxiv 
-from . import pdf_content_filter as pcf
-from . import bibtex_generator as bg
+from . import model_registry as mr
 
 # Initializes colorama
 init(autoreset=True)
@@ -127,6 +123,7 @@ def get_unique_folder(base_folder):
 
 def get_with_backoff(url, headers, max_retries=5):
     """Performs an HTTP GET request with exponential backoff for rate limiting."""
+    import requests
     delay = 5
     for attempt in range(max_retries):
         try:
@@ -204,6 +201,7 @@ def run_arxiv_interface():
     output_folder = get_unique_folder("arxiv_results")
     
     try:
+        from . import pyarxiv
         tool = pyarxiv.ArxivTool(max_results_per_query=max_papers)
         tool.run_search(queries, output_folder, min_year, max_year, min_citations)
     except Exception as e:
@@ -293,6 +291,8 @@ def run_bibliographic_search():
         filtered_papers = 0
         
         # --- PROGRESS BAR IMPLEMENTATION ---
+        from tqdm import tqdm
+        from .papers import Paper, layout_columns
         with tqdm(range(max_batches), desc="Fetching Batches", unit="batch", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]') as pbar:
             for batch in pbar:
                 offset = batch * batch_size
@@ -316,23 +316,23 @@ def run_bibliographic_search():
                     output_file = os.path.join(output_folder, f"{sanitized_query}-{batch + 1}.csv")
 
                     with open(output_file, mode='w', newline='', encoding='utf-8') as file:
-                        writer = csv.writer(file)
                         # CSV Header including Venue
-                        writer.writerow(["Query", "Title", "Year", "Citations", "Authors", "Venue", "URL", "Abstract"])
+                        writer = csv.DictWriter(file, fieldnames=layout_columns("semantic"))
+                        writer.writeheader()
                         for paper in filtered:
                             authors = "; ".join([a["name"] for a in paper.get("authors", [])])
                             
                             # Row data including Venue extraction
-                            writer.writerow([
-                                query, 
-                                paper.get("title", ""), 
-                                paper.get("year", ""), 
-                                paper.get("citationCount", 0), 
-                                authors, 
-                                paper.get("venue", ""), 
-                                paper.get("url", ""), 
-                                paper.get("abstract", "")
-                            ])
+                            writer.writerow(Paper(
+                                query=query,
+                                title=paper.get("title", ""),
+                                year=paper.get("year", ""),
+                                citations=paper.get("citationCount", 0),
+                                authors=authors,
+                                venue=paper.get("venue", ""),
+                                url=paper.get("url", ""),
+                                abstract=paper.get("abstract", "")
+                            ).to_row("semantic"))
                     
                     # Update progress bar description with stats
                     pbar.set_postfix(saved=filtered_papers)
@@ -388,6 +388,13 @@ def ensure_llama_installed():
 
 def main_menu():
     """Displays the main menu and handles user choices."""
+    # Subcommand: 'spe autotune [--all-models]' benchmarks local inference and exits
+    if len(sys.argv) > 1 and sys.argv[1] == "autotune":
+        # llama_filter is not imported here: it exits when llama-cpp-python is missing
+        from . import autotune
+        autotune.run_autotune(all_models="--all-models" in sys.argv[2:])
+        return
+
     display_banner()
     while True:
         # Clear the terminal for a cleaner menu view
@@ -417,6 +424,7 @@ def main_menu():
 
         # --- 3. AUTHOR SEARCH ---
         elif choice == "3":
+            from . import author_search_scholar as ass
             ass.run_author_search()
 
         # --- 4. AI FILTER (LLAMA) ---
@@ -447,11 +455,36 @@ def main_menu():
                     except ValueError:
                         main_menu()
 
-                output_folder = get_unique_folder("llama_filtered")
-                print(f"\n{Fore.GREEN}✅ Starting AI-based filtering...")
+                print(f"\n{Fore.CYAN}Select the AI mode:{Style.RESET_ALL}")
+                print(f"{Fore.YELLOW}1. YES/NO Screening (one prompt per paper)")
+                print(f"{Fore.YELLOW}2. Similarity Ranking (embeddings, top-k or threshold)")
+                print(f"{Fore.YELLOW}3. Multi-Criteria Screening (several criteria, one pass)")
+                print(f"{Fore.YELLOW}4. Full-Text Screening (downloaded PDFs, chunked)")
+                ai_mode = input(f"\n{Fore.CYAN}Enter your choice (default = 1): {Style.RESET_ALL}").strip()
+
                 try:
                     from . import llama_filter as lf
-                    lf.filter_with_llama(input_folder, output_folder)
+
+                    # Offer to continue an interrupted YES/NO or full-text run on the same folder
+                    resume_folder = None
+                    if ai_mode not in ("2", "3"):
+                        run_mode = lf.FULLTEXT_MODE if ai_mode == "4" else lf.SCREENING_MODE
+                        for run_folder in lf.find_resumable_runs(input_folder, run_mode):
+                            answer = input(f"\n{Fore.MAGENTA}Unfinished run found in '{run_folder}'. Resume it? (y/n): {Style.RESET_ALL}").lower().strip()
+                            if answer == "y":
+                                resume_folder = run_folder
+                                break
+
+                    output_folder = resume_folder or get_unique_folder("llama_filtered")
+                    print(f"\n{Fore.GREEN}✅ Starting AI-based filtering...")
+                    if ai_mode == "2":
+                        lf.rank_with_embeddings(input_folder, output_folder)
+                    elif ai_mode == "3":
+                        lf.filter_multi_criteria(input_folder, output_folder)
+                    elif ai_mode == "4":
+                        lf.filter_full_text(input_folder, output_folder, resume=resume_folder is not None)
+                    else:
+                        lf.filter_with_llama(input_folder, output_folder, resume=resume_folder is not None)
                     print(f"\n{Fore.GREEN}🏁 AI filtering finished. Check the '{output_folder}' folder for results.")
                     input(f"\n{Fore.MAGENTA}Press Enter to return to the main menu...{Style.RESET_ALL}")
                 except ImportError:
@@ -508,6 +541,7 @@ def main_menu():
                     #user_query = input(f"{Fore.GREEN}> {Style.RESET_ALL}")
                     
                     if user_query.strip():
+                        from . import pdf_content_filter as pcf
                         if has_pdfs:
                             print(f"\n{Fore.BLUE}ℹ️  Detected PDFs. Running PDF Content Filter...{Style.RESET_ALL}")
                             pcf.run_content_filter(selected_folder, user_query)
@@ -525,10 +559,12 @@ def main_menu():
 
         # --- 6. ANALYZE RESULTS ---
         elif choice == "6":
+            from . import statistics_analyzer as sa
             sa.run_analysis_interface()
 
         # --- 7. GENERATE BIBTEX ---
         elif choice == "7":
+            from . import bibtex_generator as bg
             bg.scan_and_generate_bibtex()
             #input(f"\n{Fore.MAGENTA}Press Enter to return to the main menu...{Style.RESET_ALL}")
 
@@ -537,6 +573,17 @@ def main_menu():
             print(f"\n{Fore.CYAN}------------------------ Local AI Setup ------------------------")
             if importlib.util.find_spec("llama_cpp"):
                 print(f"{Fore.GREEN}✅ 'llama-cpp-python' is already installed and ready to use.")
+
+                # Models stay loaded between AI runs; offer to free the memory
+                resident = mr.resident_models()
+                if resident:
+                    print(f"\n{Fore.CYAN}Models loaded in this session:{Style.RESET_ALL}")
+                    for name, n_ctx in resident:
+                        print(f"{Fore.YELLOW}   • {name} (n_ctx={n_ctx})")
+                    if input(f"\n{Fore.MAGENTA}Unload them to free memory? (y/n): {Style.RESET_ALL}").lower().strip() == "y":
+                        freed = mr.unload_all()
+                        print(f"{Fore.GREEN}✅ {freed} model(s) unloaded.")
+
                 input(f"\n{Fore.MAGENTA}Press Enter to return to main menu...{Style.RESET_ALL}")
             else:
                 ensure_llama_installed()
@@ -547,6 +594,9 @@ def main_menu():
 
         # --- 0. EXIT ---
         elif choice == "0":
+            # Join the analysis module's chart pool, if an analysis was run this session
+            if "spe.statistics_analyzer" in sys.modules:
+                sys.modules["spe.statistics_analyzer"].shutdown_charts()
             print(f"{Fore.BLUE}Exiting. Goodbye!{Style.RESET_ALL}\n")
             sys.exit()
         else:
@@ -0,0 +1,119 @@
+# model_registry.py
+
+import os
+import gc
+from collections import OrderedDict
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+# --- REGISTRY CONFIGURATION ---
+# Loaded GGUF models stay resident for the whole menu session.
+# Least recently used models are evicted when the limit is reached or RAM runs low.
+MAX_RESIDENT_MODELS = 2
+# Free RAM required before loading, as a multiple of the model file size
+MEMORY_HEADROOM = 1.2
+
+_resident = OrderedDict()   # (path, params) -> Llama
+_tokenizers = {}            # path -> vocab-only Llama
+
+def _make_key(model_path, params):
+    """Registry key: absolute model path + load parameters (n_ctx excluded, see get_model)."""
+    return os.path.abspath(model_path), tuple(sorted(params.items()))
+
+def available_memory_bytes():
+    """Free RAM reported by the OS, or None when it cannot be determined."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def _close(llm):
+    """Frees the native resources of a Llama instance."""
+    close = getattr(llm, "close", None)
+    if close:
+        try:
+            close()
+        except Exception:
+            pass
+
+def _evict(key):
+    llm = _resident.pop(key, None)
+    if llm is not None:
+        _close(llm)
+        del llm
+        gc.collect()
+
+def _evict_for(model_path):
+    """Evicts least recently used models until there is room for `model_path`."""
+    while len(_resident) >= MAX_RESIDENT_MODELS:
+        _evict(next(iter(_resident)))
+
+    try:
+        needed = os.path.getsize(model_path) * MEMORY_HEADROOM
+    except OSError:
+        return
+    while _resident:
+        available = available_memory_bytes()
+        if available is None or available >= needed:
+            break
+        key = next(iter(_resident))
+        print(f"{Fore.YELLOW}⚠️  Low memory: unloading {os.path.basename(key[0])}.{Style.RESET_ALL}")
+        _evict(key)
+
+def get_model(model_path, n_ctx=512, **params):
+    """
+    Returns a resident Llama for `model_path` and `params`, loading it on first use.
+    A resident instance with the same parameters and at least `n_ctx` context is reused,
+    so screening several folders in one session pays the load only once.
+    """
+    key = _make_key(model_path, params)
+    llm = _resident.get(key)
+
+    if llm is not None and llm.n_ctx() >= n_ctx:
+        _resident.move_to_end(key)
+        return llm
+    if llm is not None:
+        # Context too small for this run: reload with the larger size
+        _evict(key)
+
+    _evict_for(model_path)
+
+    from llama_cpp import Llama
+    llm = Llama(model_path=model_path, n_ctx=n_ctx, **params)
+    _resident[key] = llm
+    return llm
+
+def get_tokenizer(model_path):
+    """Returns a tokenizer for `model_path`: any resident instance, else a cached vocab-only load."""
+    path = os.path.abspath(model_path)
+    for (resident_path, _), llm in reversed(_resident.items()):
+        if resident_path == path:
+            return llm
+
+    if path not in _tokenizers:
+        from llama_cpp import Llama
+        _tokenizers[path] = Llama(model_path=model_path, vocab_only=True, verbose=False)
+    return _tokenizers[path]
+
+def resident_models():
+    """Lists (model filename, n_ctx) of every resident model, least recently used first."""
+    return [(os.path.basename(path), llm.n_ctx()) for (path, _), llm in _resident.items()]
+
+def unload_all():
+    """Explicitly unloads every resident model and tokenizer. Returns how many models were freed."""
+    count = len(_resident)
+    for key in list(_resident):
+        _evict(key)
+    for llm in _tokenizers.values():
+        _close(llm)
+    _tokenizers.clear()
+    gc.collect()
+    return count
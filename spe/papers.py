@@ -0,0 +1,136 @@
+# papers.py
+
+from array import array
+import numpy as np
+
+from . import schema as sc
+
+# --- PAPER RECORDS ---
+# Papers move between stages as one slotted record type (no per-object __dict__),
+# and large collections can be held column-wise in a PaperBatch.
+PAPER_FIELDS = ("title", "year", "authors", "citations", "url", "abstract", "venue",
+                "query", "local_path", "key", "source", "keys")
+
+# Paper field -> column of every CSV layout the tool writes
+LAYOUTS = {
+    # Semantic Scholar search results (main.py)
+    "semantic": [("query", "Query"), ("title", "Title"), ("year", "Year"), ("citations", "Citations"),
+                 ("authors", "Authors"), ("venue", "Venue"), ("url", "URL"), ("abstract", "Abstract")],
+    # Google Scholar author publications (author_search_scholar.py)
+    "scholar": [("title", "Title"), ("year", "Year"), ("citations", "Citations"), ("authors", "Authors"),
+                ("venue", "Venue"), ("url", "URL"), ("abstract", "Abstract")],
+    # ArXiv search results (pyarxiv.py)
+    "arxiv": [("title", "title"), ("year", "year"), ("authors", "authors"), ("query", "query_origin"),
+              ("url", "pdf_url"), ("local_path", "local_path"), ("abstract", "summary")],
+    # AI filter working rows (llama_filter.py); extra output columns are added per mode
+    "ai_filter": [("title", "Title"), ("year", "Year"), ("citations", "Citations"), ("authors", "Authors"),
+                  ("url", "URL"), ("abstract", "Abstract"), ("query", "Query"),
+                  ("local_path", "local_path"), ("key", "Paper_Key")],
+}
+
+def layout_columns(layout):
+    """Header of one of LAYOUTS, in column order (csv.DictWriter fieldnames)."""
+    return [column for _, column in LAYOUTS[layout]]
+
+class Paper:
+    """One paper. Text fields default to ''; `keys` holds its identity keys (see schema)."""
+    __slots__ = PAPER_FIELDS
+
+    def __init__(self, title="", year="", authors="", citations="", url="", abstract="", venue="",
+                 query="", local_path="", key="", source="", keys=()):
+        self.title = title
+        self.year = year
+        self.authors = authors
+        self.citations = citations
+        self.url = url
+        self.abstract = abstract
+        self.venue = venue
+        self.query = query
+        self.local_path = local_path
+        self.key = key
+        self.source = source
+        self.keys = keys
+
+    @classmethod
+    def from_row(cls, row, schema=None):
+        """Reads a CSV row of any known layout (`schema` = the resolved header of its CSV)."""
+        schema = schema or sc.resolve(row.keys())
+        return cls(schema.title(row), schema.year(row), schema.authors(row), schema.citations(row),
+                   schema.url(row), schema.abstract(row), schema.venue(row), schema.query(row),
+                   schema.local_path(row))
+
+    def to_row(self, layout):
+        """Dict for a csv.DictWriter of one of LAYOUTS."""
+        return {column: getattr(self, field) for field, column in LAYOUTS[layout]}
+
+    def to_dict(self):
+        """Plain dict of every field (JSON caches)."""
+        return {field: getattr(self, field) for field in PAPER_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data[field] for field in PAPER_FIELDS if field in data})
+
+    def copy(self):
+        return Paper(*(getattr(self, field) for field in PAPER_FIELDS))
+
+    def __repr__(self):
+        return f"Paper({self.title!r}, year={self.year!r})"
+
+def _year_value(value):
+    value = str(value or "").strip()
+    return int(value) if value.isdigit() and int(value) < 32768 else 0
+
+def _citation_value(value):
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return -1
+
+class PaperBatch:
+    """
+    Struct-of-arrays collection: year (int16, 0 = unknown) and citations (int32,
+    -1 = unknown) in typed arrays, every text field in one list per column.
+    `years` / `citation_counts` return NumPy arrays for vectorized aggregates.
+    """
+    TEXT_FIELDS = ("title", "authors", "url", "abstract", "venue", "query", "local_path", "key", "source")
+
+    def __init__(self):
+        self._years = array('h')
+        self._citations = array('i')
+        self.columns = {field: [] for field in self.TEXT_FIELDS}
+
+    @classmethod
+    def from_papers(cls, papers):
+        batch = cls()
+        batch.extend(papers)
+        return batch
+
+    def append(self, paper):
+        self._years.append(_year_value(paper.year))
+        self._citations.append(_citation_value(paper.citations))
+        for field, column in self.columns.items():
+            column.append(getattr(paper, field))
+
+    def extend(self, papers):
+        for paper in papers:
+            self.append(paper)
+
+    def __len__(self):
+        return len(self._years)
+
+    @property
+    def years(self):
+        return np.frombuffer(self._years, dtype=np.int16).copy() if len(self) else np.zeros(0, dtype=np.int16)
+
+    @property
+    def citation_counts(self):
+        return np.frombuffer(self._citations, dtype=np.int32).copy() if len(self) else np.zeros(0, dtype=np.int32)
+
+    def __getitem__(self, i):
+        year, citations = self._years[i], self._citations[i]
+        return Paper(year=str(year) if year else "", citations=citations if citations >= 0 else None,
+                     **{field: column[i] for field, column in self.columns.items()})
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
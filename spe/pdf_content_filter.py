@@ -8,6 +8,7 @@ from colorama import Fore, Style, init
 from tqdm import tqdm
 from . import parse_query as pq
 from . import cross_validator as cv
+from . import schema as sc
 
 init(autoreset=True)
 
@@ -193,9 +194,11 @@ def run_csv_content_filter(input_folder, user_query_string):
 
                     out_fieldnames = fieldnames + ["Relevance_Score"]
 
+                    schema = sc.resolve(fieldnames)
+
                     for row in reader:
-                        title = row.get("Title", row.get("title", ""))
-                        abstract = row.get("Abstract", row.get("abstract", row.get("summary", "")))
+                        title = schema.title(row)
+                        abstract = schema.abstract(row)
                         
                         full_text = f"{title} . {abstract}"
                         
@@ -252,7 +255,7 @@ def run_csv_content_filter(input_folder, user_query_string):
     print(f"\n{Fore.CYAN}Results saved in: {base_output}{Style.RESET_ALL}")
 
     # --- CROSS VALIDATION STEP ---
-    cv.save_metadata(base_output, input_folder, filter_type="REGEX")
+    cv.save_metadata(base_output, input_folder, filter_type="REGEX", query=user_query_string)
     cv.run_comparison(base_output, current_filter_type="REGEX")
 
 def run_content_filter(input_folder, user_query_string):
@@ -368,5 +371,5 @@ def run_content_filter(input_folder, user_query_string):
     print(f"\n{Fore.CYAN}Results saved in: {base_output}{Style.RESET_ALL}")
 
     # --- CROSS VALIDATION STEP ---
-    cv.save_metadata(base_output, original_input_folder, filter_type="REGEX")
+    cv.save_metadata(base_output, original_input_folder, filter_type="REGEX", query=user_query_string)
     cv.run_comparison(base_output, current_filter_type="REGEX")
@@ -8,6 +8,8 @@ import re
 from colorama import Fore, Style
 from tqdm import tqdm  # Progress bar support
 
+from .papers import Paper
+
 def sanitize_filename(filename):
     """Clean string for filename usage."""
     clean_name = re.sub(r'[\\/*?:"<>|]', "", filename)
@@ -39,6 +41,7 @@ class ArxivTool:
             print(f"{Fore.YELLOW}    The 'Minimum Citations' filter will be ignored for this search.")
 
         all_results = {} 
+        arxiv_details = {}  # entry_id -> arXiv fields the Paper record has no slot for
 
         # 1. Search Phase
         print(f"\n{Fore.CYAN}-------------------- Starting ArXiv Search ---------------------")
@@ -64,16 +67,19 @@ class ArxivTool:
 
                     # Deduplication
                     if r.entry_id not in all_results:
-                        all_results[r.entry_id] = {
+                        arxiv_details[r.entry_id] = {
                             'arxiv_id': r.entry_id.split('/')[-1],
-                            'title': r.title,
-                            'authors': ", ".join([a.name for a in r.authors]),
-                            'published_date': r.published.date(),
-                            'year': pub_year,
-                            'summary': r.summary.replace("\n", " "),
-                            'pdf_url': r.pdf_url,
-                            'query_origin': query_str
+                            'published_date': r.published.date()
                         }
+                        all_results[r.entry_id] = Paper(
+                            title=r.title,
+                            year=pub_year,
+                            authors=", ".join([a.name for a in r.authors]),
+                            abstract=r.summary.replace("\n", " "),
+                            url=r.pdf_url,
+                            query=query_str,
+                            key=f"arxiv:{r.entry_id.split('/')[-1]}"
+                        )
             except Exception as e:
                 print(f"{Fore.RED}❌ Error processing query '{query_str}': {e}")
 
@@ -93,15 +99,15 @@ class ArxivTool:
         # Using tqdm to wrap the loop. 'unit' defines the item label (e.g., 5/10 pdfs)
         # Internal print statements removed to keep the terminal clean.
         with tqdm(total=unique_count, desc="Downloading PDFs", unit="pdf", colour="green", ncols=65, bar_format='{l_bar}{bar}| [{elapsed}]') as pbar:
-            for entry_id, data in all_results.items():
-                safe_title = sanitize_filename(data['title'])
+            for entry_id, paper in all_results.items():
+                safe_title = sanitize_filename(paper.title)
                 pdf_filename = f"{safe_title}.pdf"
                 pdf_path = os.path.join(pdf_dir, pdf_filename)
                 
-                data['local_path'] = pdf_path
+                paper.local_path = pdf_path
                 
                 try:
-                    response = requests.get(data['pdf_url'], timeout=30)
+                    response = requests.get(paper.url, timeout=30)
                     if response.status_code == 200:
                         with open(pdf_path, 'wb') as f:
                             f.write(response.content)
@@ -114,7 +120,7 @@ class ArxivTool:
                 
                 # Add metadata to final list regardless of download success
                 # (Ensures the link exists in CSV for manual retrieval if needed)
-                final_data.append(data)
+                final_data.append(dict(arxiv_details[entry_id], **paper.to_row("arxiv")))
                 
                 # Update progress bar
                 pbar.update(1)
@@ -0,0 +1,126 @@
+# run_registry.py
+
+import os
+import time
+import sqlite3
+import hashlib
+
+# --- REGISTRY CONFIGURATION ---
+# One SQLite file in the working directory indexes every filter run (AI and REGEX),
+# so sibling runs are found by fingerprint instead of scanning result folders.
+REGISTRY_DB = ".spe_runs.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    fingerprint    TEXT NOT NULL,
+    filter_type    TEXT NOT NULL,
+    query          TEXT,
+    source_path    TEXT,
+    output_path    TEXT NOT NULL UNIQUE,
+    created_at     TEXT NOT NULL,
+    updated_at     TEXT NOT NULL,
+    approved_count INTEGER,
+    approved_hash  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_fingerprint ON runs (fingerprint, filter_type);
+CREATE TABLE IF NOT EXISTS flags (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _now():
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+def _connect(db_path=REGISTRY_DB):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def _normalize_path(path):
+    return os.path.normpath(path)
+
+def summarize_approved(titles):
+    """Approved-set summary: (count, order-independent hash of the normalized titles)."""
+    total = 0
+    for t in titles:
+        total = (total + int.from_bytes(hashlib.blake2b(t.encode('utf-8'), digest_size=16).digest(), 'big')) & ((1 << 128) - 1)
+    return len(titles), f"{total:032x}"
+
+def register_run(fingerprint, filter_type, output_path, source_path=None, query=None, approved_titles=None, db_path=REGISTRY_DB):
+    """
+    Inserts or updates the run stored in `output_path` (a resumed or repeated run
+    keeps its creation time).
+    """
+    count, approved_hash = summarize_approved(approved_titles) if approved_titles is not None else (None, None)
+    now = _now()
+    with _connect(db_path) as conn:
+        conn.execute(
+            """INSERT INTO runs (fingerprint, filter_type, query, source_path, output_path,
+                                 created_at, updated_at, approved_count, approved_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(output_path) DO UPDATE SET
+                   fingerprint = excluded.fingerprint,
+                   filter_type = excluded.filter_type,
+                   query = COALESCE(excluded.query, runs.query),
+                   source_path = excluded.source_path,
+                   updated_at = excluded.updated_at,
+                   approved_count = excluded.approved_count,
+                   approved_hash = excluded.approved_hash""",
+            (fingerprint, filter_type, query, source_path, _normalize_path(output_path),
+             now, now, count, approved_hash))
+    conn.close()
+
+def get_flag(name, db_path=REGISTRY_DB):
+    """Reads a registry flag (e.g. one-time migrations). None when unset."""
+    if not os.path.exists(db_path):
+        return None
+    conn = _connect(db_path)
+    try:
+        row = conn.execute("SELECT value FROM flags WHERE name = ?", (name,)).fetchone()
+    finally:
+        conn.close()
+    return row["value"] if row else None
+
+def set_flag(name, value=None, db_path=REGISTRY_DB):
+    with _connect(db_path) as conn:
+        conn.execute("INSERT OR REPLACE INTO flags (name, value) VALUES (?, ?)", (name, value or _now()))
+    conn.close()
+
+def find_runs(fingerprint=None, filter_type=None, db_path=REGISTRY_DB):
+    """
+    Lists registered runs (newest first), optionally restricted to one dataset
+    fingerprint and/or filter type. Runs whose folder was deleted are dropped.
+    """
+    if not os.path.exists(db_path):
+        return []
+
+    clauses, params = [], []
+    if fingerprint is not None:
+        clauses.append("fingerprint = ?")
+        params.append(fingerprint)
+    if filter_type is not None:
+        clauses.append("filter_type = ?")
+        params.append(filter_type)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    conn = _connect(db_path)
+    try:
+        rows = [dict(r) for r in conn.execute(f"SELECT * FROM runs {where} ORDER BY updated_at DESC, id DESC", params)]
+        stale = [r["output_path"] for r in rows if not os.path.isdir(r["output_path"])]
+        if stale:
+            with conn:
+                conn.executemany("DELETE FROM runs WHERE output_path = ?", [(p,) for p in stale])
+    finally:
+        conn.close()
+    return [r for r in rows if os.path.isdir(r["output_path"])]
+
+def find_sibling_run(fingerprint, filter_type, exclude_path=None, db_path=REGISTRY_DB):
+    """Most recent run of `filter_type` on the same dataset, or None."""
+    exclude = _normalize_path(exclude_path) if exclude_path else None
+    for run in find_runs(fingerprint, filter_type, db_path):
+        if run["output_path"] != exclude:
+            return run
+    return None
@@ -0,0 +1,121 @@
+# schema.py
+
+import re
+from functools import lru_cache
+
+# --- COLUMN SCHEMA ---
+# Logical fields -> header spellings used by the different exports (Semantic Scholar,
+# ArXiv, filtered outputs), in priority order. Matching ignores case and padding.
+# A CSV header is resolved once (resolve); rows are then read through its accessors.
+FIELD_ALIASES = {
+    "title": ["Title"],
+    "year": ["Year", "pub_year", "published", "date"],
+    "authors": ["Authors"],
+    "citations": ["Citations", "citationCount"],
+    "url": ["URL", "pdf_url", "link"],
+    "abstract": ["Abstract", "summary"],
+    "venue": ["Venue", "journal"],
+    "query": ["Query", "query_origin"],
+    "local_path": ["local_path"],
+    "decision": ["AI_Decision"],
+}
+
+# Identifier columns found in the different exports (lowercase header), mapped to a key prefix
+ID_COLUMNS = {
+    "doi": "doi",
+    "paperid": "s2",
+    "paper_id": "s2",
+    "arxiv_id": "arxiv",
+}
+
+# Matches new-style (2101.00001v2) and old-style (cond-mat/0101001) arXiv ids in URLs
+ARXIV_URL_PATTERN = re.compile(r'arxiv\.org/(?:abs|pdf)/([a-z\-]+/\d{7}|\d{4}\.\d{4,5})', re.IGNORECASE)
+ARXIV_VERSION_PATTERN = re.compile(r'v\d+$')
+NON_KEY_CHARS = re.compile(r'[^a-z0-9]')
+PAPER_KEY_CACHE = 1 << 17
+
+def normalize_key(title):
+    """
+    Canonical identity of a paper title: lowercase letters and digits only.
+    Shared by fingerprints, deduplication, statistics and BibTeX.
+    """
+    if not title:
+        return ""
+    return NON_KEY_CHARS.sub('', title.lower())
+
+# Memoized form, for the readers that see the same titles several times
+# (streaming code calls normalize_key directly to keep its memory fixed)
+paper_key = lru_cache(maxsize=PAPER_KEY_CACHE)(normalize_key)
+
+def _accessor(columns):
+    """Row reader returning the first non-empty value among `columns` ("" if none)."""
+    if not columns:
+        return lambda row: ""
+    if len(columns) == 1:
+        column = columns[0]
+        return lambda row: row.get(column) or ""
+
+    def read(row):
+        for column in columns:
+            value = row.get(column)
+            if value:
+                return value
+        return ""
+    return read
+
+class Schema:
+    """
+    Compiled accessors of one CSV header: schema.title(row), schema.year(row),
+    schema.authors(row), ... for every field of FIELD_ALIASES.
+    `columns[field]` lists the header names that feed each field.
+    """
+    def __init__(self, fieldnames):
+        self.fieldnames = [name for name in fieldnames if name]
+        by_name = {}
+        for name in self.fieldnames:
+            by_name.setdefault(name.strip().lower(), []).append(name)
+
+        self.columns = {}
+        for field, aliases in FIELD_ALIASES.items():
+            columns = []
+            for alias in aliases:
+                columns.extend(c for c in by_name.get(alias.lower(), []) if c not in columns)
+            self.columns[field] = tuple(columns)
+            setattr(self, field, _accessor(self.columns[field]))
+
+        # In ID_COLUMNS order, so the first key of a paper is stable across exports
+        self.id_columns = tuple((name, prefix) for column, prefix in ID_COLUMNS.items() for name in by_name.get(column, []))
+
+    def has(self, field):
+        return bool(self.columns[field])
+
+    def paper_keys(self, row, title=None):
+        """
+        Every identity key of a row: DOI / paperId / arXiv id when present, the arXiv
+        id of the URL, and the canonical title key. Rows sharing any key are one paper.
+        """
+        keys = []
+        for column, prefix in self.id_columns:
+            value = row.get(column)
+            if value and value.strip():
+                value = value.strip().lower()
+                if prefix == "arxiv":
+                    value = ARXIV_VERSION_PATTERN.sub("", value)
+                keys.append(f"{prefix}:{value}")
+
+        match = ARXIV_URL_PATTERN.search(self.url(row))
+        if match:
+            keys.append(f"arxiv:{match.group(1).lower()}")
+
+        normalized = paper_key(title if title is not None else self.title(row))
+        if normalized:
+            keys.append(f"title:{normalized}")
+        return keys
+
+@lru_cache(maxsize=256)
+def _resolve(fieldnames):
+    return Schema(fieldnames)
+
+def resolve(fieldnames):
+    """Schema of a CSV header (list of column names); identical headers share one Schema."""
+    return _resolve(tuple(fieldnames or ()))
@@ -2,18 +2,64 @@
 
 import os
 import csv
+import json
+import math
+import hashlib
+import importlib.util
+import numpy as np
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from colorama import init, Fore, Style
 
-# Try to import matplotlib for plotting capabilities
-try:
+from . import dedup
+from . import consolidated as cd
+from . import keywords as kw
+from . import sketches as sk
+from . import coauthors as co
+from . import schema as sc
+from .papers import Paper, PaperBatch
+
+# Matplotlib is optional and slow to import: only check that it exists here,
+# pyplot is loaded on the first chart (see _pyplot)
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") is not None
+
+# --- PLOT RENDERING ---
+# Charts are rendered in a session-wide pool of worker processes with the headless Agg
+# backend, while the summary is printed; the pool is joined before the next analysis
+# and when the menu exits. Each chart is keyed by a hash of the data it shows;
+# unchanged charts are not re-rendered.
+PLOT_WORKERS = 2
+PLOT_CACHE_FILE = ".plot_cache.json"
+
+_plot_pool = None
+_pending_charts = []    # (future, output_folder, filename, digest) in submission order
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use("Agg")
     import matplotlib.pyplot as plt
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+    return plt
 
 init(autoreset=True)
 
+# --- STREAMING MODE ---
+# Fixed memory budget for huge folders, split between the sketches (see sketches.py)
+STREAMING_MEMORY_MB = 64
+STREAMING_CHUNK = 10000     # Rows buffered before the author sketch is updated
+STREAMING_TOP_K = 100       # Authors / papers kept for the reports
+HISTOGRAM_SAMPLE = 20000    # Citation values kept for the histogram
+KEYWORD_SAMPLE = 20000      # Papers (title + abstract) sampled for the keyword stage
+
+# --- ANALYSIS CACHE ---
+# Per-folder: consolidated records + report summaries, keyed by the size/mtime of every
+# CSV (like cross_validator's fingerprint cache). New CSVs are merged incrementally.
+# Records keep only the fields the reports read; abstracts (keyword stage only) are
+# re-read from the CSVs when the keyword report has to be rebuilt.
+ANALYSIS_CACHE_FILE = ".analysis_cache.json"
+ANALYSIS_CACHE_VERSION = 3
+ANALYSIS_RECORD_FIELDS = ("title", "year", "authors", "citations", "url", "source", "keys")
+REPORT_FILES = ["productive_years.csv", "prolific_authors.csv", "top_papers.csv"]
+
 # Basic English stopwords for keyword analysis
 STOPWORDS = {
     'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours', 'yourself',
@@ -78,22 +124,98 @@ def save_counter_to_csv(counter_obj, directory, filename, fieldnames):
     filepath = get_output_filepath(directory, filename)
     save_stats_to_csv(data_list, filepath, fieldnames)
 
-def plot_year_distribution(year_counter, output_folder, title_suffix=""):
+def _plot_digest(draw_function, data):
+    payload = json.dumps([draw_function.__name__, data], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _read_plot_cache(output_folder):
+    try:
+        with open(os.path.join(output_folder, PLOT_CACHE_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _record_plot(output_folder, filename, digest):
+    cache = _read_plot_cache(output_folder)
+    cache[filename] = digest
+    with open(os.path.join(output_folder, PLOT_CACHE_FILE), 'w') as f:
+        json.dump(cache, f)
+
+def _init_plot_worker():
+    """Imports pyplot once per worker process, so later charts render without the import cost."""
+    _pyplot()
+
+def _get_plot_pool():
+    """The session's rendering pool, started on first use (None if processes cannot be started)."""
+    global _plot_pool
+    if _plot_pool is None:
+        try:
+            _plot_pool = ProcessPoolExecutor(max_workers=PLOT_WORKERS, initializer=_init_plot_worker)
+        except (OSError, NotImplementedError, ImportError):
+            return None
+    return _plot_pool
+
+def _report_chart(output_folder, filename, digest, error):
+    if error is not None:
+        print(f"{Fore.RED}❌ Chart failed ({filename}): {error}{Style.RESET_ALL}")
+    else:
+        _record_plot(output_folder, filename, digest)
+        print(f"{Fore.GREEN}📊 Chart saved to: {os.path.join(output_folder, filename)}{Style.RESET_ALL}")
+
+def submit_charts(charts):
     """
-    Generates and saves a bar chart showing the distribution of papers per year.
-    Requires matplotlib.
+    Queues the chart jobs returned by the plot_* functions ((draw_function, data,
+    output_folder, filename), or None) on the background pool and returns at once.
+    Charts whose PNG exists and was drawn from identical data are kept.
+    Results are reported by finish_charts.
     """
-    if not HAS_MATPLOTLIB or not year_counter:
-        return
+    queued = 0
+    for draw_function, data, output_folder, filename in filter(None, charts):
+        save_path = os.path.join(output_folder, filename)
+        digest = _plot_digest(draw_function, data)
+        if os.path.exists(save_path) and _read_plot_cache(output_folder).get(filename) == digest:
+            print(f"{Fore.GREEN}📊 Chart unchanged, kept: {save_path}{Style.RESET_ALL}")
+            continue
 
-    # Filter out invalid years (non-numeric) and sort chronologically
-    valid_years = {k: v for k, v in year_counter.items() if str(k).isdigit()}
-    
-    if not valid_years:
-        return
+        pool = _get_plot_pool()
+        if pool is None:
+            # No worker processes available: render in place
+            try:
+                draw_function(data, save_path)
+                error = None
+            except Exception as e:
+                error = e
+            _report_chart(output_folder, filename, digest, error)
+            continue
+        _pending_charts.append((pool.submit(draw_function, data, save_path), output_folder, filename, digest))
+        queued += 1
 
-    sorted_years = sorted(valid_years.keys(), key=lambda x: int(x))
-    counts = [valid_years[y] for y in sorted_years]
+    if queued:
+        print(f"{Fore.BLUE}ℹ️  Rendering {queued} chart(s) in the background...{Style.RESET_ALL}")
+
+def finish_charts(wait=True):
+    """
+    Reports the queued charts in submission order: all of them (waiting for the
+    rest) with `wait`, otherwise only those already finished.
+    """
+    while _pending_charts:
+        future, output_folder, filename, digest = _pending_charts[0]
+        if not wait and not future.done():
+            return
+        _pending_charts.pop(0)
+        _report_chart(output_folder, filename, digest, future.exception())
+
+def shutdown_charts():
+    """Waits for the queued charts, reports them and stops the pool (menu exit)."""
+    global _plot_pool
+    finish_charts()
+    if _plot_pool is not None:
+        _plot_pool.shutdown(wait=True)
+        _plot_pool = None
+
+def _draw_year_distribution(data, save_path):
+    plt = _pyplot()
+    sorted_years, counts = data["years"], data["counts"]
 
     plt.figure(figsize=(10, 6))
     
@@ -116,30 +238,31 @@ def plot_year_distribution(year_counter, output_folder, title_suffix=""):
                  ha='center', va='bottom', fontsize=12)
 
     plt.tight_layout()
-    
-    # Save the plot
-    filename = "timeline_plot.png"
-    save_path = os.path.join(output_folder, filename)
     plt.savefig(save_path, dpi=300)
     plt.close() # Close figure to free memory
-    
-    print(f"{Fore.GREEN}📊 Chart saved to: {save_path}{Style.RESET_ALL}")
 
-def plot_top_authors(author_counter, output_folder, top_n=10):
+def plot_year_distribution(year_counter, output_folder, title_suffix=""):
     """
-    Generates a horizontal bar chart for the most prolific authors.
+    Generates and saves a bar chart showing the distribution of papers per year.
+    Requires matplotlib. Returns the chart job for submit_charts (None if nothing to draw).
     """
-    if not HAS_MATPLOTLIB or not author_counter:
+    if not HAS_MATPLOTLIB or not year_counter:
         return
 
-    # Get top N authors
-    most_common = author_counter.most_common(top_n)
-    if not most_common:
+    # Filter out invalid years (non-numeric) and sort chronologically
+    valid_years = {k: v for k, v in year_counter.items() if str(k).isdigit()}
+    
+    if not valid_years:
         return
 
-    # Unpack data (reverse to have top author at the top of chart)
-    authors = [x[0] for x in most_common][::-1]
-    counts = [x[1] for x in most_common][::-1]
+    sorted_years = sorted(valid_years.keys(), key=lambda x: int(x))
+    counts = [valid_years[y] for y in sorted_years]
+
+    return (_draw_year_distribution, {"years": sorted_years, "counts": counts}, output_folder, "timeline_plot.png")
+
+def _draw_top_authors(data, save_path):
+    plt = _pyplot()
+    authors, counts, top_n = data["authors"], data["counts"], data["top_n"]
 
     plt.figure(figsize=(10, 8))
     
@@ -160,31 +283,34 @@ def plot_top_authors(author_counter, output_folder, top_n=10):
                  va='center', fontsize=12)
 
     plt.tight_layout()
-    
-    filename = "top_authors_plot.png"
-    save_path = os.path.join(output_folder, filename)
     plt.savefig(save_path, dpi=300)
     plt.close()
-    
-    print(f"{Fore.GREEN}📊 Chart saved to: {save_path}{Style.RESET_ALL}")
 
-def plot_citation_distribution(papers_list, output_folder):
+def plot_top_authors(author_counter, output_folder, top_n=10):
     """
-    Generates a histogram showing how citations are distributed among papers.
+    Generates a horizontal bar chart for the most prolific authors.
     """
-    if not HAS_MATPLOTLIB or not papers_list:
+    if not HAS_MATPLOTLIB or not author_counter:
         return
 
-    # Extract citations (exclude 0 if you want, or keep them to show uncited papers)
-    citations = [p['citations'] for p in papers_list if p.get('citations') is not None]
-    
-    if all(x == 0 for x in citations):
+    # Get top N authors
+    most_common = author_counter.most_common(top_n)
+    if not most_common:
         return
 
+    # Unpack data (reverse to have top author at the top of chart)
+    authors = [x[0] for x in most_common][::-1]
+    counts = [x[1] for x in most_common][::-1]
+
+    return (_draw_top_authors, {"authors": authors, "counts": counts, "top_n": top_n}, output_folder, "top_authors_plot.png")
+
+def _draw_citation_distribution(data, save_path):
+    plt = _pyplot()
+
     plt.figure(figsize=(10, 6))
     
     # Histogram
-    plt.hist(citations, bins=30, color='salmon', edgecolor='black', alpha=0.7)
+    plt.hist(data["citations"], bins=30, color='salmon', edgecolor='black', alpha=0.7)
     
     plt.xlabel('Number of Citations', fontsize=16)
     plt.ylabel('Frequency (Number of Papers)', fontsize=16)
@@ -194,18 +320,285 @@ def plot_citation_distribution(papers_list, output_folder):
     plt.yticks(fontsize=14)
     
     plt.tight_layout()
-    
-    filename = "citation_histogram.png"
-    save_path = os.path.join(output_folder, filename)
     plt.savefig(save_path, dpi=300)
     plt.close()
+
+def plot_citation_distribution(papers_list, output_folder):
+    """
+    Generates a histogram showing how citations are distributed among papers.
+    """
+    if not HAS_MATPLOTLIB or not papers_list:
+        return
+
+    # Extract citations (exclude 0 if you want, or keep them to show uncited papers)
+    citations = [p['citations'] for p in papers_list if p.get('citations') is not None]
     
-    print(f"{Fore.GREEN}📊 Chart saved to: {save_path}{Style.RESET_ALL}")
+    if all(x == 0 for x in citations):
+        return
+
+    # Histogram input is order-independent: sort so the cache key is stable
+    return (_draw_citation_distribution, {"citations": sorted(citations)}, output_folder, "citation_histogram.png")
+
+def run_keyword_analysis(texts, years, log_directory, top_n=20):
+    """
+    Keyword stage: one sparse document-term matrix over titles + abstracts (STOPWORDS
+    removed), then top terms, TF-IDF keywords and per-year term trends as CSVs.
+    Returns the top keywords for print_keyword_summary.
+    """
+    matrix = kw.build_term_matrix(texts, STOPWORDS)
+    if not matrix.counts.nnz:
+        return []
+
+    terms = kw.top_terms(matrix, top_n=200)
+    save_stats_to_csv([{"Term": t, "Occurrences": c, "Documents": d} for t, c, d in terms],
+                      get_output_filepath(log_directory, "top_terms.csv"), ["Term", "Occurrences", "Documents"])
+
+    keywords = kw.tfidf_keywords(matrix, top_n=200)
+    save_stats_to_csv([{"Term": t, "TFIDF_Score": f"{score:.4f}"} for t, score in keywords],
+                      get_output_filepath(log_directory, "tfidf_keywords.csv"), ["Term", "TFIDF_Score"])
+
+    year_values, trend_terms, shares = kw.term_trends(matrix, years)
+    if trend_terms:
+        rows = [dict({"Year": int(y)}, **{t: f"{v:.2f}" for t, v in zip(trend_terms, share)}) for y, share in zip(year_values, shares)]
+        save_stats_to_csv(rows, get_output_filepath(log_directory, "term_trends.csv"), ["Year"] + trend_terms)
+
+    return [t for t, _ in keywords[:top_n]]
+
+def print_keyword_summary(keywords):
+    if keywords:
+        print_header("Top Keywords (TF-IDF)", color=Fore.YELLOW)
+        print(f"{Fore.GREEN}" + ", ".join(keywords))
+
+def run_coauthor_analysis(author_lists, citations, log_directory, top_n=5):
+    """
+    Co-authorship stage: sparse paper x author incidence -> co-authorship graph, then
+    collaboration groups, strongest pairs and per-author rankings
+    (papers, co-authors, PageRank, h-index) as CSVs.
+    Returns a summary for print_coauthor_summary (None when skipped).
+    """
+    graph = co.build_graph(author_lists, citations)
+    if not graph.n_authors:
+        return None
+
+    n_groups, labels = co.connected_components(graph)
+    papers = co.paper_counts(graph)
+    coauthor_counts, collaborations = co.degrees(graph)
+    centrality = co.pagerank(graph)
+    h_values = co.h_index(graph)
+
+    order = np.lexsort((-papers, -centrality))
+    save_stats_to_csv(
+        [{"Author": graph.names[j], "Papers": int(papers[j]), "Coauthors": int(coauthor_counts[j]),
+          "Collaborations": int(collaborations[j]), "PageRank": f"{centrality[j]:.6f}",
+          "H_Index": int(h_values[j]), "Group": int(labels[j])} for j in order],
+        get_output_filepath(log_directory, "coauthor_rankings.csv"),
+        ["Author", "Papers", "Coauthors", "Collaborations", "PageRank", "H_Index", "Group"])
+
+    groups = co.collaboration_groups(graph, labels)
+    save_stats_to_csv(
+        [{"Group_Rank": i + 1, "Authors": size, "Papers": count, "Leading_Members": "; ".join(members)}
+         for i, (size, count, members) in enumerate(groups)],
+        get_output_filepath(log_directory, "collaboration_groups.csv"),
+        ["Group_Rank", "Authors", "Papers", "Leading_Members"])
+
+    pairs = co.strongest_collaborations(graph)
+    save_stats_to_csv([{"Author_A": a, "Author_B": b, "Shared_Papers": n} for a, b, n in pairs],
+                      get_output_filepath(log_directory, "top_collaborations.csv"),
+                      ["Author_A", "Author_B", "Shared_Papers"])
+
+    return {
+        "authors": graph.n_authors,
+        "groups": int(n_groups),
+        "largest_group": [groups[0][0], groups[0][1]],
+        "leaders": [[graph.names[j], float(centrality[j]), int(h_values[j]), int(coauthor_counts[j])] for j in order[:top_n]],
+    }
+
+def print_coauthor_summary(summary):
+    if not summary:
+        return
+    print_header("Co-authorship Network", color=Fore.YELLOW)
+    print(f"{Fore.GREEN}{summary['authors']} authors in {summary['groups']} collaboration groups "
+          f"(largest: {summary['largest_group'][0]} authors, {summary['largest_group'][1]} papers)")
+    for name, centrality, h_value, coauthor_count in summary["leaders"]:
+        print(f"{Fore.WHITE}{name}: {Style.BRIGHT}PageRank {centrality:.6f}{Style.RESET_ALL}"
+              f"{Style.DIM} | h-index {h_value} | {coauthor_count} co-authors{Style.RESET_ALL}")
+
+def _paper_year(value):
+    value = str(value or "").strip()
+    return int(value) if value.isdigit() else 0
+
+def _citation_count(value):
+    try:
+        return int(float(value))  # Handle strings like "10.0"
+    except (ValueError, TypeError):
+        return None
+
+def consolidate_records(records):
+    """
+    Collapses copies of the same paper into one canonical record per cluster.
+    Copies share a DOI / paperId / arXiv id, or have near-identical titles
+    (MinHash + LSH, see dedup.near_duplicate_clusters).
+    The most complete copy is kept, its missing fields are filled from the other
+    copies, and the highest citation count wins. Returns Papers in input order.
+    """
+    labels = dedup.near_duplicate_clusters([r.title for r in records], [r.keys for r in records])
+    clusters = {}
+    for record, label in zip(records, labels):
+        clusters.setdefault(label, []).append(record)
+
+    canonical = []
+    for members in clusters.values():
+        best = max(members, key=lambda r: sum(1 for value in (r.year, r.authors, r.url) if value)).copy()
+        for field in ("year", "authors", "url", "abstract"):
+            if not getattr(best, field):
+                setattr(best, field, next((getattr(r, field) for r in members if getattr(r, field)), ""))
+        counts = [c for c in (_citation_count(r.citations) for r in members) if c is not None]
+        best.citations = max(counts) if counts else None
+        # Keep every identity key, so later batches still match any copy
+        best.keys = list(dict.fromkeys(k for r in members for k in r.keys))
+        canonical.append(best)
+    return canonical
+
+def _read_folder_records(folder_path, filenames, contains_arxiv_data=False):
+    """
+    Reads the rows of `filenames` (inside `folder_path`) as normalized records.
+    Returns (records, contains_arxiv_data).
+    """
+    records = []
+    folder_name = os.path.basename(os.path.normpath(folder_path))
+    is_arxiv_folder = "arxiv" in folder_name.lower()
+
+    for filename in filenames:
+        filepath = os.path.join(folder_path, filename)
+        
+        # Additional check if individual file is arxiv-related
+        if filename.startswith("arxiv_"): 
+            contains_arxiv_data = True
+        elif is_arxiv_folder:
+            contains_arxiv_data = True
+
+        with open(filepath, mode='r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            # ---------------------------------------------------------
+            # DATA NORMALIZATION (Handles Semantic Scholar, ArXiv, and Content Filtered)
+            # The header is resolved once; see schema.FIELD_ALIASES for the column spellings
+            # ---------------------------------------------------------
+            schema = sc.resolve(reader.fieldnames)
+            for row in reader:
+                raw_year = schema.year(row)
+                raw_authors = schema.authors(row)
+                raw_citations = schema.citations(row) or 0
+                raw_url = schema.url(row)
+                raw_abstract = schema.abstract(row)
+
+                title = schema.title(row).strip()
+                if not title or title.upper() == "N/A":
+                    continue
+
+                records.append(Paper(
+                    title=title,
+                    year=str(raw_year) if str(raw_year).isdigit() and int(raw_year) > 0 else "",
+                    authors=raw_authors,
+                    citations=raw_citations,
+                    url=raw_url,
+                    source="ArXiv" if contains_arxiv_data else "Semantic/Filtered",
+                    abstract=raw_abstract,
+                    # DOI / arXiv id keys merge copies before the fuzzy title stage
+                    keys=schema.paper_keys(row, title)
+                ))
+
+    return records, contains_arxiv_data
+
+def _csv_signature(folder_path, csv_files):
+    signature = {}
+    for f in csv_files:
+        st = os.stat(os.path.join(folder_path, f))
+        signature[f] = [st.st_size, st.st_mtime_ns]
+    return signature
+
+def _read_analysis_cache(folder_path):
+    try:
+        with open(os.path.join(folder_path, ANALYSIS_CACHE_FILE), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == ANALYSIS_CACHE_VERSION:
+            cache["records"] = [Paper.from_dict(r) for r in cache["records"]]
+            return cache
+    except (OSError, ValueError):
+        pass
+    return None
+
+def _write_analysis_cache(folder_path, cache):
+    records = [{field: getattr(r, field) for field in ANALYSIS_RECORD_FIELDS} for r in cache["records"]]
+    stored = dict(cache, version=ANALYSIS_CACHE_VERSION, records=records)
+    try:
+        with open(os.path.join(folder_path, ANALYSIS_CACHE_FILE), 'w', encoding='utf-8') as f:
+            json.dump(stored, f)
+    except OSError:
+        pass  # Read-only folder: analysis still works, just uncached
+
+def fill_abstracts(folder_path, csv_files, records):
+    """
+    Restores the abstracts of records loaded from the analysis cache: each record takes
+    the first non-empty abstract found under any of its identity keys.
+    """
+    missing = [r for r in records if not r.abstract]
+    if not missing:
+        return
+    abstracts = {}
+    for filename in csv_files:
+        with open(os.path.join(folder_path, filename), mode='r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            schema = sc.resolve(reader.fieldnames)
+            for row in reader:
+                abstract = schema.abstract(row)
+                if abstract:
+                    for key in schema.paper_keys(row, schema.title(row).strip()):
+                        abstracts.setdefault(key, abstract)
+    for record in missing:
+        record.abstract = next((abstracts[k] for k in record.keys if k in abstracts), "")
+
+def load_folder_analysis(folder_path, csv_files):
+    """
+    Consolidated records of a folder, through the analysis cache:
+      - "hit": same CSVs, unchanged -> cached records and report;
+      - "incremental": only new CSVs -> cached records + the new rows, re-consolidated;
+      - "full": anything else -> every CSV is read again.
+    Returns (status, cache dict with 'records', 'total_articles', 'contains_arxiv_data', 'report').
+    """
+    # Only stat() calls here: the CSVs themselves are read only when they are new or changed
+    signature = _csv_signature(folder_path, csv_files)
+    cache = _read_analysis_cache(folder_path)
+
+    if cache and cache.get("files") == signature:
+        return "hit", cache
+
+    cached_files = cache.get("files", {}) if cache else {}
+    if cached_files and all(signature.get(f) == sig for f, sig in cached_files.items()):
+        status = "incremental"
+        new_files = [f for f in csv_files if f not in cached_files]
+        new_records, contains_arxiv_data = _read_folder_records(folder_path, new_files, cache["contains_arxiv_data"])
+        records = cache["records"] + new_records
+        total_articles = cache["total_articles"] + len(new_records)
+    else:
+        status = "full"
+        records, contains_arxiv_data = _read_folder_records(folder_path, csv_files)
+        total_articles = len(records)
+
+    # Deduplication: exact identifiers first, then near-duplicate titles
+    cache = {
+        "files": signature,
+        "total_articles": total_articles,
+        "contains_arxiv_data": contains_arxiv_data,
+        "records": consolidate_records(records),
+        "report": None,
+    }
+    return status, cache
 
 def analyze_general_csv_folder(folder_path):
     """
     Analyzes generic CSV folders (Raw results, ArXiv results, or Content Filtered CSVs).
     Capable of normalizing different column names across data sources.
+    Parsed records and report summaries are cached in the folder (see load_folder_analysis).
     """
     display_header(f"Statistics for '{folder_path}'")
     
@@ -222,79 +615,41 @@ def analyze_general_csv_folder(folder_path):
     year_counts = Counter()
     author_counts = Counter()
     all_papers = []
-    processed_titles = set()
-    total_articles = 0
-    contains_arxiv_data = False
-    
-    # Check context based on folder name/path to determine source type
     folder_name = os.path.basename(os.path.normpath(folder_path))
-    is_arxiv_folder = "arxiv" in folder_name.lower()
 
     print(f"Analyzing {len(csv_files)} files...")
-    for filename in csv_files:
-        filepath = os.path.join(folder_path, filename)
-        
-        # Additional check if individual file is arxiv-related
-        if filename.startswith("arxiv_"): 
-            contains_arxiv_data = True
-        elif is_arxiv_folder:
-            contains_arxiv_data = True
+    status, analysis = load_folder_analysis(folder_path, csv_files)
+    if status == "hit":
+        print(f"{Fore.BLUE}ℹ️  Dataset unchanged since the last analysis: using cached results.{Style.RESET_ALL}")
+    elif status == "incremental":
+        print(f"{Fore.BLUE}ℹ️  New CSVs merged into the cached analysis.{Style.RESET_ALL}")
 
-        with open(filepath, mode='r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # ---------------------------------------------------------
-                # DATA NORMALIZATION (Handles Semantic Scholar, ArXiv, and Content Filtered)
-                # ---------------------------------------------------------
-                # Title: Try various common keys
-                raw_title = row.get("Title") or row.get("title") or ""
-                
-                # Year
-                raw_year = row.get("Year") or row.get("year") or "0"
-                
-                # Authors
-                raw_authors = row.get("Authors") or row.get("authors") or ""
-                
-                # Citations
-                raw_citations = row.get("Citations") or row.get("citationCount") or row.get("citations") or 0
-                
-                # URL
-                raw_url = row.get("URL") or row.get("url") or row.get("pdf_url") or ""
-
-                title = raw_title.strip()
-                if not title or title.upper() == "N/A":
-                    continue
-                
-                # Deduplication logic using normalized title
-                title_key = " ".join(title.lower().split())
-                if title_key in processed_titles:
-                    continue
-                
-                processed_titles.add(title_key)
-                total_articles += 1
+    total_articles = analysis["total_articles"]
+    contains_arxiv_data = analysis["contains_arxiv_data"]
+    consolidated = analysis["records"]
 
-                # Update Counters
-                if raw_year and str(raw_year).isdigit(): 
-                    year_counts[raw_year] += 1
-                
-                if raw_authors: 
-                    normalized_authors = raw_authors.replace(";", ",")
-                    author_list = [a.strip() for a in normalized_authors.split(',') if a.strip()]
-                    author_counts.update(author_list)
-
-                try:
-                    paper_data = {
-                        "title": title,
-                        "citations": int(float(raw_citations)), # Handle strings like "10.0"
-                        "authors": raw_authors,
-                        "url": raw_url,
-                        "source": "ArXiv" if contains_arxiv_data else "Semantic/Filtered"
-                    }
-                    all_papers.append(paper_data)
-                except (ValueError, TypeError):
-                    continue
+    # Column-wise view of the papers: numeric aggregates run on NumPy arrays
+    batch = PaperBatch.from_papers(consolidated)
+    years = batch.years
+    values, counts = np.unique(years[years > 0], return_counts=True)
+    year_counts.update({str(int(v)): int(c) for v, c in zip(values, counts)})
 
-    sorted_papers = sorted(all_papers, key=lambda p: p['citations'], reverse=True)
+    for authors in batch.columns["authors"]:
+        if authors:
+            author_counts.update(co.split_authors(authors))
+
+    citations = batch.citation_counts
+    cited = np.flatnonzero(citations >= 0)
+    for i in cited:
+        all_papers.append({
+            "title": batch.columns["title"][i],
+            "citations": int(citations[i]),
+            "authors": batch.columns["authors"][i],
+            "url": batch.columns["url"][i],
+            "source": batch.columns["source"][i]
+        })
+
+    sorted_papers = [all_papers[j] for j in np.argsort(-citations[cited], kind='stable')]
     
     # -----------------------------------------------------------
     # DEFINE LOG DIRECTORY
@@ -304,34 +659,57 @@ def analyze_general_csv_folder(folder_path):
     
     print(f"\n{Fore.CYAN}📂 Saving statistics to: {Style.BRIGHT}{log_directory}")
 
-    # Save CSV Data
-    if sorted_papers:
+    # Save CSV Data (a cache hit keeps the files already written)
+    expected_logs = [f for f in REPORT_FILES if sorted_papers or f != "top_papers.csv"]
+    reuse_logs = status == "hit" and all(os.path.exists(os.path.join(log_directory, f)) for f in expected_logs)
+    if reuse_logs:
+        print(f"{Fore.GREEN}✅ Statistics in '{log_directory}' are up to date.")
+    elif sorted_papers:
         save_stats_to_csv(
             sorted_papers, 
             get_output_filepath(log_directory, "top_papers.csv"), # CHANGE: Use overwrite function
             ["title", "citations", "authors", "url", "source"]
         )
     
-    save_counter_to_csv(year_counts, log_directory, "productive_years.csv", ["Year", "Article_Count"])
-    save_counter_to_csv(author_counts, log_directory, "prolific_authors.csv", ["Author", "Article_Count"])
-
-    # Generate Plots
-    if HAS_MATPLOTLIB:
-        plot_year_distribution(year_counts, log_directory, title_suffix=folder_name)
-        plot_top_authors(author_counts, log_directory)
-        plot_citation_distribution(all_papers, log_directory)
-    else:
-        print(f"{Fore.YELLOW}⚠️ Matplotlib not found. Charts will not be generated.")
+    if not reuse_logs:
+        save_counter_to_csv(year_counts, log_directory, "productive_years.csv", ["Year", "Article_Count"])
+        save_counter_to_csv(author_counts, log_directory, "prolific_authors.csv", ["Author", "Article_Count"])
 
     # Output Summary to Console
     print_header("Overall Summary", width=64, color=Fore.WHITE, filler='.')
     #print(f"\n{Fore.WHITE}--- Overall Summary ---")
     print(f"{Fore.GREEN}Total Articles Analyzed: {Style.BRIGHT}{total_articles}")
-    print(f"{Fore.GREEN}Unique Articles Found: {Style.BRIGHT}{len(processed_titles)}")
+    print(f"{Fore.GREEN}Unique Articles Found: {Style.BRIGHT}{len(consolidated)}")
 
     display_top_items("Most Productive Years", year_counts)
     display_top_items("Most Prolific Authors", author_counts)
 
+    # Render the charts in the background while the rest of the report is printed
+    if HAS_MATPLOTLIB:
+        submit_charts([
+            plot_year_distribution(year_counts, log_directory, title_suffix=folder_name),
+            plot_top_authors(author_counts, log_directory),
+            plot_citation_distribution(all_papers, log_directory),
+        ])
+    else:
+        print(f"{Fore.YELLOW}⚠️ Matplotlib not found. Charts will not be generated.")
+
+    report = analysis["report"] if reuse_logs else None
+    if report is None:
+        if status != "full":
+            # Cached records carry no abstracts
+            fill_abstracts(folder_path, csv_files, consolidated)
+        report = {
+            "keywords": run_keyword_analysis([f"{r.title} {r.abstract}" for r in consolidated], years, log_directory),
+            "coauthors": run_coauthor_analysis([co.split_authors(a) for a in batch.columns["authors"]],
+                                               citations, log_directory),
+        }
+    print_keyword_summary(report["keywords"])
+    print_coauthor_summary(report["coauthors"])
+    if analysis["report"] is None:
+        analysis["report"] = report
+        _write_analysis_cache(folder_path, analysis)
+
     print_header(f"Top {5} Most Cited Papers", width=64, color=Fore.YELLOW, filler='.')
     #print(f"\n{Fore.YELLOW}--- Top {5} Most Cited Papers ---{Style.RESET_ALL}")
     
@@ -351,6 +729,140 @@ def analyze_general_csv_folder(folder_path):
             cit_info = f"Citations: {paper['citations']}"
             print(f"{Fore.WHITE}{i+1}. {Fore.GREEN}{title} \n   {Style.DIM}{Fore.WHITE}└─ {cit_info} | Source: {paper['source']}{Style.RESET_ALL}")
 
+def analyze_general_csv_streaming(folder_path, memory_mb=STREAMING_MEMORY_MB):
+    """
+    Fixed-memory variant of analyze_general_csv_folder for very large folders.
+    Same report, computed with sketches instead of full sets/lists/Counters:
+      - Bloom filter (50% of memory) for title deduplication;
+      - Count-Min sketch (45%) + candidate heap for the top authors;
+      - HyperLogLog (16 KB) for the distinct-title estimate;
+      - bounded heaps/samples for the most cited papers and the histogram;
+      - a uniform sample of papers for the keyword stage.
+    Years are few, so they are counted exactly. The co-authorship stage is left out:
+    its graph grows with the number of authors, and groups or h-indexes computed
+    on a sample would be wrong.
+    """
+    display_header(f"Streaming Statistics for '{folder_path}'")
+
+    if not os.path.exists(folder_path):
+        print(f"{Fore.RED}❌ Folder '{folder_path}' does not exist.")
+        return
+
+    csv_files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
+    if not csv_files:
+        print(f"{Fore.RED}❌ No CSV files found in '{folder_path}'.")
+        return
+
+    budget = memory_mb * 1024 * 1024
+    seen_titles = sk.BloomFilter.from_memory(budget // 2)
+    top_authors = sk.HeavyHitters(STREAMING_TOP_K, sk.CountMinSketch.from_memory(int(budget * 0.45)))
+    distinct_titles = sk.HyperLogLog()
+    top_papers = sk.TopK(STREAMING_TOP_K)
+    citation_sample = sk.Reservoir(HISTOGRAM_SAMPLE)
+    keyword_sample = sk.Reservoir(KEYWORD_SAMPLE)
+    year_counts = Counter()
+
+    folder_name = os.path.basename(os.path.normpath(folder_path))
+    contains_arxiv_data = "arxiv" in folder_name.lower()
+    total_articles = 0
+    unique_articles = 0
+    author_buffer, title_hashes = [], []
+
+    print(f"Streaming {len(csv_files)} files with a {memory_mb} MB budget...")
+    for filename in csv_files:
+        if filename.startswith("arxiv_"):
+            contains_arxiv_data = True
+        with open(os.path.join(folder_path, filename), mode='r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            schema = sc.resolve(reader.fieldnames)
+            for row in reader:
+                # Flush the buffers first, so rows skipped below (duplicates) still count toward the chunk
+                if len(title_hashes) >= STREAMING_CHUNK:
+                    top_authors.add_many(author_buffer)
+                    distinct_titles.add_many(title_hashes)
+                    author_buffer, title_hashes = [], []
+
+                title = schema.title(row).strip()
+                if not title or title.upper() == "N/A":
+                    continue
+                total_articles += 1
+
+                title_key = sc.normalize_key(title) or title
+                title_hashes.append(sk.hash64(title_key))
+                if seen_titles.check_and_add(title_key):
+                    continue
+                unique_articles += 1
+
+                raw_year = schema.year(row)
+                if raw_year.isdigit() and int(raw_year) > 0:
+                    year_counts[raw_year] += 1
+                keyword_sample.add((f"{title} {schema.abstract(row)}", int(raw_year) if raw_year.isdigit() else 0))
+
+                raw_authors = schema.authors(row)
+                author_buffer.extend(a.strip() for a in raw_authors.replace(";", ",").split(',') if a.strip())
+
+                citations = _citation_count(schema.citations(row) or 0)
+                if citations is not None:
+                    citation_sample.add(citations)
+                    top_papers.add(citations, {
+                        "title": title,
+                        "citations": citations,
+                        "authors": raw_authors,
+                        "url": schema.url(row),
+                        "source": "ArXiv" if contains_arxiv_data else "Semantic/Filtered"
+                    })
+
+    top_authors.add_many(author_buffer)
+    distinct_titles.add_many(title_hashes)
+
+    author_counts = Counter(dict(top_authors.most_common()))
+    sorted_papers = top_papers.items()
+    all_papers = [{"citations": c} for c in citation_sample.values]
+
+    log_directory = os.path.join("log", folder_name)
+    os.makedirs(log_directory, exist_ok=True)
+    print(f"\n{Fore.CYAN}📂 Saving statistics to: {Style.BRIGHT}{log_directory}")
+
+    if sorted_papers:
+        save_stats_to_csv(sorted_papers, get_output_filepath(log_directory, "top_papers.csv"),
+                          ["title", "citations", "authors", "url", "source"])
+    save_counter_to_csv(year_counts, log_directory, "productive_years.csv", ["Year", "Article_Count"])
+    save_counter_to_csv(author_counts, log_directory, "prolific_authors.csv", ["Author", "Article_Count"])
+
+    print_header("Overall Summary", width=64, color=Fore.WHITE, filler='.')
+    print(f"{Fore.GREEN}Total Articles Analyzed: {Style.BRIGHT}{total_articles}")
+    print(f"{Fore.GREEN}Unique Articles Found: {Style.BRIGHT}~{distinct_titles.count()} "
+          f"{Style.DIM}(HyperLogLog, ±{104 / math.sqrt(len(distinct_titles.registers)):.1f}%; Bloom dedup kept {unique_articles}, "
+          f"false-positive rate ≈ {seen_titles.false_positive_rate():.2%}){Style.RESET_ALL}")
+
+    display_top_items("Most Productive Years", year_counts)
+    display_top_items("Most Prolific Authors", author_counts)
+    print(f"{Style.DIM}Author counts may overcount by at most {top_authors.sketch.error_bound():.1f} (Count-Min bound).{Style.RESET_ALL}")
+
+    # Render the charts in the background while the rest of the report is printed
+    if HAS_MATPLOTLIB:
+        submit_charts([
+            plot_year_distribution(year_counts, log_directory, title_suffix=folder_name),
+            plot_top_authors(author_counts, log_directory),
+            plot_citation_distribution(all_papers, log_directory),
+        ])
+    else:
+        print(f"{Fore.YELLOW}⚠️ Matplotlib not found. Charts will not be generated.")
+
+    if keyword_sample.values:
+        texts, text_years = zip(*keyword_sample.values)
+        print_keyword_summary(run_keyword_analysis(list(texts), list(text_years), log_directory))
+        if keyword_sample.seen > len(keyword_sample.values):
+            print(f"{Style.DIM}Keywords from a uniform sample of {len(keyword_sample.values)} of {keyword_sample.seen} papers.{Style.RESET_ALL}")
+
+    print_header(f"Top {5} Most Cited Papers", width=64, color=Fore.YELLOW, filler='.')
+    if not sorted_papers:
+        print(f"{Fore.WHITE}No papers found.")
+    for i, paper in enumerate(sorted_papers[:5]):
+        title = paper['title']
+        if len(title) > 58: title = title[:58] + "..."
+        print(f"{Fore.WHITE}{i+1}. {Fore.GREEN}{title} \n   {Style.DIM}{Fore.WHITE}└─ Citations: {paper['citations']} | Source: {paper['source']}{Style.RESET_ALL}")
+
 def analyze_llama_csv_results(folder_path):
     """
     Analyzes the specific CSV file generated by the AI Llama filter.
@@ -358,6 +870,11 @@ def analyze_llama_csv_results(folder_path):
     display_header("AI Filter Results Statistics")
 
     csv_file = os.path.join(folder_path, "llama_filtered_articles.csv")
+    # Folders produced by the multi-criteria, embedding ranking or full-text modes
+    for alternative in ["llama_multi_criteria.csv", "llama_ranked_articles.csv", "llama_fulltext_articles.csv"]:
+        alternative_file = os.path.join(folder_path, alternative)
+        if not os.path.exists(csv_file) and os.path.exists(alternative_file):
+            csv_file = alternative_file
     if not os.path.exists(csv_file):
         print(f"{Fore.RED}❌ File '{csv_file}' not found. Please run the AI filter first.")
         return
@@ -367,36 +884,46 @@ def analyze_llama_csv_results(folder_path):
     all_papers = []
     processed_titles = set()
     total_articles = 0
+    texts, text_years = [], []
+    author_lists, paper_citations = [], []
     
     with open(csv_file, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
+        schema = sc.resolve(reader.fieldnames)
         for row in reader:
+            # Multi-criteria output also lists rejected papers
+            if schema.decision(row).upper() == "NO": continue
             total_articles += 1
             # Keys in Llama output are standard: Title, Year, Authors, Citations
-            title = row.get("Title", row.get("title", "")).strip()
+            title = schema.title(row).strip()
             
             if not title or title.upper() == "N/A": continue
 
-            title_key = " ".join(title.lower().split())
+            title_key = sc.paper_key(title) or title
             if title_key in processed_titles: continue
 
             processed_titles.add(title_key)
 
-            year = row.get("Year", row.get("year", ""))
+            year = schema.year(row)
             if year: year_counts[year] += 1
+
+            texts.append(f"{title} {schema.abstract(row)}")
+            text_years.append(_paper_year(year))
             
-            authors = row.get("Authors", row.get("authors", ""))
+            authors = schema.authors(row)
+            author_lists.append(co.split_authors(authors))
+            paper_citations.append(_citation_count(schema.citations(row)))
             if authors: 
                  normalized_authors = authors.replace(";", ",")
                  author_counts.update([a.strip() for a in normalized_authors.split(',') if a.strip()])
             
             try:
-                cit_val = row.get("Citations", row.get("citations", 0))
+                cit_val = schema.citations(row)
                 all_papers.append({
                     "title": title,
                     "citations": int(float(cit_val)),
                     "authors": authors,
-                    "url": row.get("URL", row.get("pdf_url", "N/A"))
+                    "url": schema.url(row) or "N/A"
                 })
             except (ValueError, TypeError):
                 continue
@@ -420,12 +947,6 @@ def analyze_llama_csv_results(folder_path):
     save_counter_to_csv(year_counts, log_directory, "productive_years.csv", ["Year", "Article_Count"])
     save_counter_to_csv(author_counts, log_directory, "prolific_authors.csv", ["Author", "Article_Count"])
     
-    # Generate Plots
-    if HAS_MATPLOTLIB:
-        plot_year_distribution(year_counts, log_directory, title_suffix="AI Filter (Llama)")
-        plot_top_authors(author_counts, log_directory)
-        plot_citation_distribution(all_papers, log_directory)
-
     print(f"\n{Fore.WHITE}--- Overall Summary ---")
     print(f"{Fore.GREEN}Total Articles Approved by AI: {Style.BRIGHT}{total_articles}")
     print(f"{Fore.GREEN}Unique Articles Found: {Style.BRIGHT}{len(processed_titles)}")
@@ -433,6 +954,17 @@ def analyze_llama_csv_results(folder_path):
     display_top_items("Most Productive Years", year_counts)
     display_top_items("Most Prolific Authors", author_counts)
 
+    # Render the charts in the background while the rest of the report is printed
+    if HAS_MATPLOTLIB:
+        submit_charts([
+            plot_year_distribution(year_counts, log_directory, title_suffix="AI Filter (Llama)"),
+            plot_top_authors(author_counts, log_directory),
+            plot_citation_distribution(all_papers, log_directory),
+        ])
+
+    print_keyword_summary(run_keyword_analysis(texts, text_years, log_directory))
+    print_coauthor_summary(run_coauthor_analysis(author_lists, paper_citations, log_directory))
+
     print(f"\n{Fore.YELLOW}--- Top {5} Most Cited Papers ---{Style.RESET_ALL}")
     if not sorted_papers:
         print(f"{Fore.WHITE}No papers with citation data found.")
@@ -442,23 +974,107 @@ def analyze_llama_csv_results(folder_path):
             if len(title) > 70: title = title[:67] + "..."
             print(f"{Fore.WHITE}{i+1}. {Fore.GREEN}{title} \n   {Style.DIM}{Fore.WHITE}└─ Citations: {Style.BRIGHT}{paper['citations']}{Style.RESET_ALL}")
 
+def analyze_consolidated_dataset():
+    """
+    Analyzes every result folder at once through the consolidated columnar dataset.
+    Only new or changed CSVs are ingested; aggregates are computed on NumPy columns.
+    """
+    display_header("Consolidated Dataset (All Result Folders)")
+
+    added, updated, removed = cd.update_dataset()
+    table = cd.load_dataset()
+    print(f"{Fore.BLUE}ℹ️  {len(table['sources'])} source CSVs in '{cd.CONSOLIDATED_DIR}' "
+          f"({added} new, {updated} updated, {removed} removed).{Style.RESET_ALL}")
+
+    if not len(table["year"]):
+        print(f"{Fore.RED}❌ No result folders found. Please run a search first.")
+        return
+
+    # Approved / undecided rows of every source; one row per paper identity
+    unique = cd.unique_papers(table, table["decision"] != cd.DECISION_NO)
+    year_counts = Counter(cd.year_counts(table, unique))
+    author_counts = Counter(cd.author_counts(table, unique))
+    top_rows = cd.top_cited(table, unique)
+    titles = cd.unpack(table["title_data"], table["title_offsets"], top_rows)
+    urls = cd.unpack(table["url_data"], table["url_offsets"], top_rows)
+    authors = cd.unpack(table["authors_data"], table["authors_offsets"], top_rows)
+    sorted_papers = [
+        {"title": t, "citations": int(table["citations"][r]), "authors": a, "url": u,
+         "source": table["sources"][table["source"][r]]}
+        for r, t, a, u in zip(top_rows, titles, authors, urls)
+    ]
+
+    log_directory = os.path.join("log", "consolidated")
+    os.makedirs(log_directory, exist_ok=True)
+    print(f"\n{Fore.CYAN}📂 Saving statistics to: {Style.BRIGHT}{log_directory}")
+
+    if sorted_papers:
+        save_stats_to_csv(sorted_papers, get_output_filepath(log_directory, "top_papers.csv"),
+                          ["title", "citations", "authors", "url", "source"])
+    save_counter_to_csv(year_counts, log_directory, "productive_years.csv", ["Year", "Article_Count"])
+    save_counter_to_csv(author_counts, log_directory, "prolific_authors.csv", ["Author", "Article_Count"])
+
+    print_header("Overall Summary", width=64, color=Fore.WHITE, filler='.')
+    for code, kind in enumerate(cd.SOURCE_KINDS):
+        kind_rows = table["kind"] == code
+        if kind_rows.any():
+            print(f"{Fore.GREEN}{kind:<18}: {Style.BRIGHT}{int(kind_rows.sum())} rows, {int(cd.unique_papers(table, kind_rows).sum())} unique")
+    print(f"{Fore.GREEN}Unique Articles Found: {Style.BRIGHT}{int(unique.sum())}")
+
+    display_top_items("Most Productive Years", year_counts)
+    display_top_items("Most Prolific Authors", author_counts)
+
+    # Render the charts in the background while the rest of the report is printed
+    if HAS_MATPLOTLIB:
+        submit_charts([
+            plot_year_distribution(year_counts, log_directory, title_suffix="Consolidated"),
+            plot_top_authors(author_counts, log_directory),
+            plot_citation_distribution([{"citations": int(c)} for c in cd.citation_values(table, unique)], log_directory),
+        ])
+
+    # Keywords come from titles only: the consolidated dataset stores no abstracts
+    rows = np.flatnonzero(unique)
+    print_keyword_summary(run_keyword_analysis(cd.unpack(table["title_data"], table["title_offsets"], rows),
+                                               table["year"][rows], log_directory))
+    print_coauthor_summary(run_coauthor_analysis([co.split_authors(a) for a in cd.unpack(table["authors_data"], table["authors_offsets"], rows)],
+                                                 table["citations"][rows], log_directory))
+
+    print_header(f"Top {5} Most Cited Papers", width=64, color=Fore.YELLOW, filler='.')
+    if not sorted_papers:
+        print(f"{Fore.WHITE}No papers with citation data found.")
+    for i, paper in enumerate(sorted_papers[:5]):
+        title = paper['title']
+        if len(title) > 58: title = title[:58] + "..."
+        print(f"{Fore.WHITE}{i+1}. {Fore.GREEN}{title} \n   {Style.DIM}{Fore.WHITE}└─ Citations: {paper['citations']} | Source: {paper['source']}{Style.RESET_ALL}")
+
 def run_analysis_interface():
     """
     Main entry point for the Analysis Module.
     Allows user to choose between Raw Data or Filtered Data.
     Dynamically scans folders to populate the menu.
     """
+    # Charts still rendering from the previous analysis are finished first
+    finish_charts()
+
     print(f"\n{Fore.CYAN}--------------- Analyze Results (Graphs & Stats) ---------------\n")
     print(f"{Fore.YELLOW}1. Analyze Raw Search Data (results / arxiv_results)")
     print(f"{Fore.YELLOW}2. Analyze Filtered Data (content_filtered_csv / llama_filtered)")
+    print(f"{Fore.YELLOW}3. Analyze Everything (consolidated dataset of all folders)")
+    print(f"{Fore.YELLOW}4. Analyze Huge Raw Folder (streaming, fixed memory)")
     
     choice = input(f"\n{Fore.CYAN}Select data type: {Style.RESET_ALL}")
     
+    if choice == '3':
+        analyze_consolidated_dataset()
+        finish_charts(wait=False)
+        input(f"\n{Fore.MAGENTA}Press Enter to return to the main menu...{Style.RESET_ALL}")
+        return
+
 
     potential_folders = []
 
-    # === OPTION 1: RAW DATA (Root Directory) ===
-    if choice == '1':
+    # === OPTION 1: RAW DATA (Root Directory) / OPTION 4: SAME, STREAMING ===
+    if choice in ('1', '4'):
         print(f"\n{Fore.BLUE}🔍 Scanning for Raw Search folders...{Style.RESET_ALL}")
         
         # Search for folders starting with 'results' or 'arxiv_results' in root
@@ -506,12 +1122,15 @@ def run_analysis_interface():
             selected_folder = potential_folders[sel_idx]
             
             # Dispatch to correct analyzer based on folder name/type
-            if "llama_filtered" in selected_folder:
+            if choice == '4':
+                analyze_general_csv_streaming(selected_folder)
+            elif "llama_filtered" in selected_folder:
                 analyze_llama_csv_results(selected_folder)
             else:
                 # Handles 'results', 'arxiv_results' and subfolders in 'content_filtered_csv'
                 analyze_general_csv_folder(selected_folder)
-                
+
+            finish_charts(wait=False)
             input(f"\n{Fore.MAGENTA}Press Enter to return to the main menu...{Style.RESET_ALL}")
         else:
             print(f"{Fore.RED}Invalid number.")
@@ -0,0 +1,70 @@
+# test_analysis_cache.py
+
+import csv
+import json
+import os
+
+from spe import statistics_analyzer as sa
+
+
+def _write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Title", "Authors", "Year", "Citations", "Abstract"])
+        writer.writerows(rows)
+
+
+def _csv_files(folder):
+    return sorted(f for f in os.listdir(folder) if f.endswith('.csv'))
+
+
+def test_hit_incremental_and_full_loads(tmp_path):
+    folder = str(tmp_path)
+    _write_csv(tmp_path / "a.csv", [
+        ["Graphene synthesis on copper", "A", "2020", "5", "Chemical vapour deposition"],
+        ["Protein structure prediction", "B", "2021", "9", "Deep learning"],
+    ])
+
+    status, analysis = sa.load_folder_analysis(folder, _csv_files(folder))
+    assert status == "full"
+    assert analysis["total_articles"] == 2
+    sa._write_analysis_cache(folder, analysis)
+
+    status, analysis = sa.load_folder_analysis(folder, _csv_files(folder))
+    assert status == "hit"
+    assert sorted(r.title for r in analysis["records"]) == ["Graphene synthesis on copper", "Protein structure prediction"]
+    sa._write_analysis_cache(folder, analysis)
+
+    # A new CSV is merged into the cached records
+    _write_csv(tmp_path / "b.csv", [
+        ["Graphene synthesis on copper", "A", "2020", "5", ""],
+        ["Perovskite solar cell stability", "C", "2022", "1", "Degradation"],
+    ])
+    status, analysis = sa.load_folder_analysis(folder, _csv_files(folder))
+    assert status == "incremental"
+    assert analysis["total_articles"] == 4
+    assert len(analysis["records"]) == 3
+    sa._write_analysis_cache(folder, analysis)
+
+    # Abstracts of cached records are read back from the CSVs
+    sa.fill_abstracts(folder, _csv_files(folder), analysis["records"])
+    abstracts = {r.title: r.abstract for r in analysis["records"]}
+    assert abstracts["Graphene synthesis on copper"] == "Chemical vapour deposition"
+    assert abstracts["Perovskite solar cell stability"] == "Degradation"
+
+    # A changed CSV invalidates the cache
+    _write_csv(tmp_path / "a.csv", [["Graphene synthesis on copper", "A", "2020", "6", ""]])
+    status, analysis = sa.load_folder_analysis(folder, _csv_files(folder))
+    assert status == "full"
+    assert analysis["total_articles"] == 3
+
+
+def test_cache_stores_only_report_fields(tmp_path):
+    folder = str(tmp_path)
+    _write_csv(tmp_path / "a.csv", [["Graphene synthesis on copper", "A", "2020", "5", "A long abstract"]])
+    _, analysis = sa.load_folder_analysis(folder, _csv_files(folder))
+    sa._write_analysis_cache(folder, analysis)
+
+    with open(tmp_path / sa.ANALYSIS_CACHE_FILE, 'r', encoding='utf-8') as f:
+        stored = json.load(f)
+    assert all(set(record) == set(sa.ANALYSIS_RECORD_FIELDS) for record in stored["records"])
@@ -0,0 +1,42 @@
+# test_author_cache.py
+
+import pytest
+
+# The module imports scholarly at load time
+aus = pytest.importorskip("spe.author_search_scholar")
+
+
+def _stub(pub_id, citations, title=None):
+    return {"author_pub_id": pub_id, "num_citations": citations, "bib": {"title": title or f"Paper {pub_id}"}}
+
+
+def test_only_new_or_recited_publications_are_stale(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filled = [_stub("X:1", 10), _stub("X:2", 5), _stub("X:3", 0)]
+    aus.save_author_cache("X", "Ana Lab", {aus.publication_key(p): {"num_citations": p["num_citations"], "pub": p}
+                                           for p in filled})
+    cached = aus.load_author_cache("X")
+
+    stubs = [_stub("X:1", 10), _stub("X:2", 6), _stub("X:3", 0), _stub("X:4", 1)]
+    assert [s["author_pub_id"] for s in aus.stale_publications(stubs, cached)] == ["X:2", "X:4"]
+
+
+def test_publications_without_scholar_id_are_keyed_by_title(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stub = {"num_citations": 3, "bib": {"title": "Graphene Synthesis"}}
+    assert aus.publication_key(stub) == "title:graphenesynthesis"
+
+    aus.save_author_cache("X", "Ana Lab", {aus.publication_key(stub): {"num_citations": 3, "pub": stub}})
+    cached = aus.load_author_cache("X")
+    assert aus.stale_publications([{"num_citations": 3, "bib": {"title": "Graphene synthesis."}}], cached) == []
+    assert len(aus.stale_publications([{"num_citations": 4, "bib": {"title": "Graphene synthesis."}}], cached)) == 1
+
+
+def test_missing_or_outdated_cache_is_empty(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert aus.load_author_cache("X") == {}
+    aus.save_author_cache("X", "Ana Lab", {"X:1": {"num_citations": 1, "pub": {}}})
+    assert aus.load_author_cache("X") != {}
+
+    monkeypatch.setattr(aus, "AUTHOR_CACHE_VERSION", aus.AUTHOR_CACHE_VERSION + 1)
+    assert aus.load_author_cache("X") == {}
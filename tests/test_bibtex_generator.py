@@ -0,0 +1,63 @@
+# test_bibtex_generator.py
+
+import csv
+import os
+
+from spe import bibtex_generator as bg
+
+
+def _write_csv(path, titles):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Title", "Authors", "Year"])
+        writer.writerows([t, "Ada Lovelace", "2020"] for t in titles)
+
+
+def _count_parses(monkeypatch):
+    parsed = []
+    parse = bg.parse_bibtex_source
+
+    def counting_parse(file_path):
+        parsed.append(os.path.basename(file_path))
+        return parse(file_path)
+
+    monkeypatch.setattr(bg, "parse_bibtex_source", counting_parse)
+    return parsed
+
+
+def test_unchanged_csvs_are_not_parsed_again(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    parsed = _count_parses(monkeypatch)
+    _write_csv("a.csv", ["Graphene synthesis"])
+    _write_csv("b.csv", ["Protein folding"])
+    targets = [os.path.join(".", "a.csv"), os.path.join(".", "b.csv")]
+
+    index = bg.load_bibtex_index()
+    assert bg.update_bibtex_index(index, targets) == 2
+    bg.save_bibtex_index(index)
+
+    index = bg.load_bibtex_index()
+    assert bg.update_bibtex_index(index, targets) == 0
+    assert parsed == ["a.csv", "b.csv"]
+
+
+def test_a_changed_csv_replaces_only_its_own_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    parsed = _count_parses(monkeypatch)
+    _write_csv("a.csv", ["Graphene synthesis"])
+    _write_csv("b.csv", ["Protein folding"])
+    targets = [os.path.join(".", "a.csv"), os.path.join(".", "b.csv")]
+    index = bg.load_bibtex_index()
+    bg.update_bibtex_index(index, targets)
+    b_entries = index["files"]["b.csv"]["entries"]
+
+    _write_csv("a.csv", ["Graphene synthesis", "Perovskite stability"])
+    assert bg.update_bibtex_index(index, targets) == 1
+    assert parsed == ["a.csv", "b.csv", "a.csv"]
+
+    assert len(index["files"]["a.csv"]["entries"]) == 2
+    assert index["files"]["b.csv"]["entries"] is b_entries
+    text, contributions, total = bg.render_bibliography(index, targets, "all")
+    assert contributions == [("a.csv", 2), ("b.csv", 1)]
+    assert total == 3
+    assert "Perovskite stability" in text
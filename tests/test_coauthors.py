@@ -0,0 +1,53 @@
+# test_coauthors.py
+
+import numpy as np
+import pytest
+
+from spe import coauthors as co
+
+PAPERS = [["A", "B", "C"], ["A", "B"], ["C", "D"], ["E", "F"], ["G"]]
+CITATIONS = [10, 5, 1, 3, None]
+
+
+def test_connected_components():
+    graph = co.build_graph(PAPERS, CITATIONS)
+    count, labels = co.connected_components(graph)
+
+    assert count == 3
+    groups = {name: label for name, label in zip(graph.names, labels)}
+    assert groups["A"] == groups["B"] == groups["C"] == groups["D"]
+    assert groups["E"] == groups["F"] != groups["A"]
+    assert groups["G"] not in (groups["A"], groups["E"])
+
+
+def test_h_index():
+    graph = co.build_graph(PAPERS, CITATIONS)
+    # A, B: papers cited 10 and 5; C: 10 and 1; unknown citations count as 0
+    assert dict(zip(graph.names, co.h_index(graph).tolist())) == {"A": 2, "B": 2, "C": 1, "D": 1, "E": 1, "F": 1, "G": 0}
+
+
+def test_pagerank_matches_the_closed_form():
+    graph = co.build_graph(PAPERS, CITATIONS)
+    rank = co.pagerank(graph)
+
+    # Solve r = (1 - d) / n + d * (P^T r + dangling mass / n) directly
+    n, d = graph.n_authors, co.PAGERANK_DAMPING
+    weights = graph.adjacency.toarray().astype(float)
+    out = weights.sum(axis=1)
+    transition = np.divide(weights, out[:, None], out=np.zeros_like(weights), where=out[:, None] > 0)
+    transition[out == 0] = 1.0 / n
+    expected = np.linalg.solve(np.eye(n) - d * transition.T, np.full(n, (1 - d) / n))
+
+    assert rank == pytest.approx(expected, abs=1e-8)
+    assert rank.sum() == pytest.approx(1.0)
+    # C bridges the A-B pair and D; the lone author G ranks last
+    order = [graph.names[i] for i in np.argsort(-rank, kind='stable')]
+    assert order[0] == "C" and order[-1] == "G"
+    by_name = dict(zip(graph.names, rank))
+    assert by_name["A"] == pytest.approx(by_name["B"])
+    assert by_name["D"] < by_name["A"]
+
+
+def test_strongest_collaborations():
+    graph = co.build_graph(PAPERS, CITATIONS)
+    assert co.strongest_collaborations(graph, 2) == [("A", "B", 2), ("A", "C", 1)]
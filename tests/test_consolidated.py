@@ -0,0 +1,59 @@
+# test_consolidated.py
+
+import csv
+import os
+
+from spe import consolidated as cd
+
+
+def _write_csv(path, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Title", "Authors", "Year", "Citations", "DOI"])
+        writer.writerows(rows)
+
+
+def test_appended_rows_join_existing_clusters(tmp_path):
+    dataset = str(tmp_path / "dataset")
+    _write_csv(str(tmp_path / "results" / "a.csv"), [
+        ["Graphene synthesis by chemical vapour deposition on copper foils", "A", "2020", "5", ""],
+        ["Deep learning for protein structure prediction", "B", "2021", "9", "10.1/x"],
+    ])
+    cd.update_dataset(str(tmp_path), dataset)
+    assert cd.load_manifest(dataset)["clusters"] == 2
+
+    _write_csv(str(tmp_path / "results" / "b.csv"), [
+        ["Graphene Synthesis by Chemical Vapour Deposition on Copper Foils.", "A", "2020", "5", ""],
+        ["Protein folding with neural networks", "B", "2021", "9", "10.1/x"],
+        ["Perovskite solar cell stability", "C", "2022", "1", ""],
+    ])
+    assert cd.update_dataset(str(tmp_path), dataset) == (1, 0, 0)
+
+    table = cd.load_dataset(dataset)
+    assert cd.load_manifest(dataset)["clusters"] == 3
+    assert list(table["cluster"]) == [0, 1, 0, 1, 2]
+    assert cd.unique_papers(table).sum() == 3
+
+
+def test_appended_rows_merge_linked_clusters(tmp_path):
+    dataset = str(tmp_path / "dataset")
+    _write_csv(str(tmp_path / "results" / "a.csv"), [
+        ["Perovskite solar cell stability", "A", "2020", "1", ""],
+        ["Stability of perovskite photovoltaics", "A", "2020", "1", "10.1/p"],
+    ])
+    cd.update_dataset(str(tmp_path), dataset)
+    # One row shares the title of the first paper and the DOI of the second
+    _write_csv(str(tmp_path / "results" / "b.csv"), [
+        ["Perovskite solar cell stability", "A", "2020", "1", "10.1/p"],
+    ])
+    cd.update_dataset(str(tmp_path), dataset)
+
+    table = cd.load_dataset(dataset)
+    assert len(set(table["cluster"])) == 1
+
+
+def test_out_of_range_years_are_unknown(tmp_path):
+    path = str(tmp_path / "results" / "a.csv")
+    _write_csv(path, [["A paper", "A", "99999", "1", ""], ["B paper", "B", "2020", "1", ""]])
+    assert list(cd.ingest_csv(path)["year"]) == [0, 2020]
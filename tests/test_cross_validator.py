@@ -0,0 +1,101 @@
+# test_cross_validator.py
+
+import csv
+import json
+import os
+
+import pytest
+
+from spe import cross_validator as cv
+
+
+def _write_titles(path, titles):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Title", "Year"])
+        writer.writerows([t, "2020"] for t in titles)
+
+
+def test_fingerprint_ignores_row_and_file_order(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    _write_titles(first / "a.csv", ["Paper one", "Paper two"])
+    _write_titles(first / "b.csv", ["Paper three"])
+    _write_titles(second / "a.csv", ["Paper three", "Paper two"])
+    _write_titles(second / "b.csv", ["Paper one"])
+
+    assert cv.generate_fingerprint(str(first)) == cv.generate_fingerprint(str(second))
+
+
+def test_fingerprint_changes_when_a_row_is_added(tmp_path):
+    _write_titles(tmp_path / "a.csv", ["Paper one", "Paper two"])
+    before = cv.generate_fingerprint(str(tmp_path))
+    _write_titles(tmp_path / "a.csv", ["Paper one", "Paper two", "Paper three"])
+
+    after = cv.generate_fingerprint(str(tmp_path))
+    assert after != before
+    assert after.endswith("-3")
+
+
+def _plant_cached_fingerprint(folder, fingerprint):
+    cache_path = os.path.join(folder, cv.FINGERPRINT_CACHE)
+    with open(cache_path, 'r') as f:
+        cached = json.load(f)
+    cached["fingerprint"] = fingerprint
+    with open(cache_path, 'w') as f:
+        json.dump(cached, f)
+
+
+def test_fingerprint_cache_is_invalidated_by_mtime_and_size(tmp_path):
+    csv_path = tmp_path / "a.csv"
+    _write_titles(csv_path, ["Paper one"])
+    real = cv.generate_fingerprint(str(tmp_path))
+
+    # An unchanged folder is answered from the cache
+    _plant_cached_fingerprint(str(tmp_path), "cached")
+    assert cv.generate_fingerprint(str(tmp_path)) == "cached"
+
+    # Same content, new mtime
+    _plant_cached_fingerprint(str(tmp_path), "cached")
+    st = os.stat(csv_path)
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cv.generate_fingerprint(str(tmp_path)) == real
+
+    # New size, mtime restored
+    _plant_cached_fingerprint(str(tmp_path), "cached")
+    st = os.stat(csv_path)
+    with open(csv_path, 'a', encoding='utf-8') as f:
+        f.write("\n")
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert cv.generate_fingerprint(str(tmp_path)) == real
+
+
+def test_agreement_matrix_on_three_runs(tmp_path):
+    dataset = tmp_path / "results"
+    dataset.mkdir()
+    _write_titles(dataset / "a.csv", ["Paper A", "Paper B", "Paper C", "Paper D", "Paper E"])
+
+    runs = []
+    for name, approved in [("run1", "ABC"), ("run2", "BCD"), ("run3", "A")]:
+        folder = tmp_path / name
+        folder.mkdir()
+        with open(folder / "llama_filtered_articles.csv", 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Title", "AI_Decision"])
+            writer.writerows([f"Paper {letter}", "YES"] for letter in approved)
+        runs.append({"output_path": str(folder), "filter_type": "AI"})
+
+    overlap, jaccard, kappa = cv.agreement_matrix(runs, str(dataset))
+
+    assert overlap.tolist() == [[3, 2, 1], [2, 3, 0], [1, 0, 1]]
+    # |A & B| / |A | B|
+    assert jaccard[0, 1] == pytest.approx(2 / 4)
+    assert jaccard[0, 2] == pytest.approx(1 / 3)
+    assert jaccard[1, 2] == 0
+    # (observed - expected) / (1 - expected) over the 5 papers of the dataset
+    assert kappa[0, 1] == pytest.approx((3 / 5 - 13 / 25) / (1 - 13 / 25))
+    assert kappa[0, 2] == pytest.approx((3 / 5 - 11 / 25) / (1 - 11 / 25))
+    assert kappa[1, 2] == pytest.approx((1 / 5 - 11 / 25) / (1 - 11 / 25))
+    assert kappa.diagonal().tolist() == [1.0, 1.0, 1.0]
+    assert (kappa == kappa.T).all()
@@ -0,0 +1,47 @@
+# test_dedup.py
+
+from spe import dedup
+
+
+def test_numbered_parts_are_not_merged():
+    labels = dedup.near_duplicate_clusters([
+        "Thermal transport in two-dimensional materials: Part I",
+        "Thermal transport in two-dimensional materials: Part II",
+        "Thermal transport in two-dimensional materials: Part III",
+    ])
+    assert len(set(labels)) == 3
+
+
+def test_numbered_series_keeps_every_paper():
+    titles = [f"Electrochemical deposition study number {i} on copper" for i in range(300)]
+    assert len(set(dedup.near_duplicate_clusters(titles))) == 300
+
+
+def test_formatting_variants_are_merged():
+    labels = dedup.near_duplicate_clusters([
+        "Graphene synthesis by chemical vapour deposition on copper foils",
+        "Graphene Synthesis by Chemical Vapour Deposition on {C}opper Foils.",
+        "Graphene synthesis by chemical vapour deposition on copper foil",
+        "Deep learning for protein structure prediction",
+    ])
+    assert labels == [0, 0, 0, 3]
+
+
+def test_shared_keys_are_merged():
+    labels = dedup.near_duplicate_clusters(
+        ["A study of perovskite stability", "Perovskite stability: a study"],
+        [["doi:10.1/x", "title:astudyofperovskitestability"], ["doi:10.1/x"]],
+    )
+    assert labels == [0, 0]
+
+
+def test_large_bucket_members_are_all_verified():
+    # More copies than SMALL_BUCKET: neighbouring pairs still chain them into one cluster
+    titles = ["Ab initio study of lithium diffusion in silicon anodes"] * (dedup.SMALL_BUCKET + 10)
+    assert set(dedup.near_duplicate_clusters(titles)) == {0}
+
+
+def test_same_title_requires_matching_numbers():
+    assert dedup.same_title("Results from run 2 of the detector", "Results from run 2 of the detector.")
+    assert not dedup.same_title("Results from run 2 of the detector", "Results from run 3 of the detector")
+    assert not dedup.same_title("Lecture notes, volume IV", "Lecture notes, volume VI")
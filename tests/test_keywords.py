@@ -0,0 +1,41 @@
+# test_keywords.py
+
+import math
+
+import pytest
+
+from spe import keywords as kw
+
+TEXTS = [
+    "The graphene synthesis of graphene",   # graphene x2, synthesis ("of" is too short)
+    "Graphene transistor",
+    "Protein folding and protein design",   # protein x2, folding, design
+    "Protein design",
+]
+STOPWORDS = {"the", "and"}
+
+
+def test_top_terms_counts_occurrences_and_documents():
+    matrix = kw.build_term_matrix(TEXTS, STOPWORDS)
+    assert kw.top_terms(matrix, 4) == [("graphene", 3, 2), ("protein", 3, 2), ("design", 2, 2), ("synthesis", 1, 1)]
+
+
+def test_tfidf_scores():
+    matrix = kw.build_term_matrix(TEXTS, STOPWORDS)
+    idf = math.log(4 / 2) + 1
+    # Summed count / document length; terms in a single document are ignored (MIN_DOC_FREQ)
+    expected = [("graphene", (2 / 3 + 1 / 2) * idf), ("protein", (2 / 4 + 1 / 2) * idf), ("design", (1 / 4 + 1 / 2) * idf)]
+
+    keywords = kw.tfidf_keywords(matrix)
+    assert [term for term, _ in keywords] == [term for term, _ in expected]
+    assert [score for _, score in keywords] == pytest.approx([score for _, score in expected])
+
+
+def test_term_trends_share_per_year():
+    matrix = kw.build_term_matrix(TEXTS, STOPWORDS)
+    years, terms, shares = kw.term_trends(matrix, [2020, 2020, 2021, 0])
+
+    assert years.tolist() == [2020, 2021]
+    assert terms == ["graphene", "protein", "design"]
+    # The last document has no year and is left out
+    assert shares.tolist() == [[100.0, 0.0, 0.0], [0.0, 100.0, 100.0]]
@@ -0,0 +1,47 @@
+# test_schema.py
+
+import pytest
+
+from spe import schema as sc
+from spe.papers import LAYOUTS, layout_columns
+
+VALUES = {"title": "Graphene Synthesis", "year": "2020", "authors": "A. Author", "citations": "7",
+          "url": "https://example.org/paper", "abstract": "On copper foils.", "query": "graphene"}
+
+
+@pytest.mark.parametrize("layout", ["semantic", "arxiv", "ai_filter"])
+def test_aliases_resolve_every_written_layout(layout):
+    row = {column: VALUES.get(field, "") for field, column in LAYOUTS[layout]}
+    schema = sc.resolve(layout_columns(layout))
+
+    for field, column in LAYOUTS[layout]:
+        if field in VALUES:
+            assert getattr(schema, field)(row) == VALUES[field], (layout, column)
+
+
+def test_aliases_ignore_case_and_take_the_first_non_empty_column():
+    schema = sc.resolve([" TITLE ", "date", "Year", "link"])
+    row = {" TITLE ": "A paper", "date": "2019-05-01", "Year": "", "link": "https://example.org"}
+
+    assert schema.title(row) == "A paper"
+    # "Year" comes first in FIELD_ALIASES but is empty in this row
+    assert schema.year(row) == "2019-05-01"
+    assert schema.url(row) == "https://example.org"
+    assert schema.abstract(row) == ""
+    assert schema.columns["year"] == ("Year", "date")
+
+
+def test_paper_keys_priority():
+    header = ["arxiv_id", "Title", "paperId", "URL", "DOI"]
+    row = {"arxiv_id": "2101.00001v2", "Title": "Graphene Synthesis!", "paperId": "ABC123",
+           "URL": "https://arxiv.org/pdf/2101.00001", "DOI": " 10.1/X "}
+
+    keys = sc.resolve(header).paper_keys(row)
+    # doi > s2 > arxiv (column, then URL) > title, whatever the column order
+    assert keys == ["doi:10.1/x", "s2:abc123", "arxiv:2101.00001", "arxiv:2101.00001", "title:graphenesynthesis"]
+
+
+def test_paper_keys_skip_empty_identifiers():
+    schema = sc.resolve(["Title", "DOI", "paperId"])
+    assert schema.paper_keys({"Title": "Graphene Synthesis", "DOI": " ", "paperId": ""}) == ["title:graphenesynthesis"]
+    assert schema.paper_keys({"Title": "", "DOI": "", "paperId": ""}) == []
@@ -0,0 +1,102 @@
+# test_sketches.py
+
+import math
+
+import numpy as np
+
+from spe import sketches as sk
+
+
+def _random_hashes(n, seed):
+    return np.random.RandomState(seed).randint(0, 2 ** 63, size=n, dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def test_hyperloglog_within_three_standard_errors():
+    hll = sk.HyperLogLog(precision=12)
+    hashes = _random_hashes(200_000, seed=1)
+    hll.add_many(hashes)
+    # Adding the same items again does not change the estimate
+    hll.add_many(hashes[:50_000])
+
+    standard_error = 1.04 / math.sqrt(2 ** 12)
+    assert abs(hll.count() - 200_000) <= 3 * standard_error * 200_000
+
+
+def test_hyperloglog_small_counts_use_linear_counting():
+    hll = sk.HyperLogLog()
+    hll.add_many(np.array([sk.hash64(f"title {i}") for i in range(1000)], dtype=np.uint64))
+    standard_error = 1.04 / math.sqrt(2 ** 14)
+    assert abs(hll.count() - 1000) <= 3 * standard_error * 1000
+
+
+def test_count_min_never_undercounts_and_respects_its_bound():
+    rng = np.random.RandomState(2)
+    items = rng.zipf(1.3, size=50_000) % 5000
+    hashes = np.array([sk.hash64(str(i)) for i in range(5000)], dtype=np.uint64)
+    sketch = sk.CountMinSketch(width=1000, depth=5)
+    sketch.add_many(hashes[items])
+
+    true_counts = np.bincount(items, minlength=5000)
+    estimates = sketch.estimate_many(hashes).astype(np.int64)
+    assert (estimates >= true_counts).all()
+    # Holds for each item with probability 1 - e^-depth
+    within = (estimates - true_counts) <= sketch.error_bound()
+    assert within.mean() >= 1 - math.exp(-5)
+
+
+def test_heavy_hitters_find_the_most_frequent_items():
+    stream = ["common"] * 500 + ["frequent"] * 300 + [f"rare {i}" for i in range(2000)]
+    np.random.RandomState(3).shuffle(stream)
+    hitters = sk.HeavyHitters(5, sk.CountMinSketch(width=2000))
+    for start in range(0, len(stream), 256):
+        hitters.add_many(stream[start:start + 256])
+
+    top = hitters.most_common(2)
+    assert [name for name, _ in top] == ["common", "frequent"]
+    assert top[0][1] >= 500 and top[1][1] >= 300
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = sk.BloomFilter(bits=10_000 * 10)
+    keys = [f"paper {i}" for i in range(10_000)]
+    assert not any(bloom.check_and_add(k) for k in keys[:100])
+    for k in keys[100:]:
+        bloom.check_and_add(k)
+    assert all(bloom.check_and_add(k) for k in keys)
+
+
+def test_bloom_filter_false_positive_rate_matches_the_estimate():
+    bloom = sk.BloomFilter(bits=10_000 * 10)
+    for i in range(10_000):
+        bloom.check_and_add(f"paper {i}")
+    assert bloom.false_positive_rate() < 0.01
+    # Probing adds the probes too: the rate estimated at the end bounds the whole run
+    false_positives = sum(bloom.check_and_add(f"other {i}") for i in range(2000))
+    assert false_positives / 2000 <= bloom.false_positive_rate()
+
+
+def test_top_k_keeps_the_largest_scores_first_seen_first():
+    top = sk.TopK(3)
+    for score, name in [(5, "a"), (9, "b"), (1, "c"), (9, "d"), (7, "e"), (9, "f")]:
+        top.add(score, {"name": name})
+    assert [r["name"] for r in top.items()] == ["b", "d", "f"]
+
+
+def test_reservoir_keeps_a_fixed_size_uniform_sample():
+    short = sk.Reservoir(10)
+    for v in range(5):
+        short.add(v)
+    assert short.values == [0, 1, 2, 3, 4]
+
+    reservoir = sk.Reservoir(2000, seed=4)
+    for v in range(100_000):
+        reservoir.add(v)
+    assert reservoir.seen == 100_000
+    assert len(reservoir.values) == 2000 == len(set(reservoir.values))
+    # Mean of a uniform sample of 0..99999: 50000 +- 3 standard errors
+    assert abs(np.mean(reservoir.values) - 50_000) <= 3 * 28_868 / math.sqrt(2000)
+
+    again = sk.Reservoir(2000, seed=4)
+    for v in range(100_000):
+        again.add(v)
+    assert again.values == reservoir.values
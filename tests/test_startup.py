@@ -0,0 +1,34 @@
+# test_startup.py
+
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use of the feature that needs them, never by the menu itself
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "scholarly", "pypdf", "arxiv", "requests", "tqdm"]
+IMPORT_BUDGET_US = 300000   # Cumulative import time of spe.main (microseconds)
+
+
+def import_times(module):
+    """{module name: cumulative import time in us} from `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_menu_does_not_import_heavy_dependencies():
+    loaded = import_times("spe.main")
+    heavy = sorted({name.split(".")[0] for name in loaded} & set(HEAVY_MODULES))
+    assert heavy == []
+
+
+def test_menu_import_is_within_budget():
+    assert import_times("spe.main")["spe.main"] < IMPORT_BUDGET_US